@@ -1,34 +1,12 @@
-import os
+import argparse
+import asyncio
 import pandas as pd
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe_agent
-
-# Carregar variáveis do ambiente (.env)
-load_dotenv()
-
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-if not GOOGLE_API_KEY:
-    raise ValueError("❌ GOOGLE_API_KEY não encontrada no .env")
-
-# Inicializar LLM (Gemini)
-llm = ChatGoogleGenerativeAI(
-    model="gemini-1.5-flash",
-    temperature=0,
-    google_api_key=GOOGLE_API_KEY
-)
-
-# Carregar planilha final processada
-df = pd.read_excel("dados/VR MENSAL 05.2025.xlsx")
-print(f"[DEBUG] Planilha carregada com {len(df)} registros e {len(df.columns)} colunas.")
-
-# Criar agente especializado em DataFrame
-agent = create_pandas_dataframe_agent(
-    llm,
-    df,
-    verbose=True,
-    allow_dangerous_code=True
-)
+
+from cache_respostas import CacheRespostas, impressao_dataframe, versao_instrucoes
+from cubo_agregados import montar_cubo, responder
+from fachada_llm import MODELO_PADRAO, LLMPreguicoso
+
+CAMINHO_PLANILHA = "dados/VR MENSAL 05.2025.xlsx"
 
 # Prompt inicial fixo para evitar alucinações
 instructions = """
@@ -41,7 +19,9 @@ Você é um analista de RH que responde perguntas sobre a base de VR.
 📌 Regras de resposta:
 1. Sempre use apenas os dados do DataFrame carregado (VR MENSAL 05.2025.xlsx).
 2. Nunca crie DataFrames fictícios ou invente valores.
-3. Trabalhe diretamente com as colunas listadas acima.
+3. Obtenha os dados pelas ferramentas: buscar_matricula (um colaborador),
+   listar_sindicato (colaboradores de um sindicato), top_vr (maiores VR TOTAL)
+   e agregados (soma/contagem/média por SINDICATO, UF ou TOTAL).
 4. Se a pergunta envolver cálculos (soma, média, contagem etc.), mostre:
    - 🔢 O resultado numérico exato.
    - 📖 Uma breve explicação de como o cálculo foi feito.
@@ -49,17 +29,166 @@ Você é um analista de RH que responde perguntas sobre a base de VR.
 6. Responda em português claro e objetivo.
 """
 
-print("\n🤖 Agente pronto! Faça suas perguntas. Digite 'sair' para encerrar.\n")
 
-# Loop interativo
-while True:
-    pergunta = input("❓ Pergunta: ")
-    if pergunta.lower() in ["sair", "exit", "quit"]:
-        print("👋 Encerrando agente...")
-        break
+def carregar_planilha(caminho: str = CAMINHO_PLANILHA) -> pd.DataFrame:
+    # Carregar planilha final processada
+    df = pd.read_excel(caminho)
+    print(f"[DEBUG] Planilha carregada com {len(df)} registros e {len(df.columns)} colunas.")
+    return df
+
+
+def criar_agente(df: pd.DataFrame, cubo: dict = None, modelo: str = MODELO_PADRAO):
+    """
+    Agente Gemini com ferramentas indexadas (ferramentas_agente.py): busca por
+    MATRICULA, lista por SINDICATO, top-N de VR e agregados. O agente chama
+    essas ferramentas em vez de gerar e executar código pandas.
+    As bibliotecas do LLM só são importadas aqui.
+    """
+    from langchain.agents import AgentExecutor, create_tool_calling_agent
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from ferramentas_agente import IndicePlanilha, criar_ferramentas
+
+    # Inicializar LLM (Gemini)
+    llm = LLMPreguicoso(modelo).modelo
+
+    ferramentas = criar_ferramentas(IndicePlanilha(df), cubo if cubo is not None else montar_cubo(df))
+    prompt = ChatPromptTemplate.from_messages([
+        ("human", "{input}"),
+        ("placeholder", "{agent_scratchpad}"),
+    ])
+    agente = create_tool_calling_agent(llm, ferramentas, prompt)
+    return AgentExecutor(agent=agente, tools=ferramentas, verbose=True)
+
+
+class Respondedor:
+    """
+    Responde perguntas sobre a planilha: cubo de agregados → cache de
+    respostas → agente LLM. `agente` é qualquer objeto com
+    invoke({"input": prompt}) (e opcionalmente ainvoke) que devolve
+    {"output": texto}, como o AgentExecutor de criar_agente ou o LLMFalso
+    de lote_perguntas.py. `backend` identifica o LLM (ex.: "gemini:gemini-1.5-flash")
+    e entra na chave do cache; por padrão vem de `agente.backend`.
+    Com `fabrica_agente(cubo)` no lugar de `agente`, o agente só é criado na
+    primeira pergunta que o cubo e o cache não respondem.
+    """
+
+    def __init__(self, df: pd.DataFrame, agente=None, cache: CacheRespostas = None, backend: str = None,
+                 fabrica_agente=None):
+        if agente is None and (fabrica_agente is None or backend is None):
+            raise ValueError("Sem o agente, informe fabrica_agente e backend")
+        self._agente = agente
+        self.fabrica_agente = fabrica_agente
+        self.backend = backend or getattr(agente, "backend", None) or type(agente).__name__
+        # Cubo de agregados: perguntas de soma/contagem/média por sindicato/UF saem daqui, sem LLM
+        self.cubo = montar_cubo(df)
+        # Cache de respostas: mesma pergunta sobre a mesma planilha (e mesmas instruções) não vai ao LLM
+        self.cache = cache if cache is not None else CacheRespostas()
+        self.impressao_df = impressao_dataframe(df)
+        self.versao = versao_instrucoes(instructions)
+
+    @property
+    def agente(self):
+        if self._agente is None:
+            print("[DEBUG] Primeira pergunta para o LLM: criando o agente")
+            self._agente = self.fabrica_agente(self.cubo)
+        return self._agente
+
+    @property
+    def agente_criado(self) -> bool:
+        return self._agente is not None
+
+    def rapido(self, pergunta: str):
+        """(resposta, origem) sem chamar o LLM, ou (None, chave do cache)."""
+        resposta = responder(pergunta, self.cubo)
+        if resposta is not None:
+            return resposta, "agregados"
+        chave = self.cache.chave(pergunta, self.impressao_df, self.versao, self.backend)
+        resposta = self.cache.obter(chave)
+        if resposta is not None:
+            return resposta, "cache"
+        return None, chave
+
+    @staticmethod
+    def _entrada(pergunta: str) -> dict:
+        # O AgentExecutor espera as variáveis do prompt ("{input}"), não uma string solta
+        return {"input": instructions + "\n\nPergunta: " + pergunta}
+
+    def responder(self, pergunta: str):
+        """Retorna (resposta, origem) com origem em 'agregados', 'cache' ou 'llm'."""
+        resposta, origem = self.rapido(pergunta)
+        if resposta is not None:
+            return resposta, origem
+        resposta = self.agente.invoke(self._entrada(pergunta))["output"]
+        self.cache.gravar(origem, pergunta, resposta)
+        return resposta, "llm"
+
+    async def aresponder(self, pergunta: str):
+        """Versão assíncrona de responder."""
+        resposta, origem = self.rapido(pergunta)
+        if resposta is not None:
+            return resposta, origem
+        return await self.consultar_llm(pergunta, origem)
+
+    async def consultar_llm(self, pergunta: str, chave: str):
+        """Chama o agente (ainvoke quando existir) e grava a resposta no cache sob `chave`."""
+        if hasattr(self.agente, "ainvoke"):
+            saida = await self.agente.ainvoke(self._entrada(pergunta))
+        else:
+            saida = await asyncio.to_thread(self.agente.invoke, self._entrada(pergunta))
+        resposta = saida["output"]
+        self.cache.gravar(chave, pergunta, resposta)
+        return resposta, "llm"
+
+
+def modo_interativo(respondedor: Respondedor):
+    cache = respondedor.cache
+    print("\n🤖 Agente pronto! Faça suas perguntas. Digite 'sair' para encerrar ('cache' mostra as estatísticas).\n")
+
+    # Loop interativo
+    while True:
+        pergunta = input("❓ Pergunta: ")
+        if pergunta.lower() in ["sair", "exit", "quit"]:
+            print("👋 Encerrando agente...")
+            print("[DEBUG] Cache de respostas:", cache.estatisticas())
+            break
+        if pergunta.lower() == "cache":
+            print("[DEBUG] Cache de respostas:", cache.estatisticas())
+            continue
+
+        try:
+            resposta, origem = respondedor.responder(pergunta)
+            rotulo = {"agregados": " (agregados)", "cache": " (cache)"}.get(origem, "")
+            print(f"\n💡 Resposta{rotulo}:", resposta)
+        except Exception as e:
+            print("⚠️ Erro ao processar pergunta:", e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agente de perguntas sobre a planilha de VR")
+    parser.add_argument("--planilha", default=CAMINHO_PLANILHA)
+    parser.add_argument("--lote", help="arquivo de perguntas (uma por linha) para o modo em lote")
+    parser.add_argument("--saida", default="dados/respostas_lote.jsonl", help="JSONL de respostas do modo em lote")
+    parser.add_argument("--concorrencia", type=int, default=8, help="perguntas simultâneas no modo em lote")
+    parser.add_argument("--taxa", type=float, default=None, help="máximo de chamadas ao LLM por segundo")
+    parser.add_argument("--falso", action="store_true", help="usa o LLM falso (offline), para testes de vazão")
+    args = parser.parse_args(argv)
+
+    df = carregar_planilha(args.planilha)
+    if args.falso:
+        from lote_perguntas import LLMFalso
+        respondedor = Respondedor(df, LLMFalso())
+    else:
+        # LangChain e Gemini só são carregados na primeira pergunta que vai ao LLM
+        respondedor = Respondedor(df, backend=f"gemini:{MODELO_PADRAO}",
+                                  fabrica_agente=lambda cubo: criar_agente(df, cubo, MODELO_PADRAO))
+
+    if args.lote:
+        from lote_perguntas import executar_lote_perguntas
+        executar_lote_perguntas(args.lote, args.saida, respondedor, args.concorrencia, args.taxa)
+    else:
+        modo_interativo(respondedor)
+
 
-    try:
-        resposta = agent.invoke(instructions + "\n\nPergunta: " + pergunta)
-        print("\n💡 Resposta:", resposta["output"])
-    except Exception as e:
-        print("⚠️ Erro ao processar pergunta:", e)
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,13 @@ import sys
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from dotenv import load_dotenv
 
-# LLM
-from langchain_google_genai import ChatGoogleGenerativeAI
+from exportacao import escrever_xlsx
+from fachada_llm import LLMPreguicoso
+from indice_exclusao import descrever_motivos
+from instrumentacao import instrumentar
+from normalizacao import normalizar_numeros, parse_number_like
+from regras_validacao import avaliar_regras, localizar_colunas, montar_regras
 
 # ---------- CONFIG ----------
 GENERATED_PATH = "dados/VR_MENSAL_CALCULADO.xlsx"  # saída do processamento
@@ -21,58 +24,26 @@ EXPECTED_TOTAL_VR = 1380178.00
 TOTAL_TOLERANCE_PCT = 0.02  # tolerância percentual (2%) ao comparar com EXPECTED_TOTAL_VR
 # ----------------------------
 
-load_dotenv()
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-if not GOOGLE_API_KEY:
-    print("⚠️ GOOGLE_API_KEY não encontrada no .env. O LLM não poderá gerar o relatório.")
-# Inicializa LLM (só usado para texto do relatório; validação é feita com pandas)
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0, google_api_key=GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+# LLM só usado para texto do relatório (validação é feita com pandas); carregado sob demanda
+llm = LLMPreguicoso()
 
+@instrumentar
 def read_sheet(path):
     if not os.path.exists(path):
         return None
     return pd.read_excel(path)
 
-def parse_number_like(s):
-    """Tenta transformar strings numéricas com pontuação BR/EN em float.
-    Lógica robusta para pontos como milhares e vírgulas como decimais."""
-    if pd.isna(s):
-        return np.nan
-    if isinstance(s, (int, float, np.number)):
-        return float(s)
-    s = str(s).strip()
-    if s == "":
-        return np.nan
-    s = s.replace(" ", "")
-    # casos: "1.234,56" -> remove '.' e substitui ',' por '.'
-    if "." in s and "," in s:
-        if s.find(".") < s.find(","):
-            s = s.replace(".", "").replace(",", ".")
-        else:
-            s = s.replace(",", "")
-    else:
-        s = s.replace(",", ".")
-    # remove qualquer caractere que não seja dígito, sinal ou ponto
-    import re
-    m = re.search(r"-?\d+(\.\d+)?", s)
-    if not m:
-        return np.nan
-    try:
-        return float(m.group(0))
-    except:
-        return np.nan
-
 def try_convert_columns(df, cols):
-    """Tenta converter colunas listadas para numérico usando parse_number_like.
+    """Tenta converter colunas listadas para numérico (regras de parse_number_like,
+       aplicadas à coluna inteira por normalizar_numeros).
        Retorna dict com alterações (antes->depois counts)."""
     changes = {}
     for c in cols:
         if c not in df.columns:
             changes[c] = {"status": "missing"}
             continue
-        before_non_numeric = df[c].apply(lambda x: not pd.isna(x) and not isinstance(x, (int, float, np.number))).sum()
         df[c + "__orig"] = df[c]  # guarda original para auditoria
-        df[c] = df[c].apply(parse_number_like)
+        df[c], before_non_numeric = normalizar_numeros(df[c], retornar_nao_numericos=True)
         after_non_numeric = df[c].isna().sum()
         changes[c] = {
             "status": "converted",
@@ -82,6 +53,7 @@ def try_convert_columns(df, cols):
         }
     return changes
 
+@instrumentar
 def validate_and_fix(df, template_cols=None):
     """Valida dataframe e aplica correções possíveis. Retorna (df_fixed, diagnostics)."""
     diag = {}
@@ -138,24 +110,31 @@ def validate_and_fix(df, template_cols=None):
     essentials = list(dict.fromkeys(essentials))
     diag['essentials'] = essentials
 
+    # Todas as regras (nulos, negativos, consistência dos totais) numa passada
+    papeis = localizar_colunas(df.columns)
+    regras = montar_regras(
+        [c for c in essentials if c in df.columns],
+        [c for c in numeric_candidates if c in df.columns],
+        papeis,
+    )
+    violacoes, erros_regras = avaliar_regras(df, regras)
+    contagens = violacoes.sum()
+
     # nulos essencias
-    nulls = {c: int(df[c].isna().sum()) for c in essentials if c in df.columns}
-    diag['nulls_essenciais'] = nulls
+    diag['nulls_essenciais'] = {r["colunas"][0]: int(contagens[r["nome"]]) for r in regras if r["tipo"] == "nulo"}
 
     # negativos nas colunas numéricas
-    negs = {}
-    for c in numeric_candidates:
-        if c in df.columns:
-            try:
-                negs[c] = int((df[c] < 0).sum())
-            except Exception:
-                negs[c] = "error"
-    diag['negatives'] = negs
+    diag['negatives'] = {
+        r["colunas"][0]: "error" if r["nome"] in erros_regras else int(contagens[r["nome"]])
+        for r in regras if r["tipo"] == "negativo"
+    }
+    diag['rule_violations'] = {nome: int(n) for nome, n in contagens.items()}
+    diag['rule_errors'] = erros_regras
 
     # 6) Totais
-    total_vr_col = next((c for c in df.columns if "VR TOTAL" in c.upper() or "VR_TOTAL" in c.upper()), None)
-    total_empresa_col = next((c for c in df.columns if "EMPRESA" in c.upper() and "80" in c), None)
-    total_colab_col = next((c for c in df.columns if "COLABORADOR" in c.upper() and "20" in c), None)
+    total_vr_col = papeis["total"]
+    total_empresa_col = papeis["empresa"]
+    total_colab_col = papeis["colaborador"]
 
     total_vr = float(df[total_vr_col].sum()) if total_vr_col and total_vr_col in df.columns else None
     total_emp = float(df[total_empresa_col].sum()) if total_empresa_col and total_empresa_col in df.columns else None
@@ -170,22 +149,9 @@ def validate_and_fix(df, template_cols=None):
     else:
         diag['expected_total_check'] = None
 
-    # 8) Preparar relatório de linhas com problemas (nulos ou negativos)
-    problem_rows = pd.DataFrame()
-    # qualquer linha com nulo em essenciais
-    essential_mask = False
-    for c in essentials:
-        if c in df.columns:
-            essential_mask = essential_mask | df[c].isna()
-    if essential_mask is not False:
-        problem_rows = df[essential_mask].copy()
-    # quaisquer negativos
-    neg_mask = False
-    for c in numeric_candidates:
-        if c in df.columns:
-            neg_mask = neg_mask | (df[c] < 0)
-    if neg_mask is not False:
-        problem_rows = pd.concat([problem_rows, df[neg_mask]], axis=0).drop_duplicates()
+    # 8) Linhas com problemas: qualquer regra violada (sem duplicar linhas)
+    mask_problema = violacoes.to_numpy().any(axis=1)
+    problem_rows = df[mask_problema].assign(REGRAS_VIOLADAS=descrever_motivos(violacoes[mask_problema]))
 
     diag['problem_rows_count'] = len(problem_rows)
     # salvar amostra diagnóstica
@@ -210,6 +176,9 @@ def produce_markdown_report(diag, llm_summary=None, group_name="Grupo X", member
         ok_txt = "OK" if et['ok'] else "Fora da tolerância"
         md.append(f"- Comparação com total esperado: esperado={et['expected']}, atual={et['actual']}, diff={et['diff']} ({et['pct_diff']*100:.2f}%) → **{ok_txt}**\n")
     md.append(f"- Problemas detectados: {diag.get('problem_rows_count')} linhas com anomalias (arquivo {DIAG_CSV} salvo com amostra)\n")
+    violadas = {k: v for k, v in (diag.get('rule_violations') or {}).items() if v}
+    if violadas:
+        md.append(f"- Violações por regra: {violadas}\n")
     if llm_summary:
         md.append("\n## 2 — Sumário gerado pelo agente LLM\n")
         md.append(llm_summary + "\n")
@@ -227,7 +196,7 @@ def produce_markdown_report(diag, llm_summary=None, group_name="Grupo X", member
     return "\n".join(md)
 
 def generate_llm_summary(diag):
-    if llm is None:
+    if not llm.disponivel:
         return None
     # Cria prompt curto com diagnóstico para o LLM sintetizar em linguagem natural
     prompt = f"""
@@ -248,9 +217,11 @@ Responda em português.
         text = str(res)
     return text
 
-def main():
-    print("[INFO] Carregando planilha gerada pelo processamento...")
-    df_gen = read_sheet(GENERATED_PATH)
+def main(df_gen=None):
+    """`df_gen` permite validar a planilha final já em memória (sem reler o xlsx)."""
+    if df_gen is None:
+        print("[INFO] Carregando planilha gerada pelo processamento...")
+        df_gen = read_sheet(GENERATED_PATH)
     if df_gen is None:
         print(f"⛔ Arquivo gerado não encontrado em {GENERATED_PATH}. Rode o processamento primeiro.")
         sys.exit(1)
@@ -269,7 +240,9 @@ def main():
 
     # gera resumo via LLM (opcional)
     llm_summary = None
-    if GOOGLE_API_KEY:
+    if not llm.disponivel:
+        print("⚠️ GOOGLE_API_KEY não encontrada no .env. O LLM não poderá gerar o relatório.")
+    else:
         try:
             llm_summary = generate_llm_summary({k: v for k, v in diag.items() if k != 'conversion_report'})
         except Exception as e:
@@ -289,7 +262,7 @@ def main():
         cols_final = df_fixed.columns.tolist()
     df_to_save = df_fixed[cols_final]
     # salva como excel (numéricos mantidos como numéricos)
-    df_to_save.to_excel(FINAL_OUTPUT_PATH, index=False)
+    escrever_xlsx(df_to_save, FINAL_OUTPUT_PATH)
     print(f"[INFO] Arquivo final salvo como {FINAL_OUTPUT_PATH}")
 
     # salva diagnóstico completo
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+
+# ========================
+# Intervalos de ausência (férias / afastamentos)
+# ========================
+def colunas_intervalo(df: pd.DataFrame):
+    """
+    Procura colunas de início e fim do período (ex.: 'INICIO FÉRIAS',
+    'FIM FÉRIAS', 'DATA RETORNO'). Retorna (col_inicio, col_fim, fim_exclusivo)
+    ou (None, None, False) se a planilha só tem a contagem de dias.
+    """
+    col_inicio = next((c for c in df.columns if "INIC" in c.upper() or "INÍC" in c.upper()), None)
+    col_fim = next((c for c in df.columns if "FIM" in c.upper() or "TERMINO" in c.upper() or "TÉRMINO" in c.upper()), None)
+    fim_exclusivo = False
+    if col_fim is None:
+        # Data de retorno: o último dia de ausência é a véspera
+        col_fim = next((c for c in df.columns if "RETORNO" in c.upper()), None)
+        fim_exclusivo = col_fim is not None
+    if col_inicio is None or col_fim is None:
+        return None, None, False
+    return col_inicio, col_fim, fim_exclusivo
+
+
+def linhas_com_intervalo(df: pd.DataFrame) -> np.ndarray:
+    """Máscara das linhas com início e fim de ausência preenchidos."""
+    col_inicio, col_fim, _ = colunas_intervalo(df)
+    if col_inicio is None:
+        return np.zeros(len(df), dtype=bool)
+    inicio = pd.to_datetime(df[col_inicio], errors="coerce")
+    fim = pd.to_datetime(df[col_fim], errors="coerce")
+    return (inicio.notna() & fim.notna()).to_numpy()
+
+
+def extrair_intervalos(df: pd.DataFrame, tipo: str) -> pd.DataFrame:
+    """Intervalos [INICIO, FIM] (inclusivos) de uma planilha: MATRICULA | INICIO | FIM | TIPO."""
+    colunas = ["MATRICULA", "INICIO", "FIM", "TIPO"]
+    if df is None:
+        return pd.DataFrame(columns=colunas)
+    df = df.rename(columns={col: "MATRICULA" for col in df.columns if "MATRIC" in col.upper()})
+    col_inicio, col_fim, fim_exclusivo = colunas_intervalo(df)
+    if col_inicio is None or "MATRICULA" not in df.columns:
+        return pd.DataFrame(columns=colunas)
+
+    mask = linhas_com_intervalo(df)
+    intervalos = pd.DataFrame({
+        "MATRICULA": df.loc[mask, "MATRICULA"].to_numpy(),
+        "INICIO": pd.to_datetime(df.loc[mask, col_inicio]).to_numpy().astype("datetime64[D]"),
+        "FIM": pd.to_datetime(df.loc[mask, col_fim]).to_numpy().astype("datetime64[D]"),
+        "TIPO": tipo,
+    })
+    if fim_exclusivo:
+        intervalos["FIM"] = intervalos["FIM"] - pd.Timedelta(days=1)
+    return intervalos[intervalos["INICIO"] <= intervalos["FIM"]]
+
+
+def montar_intervalos(bases: dict) -> pd.DataFrame:
+    return pd.concat(
+        [
+            extrair_intervalos(bases.get("ferias"), "FERIAS"),
+            extrair_intervalos(bases.get("afastamentos"), "AFASTAMENTO"),
+        ],
+        ignore_index=True,
+    )
+
+
+def unir_sobrepostos(intervalos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ordena por (MATRICULA, INICIO) e funde intervalos que se sobrepõem ou
+    se encostam, para que um mesmo dia não seja descontado duas vezes.
+    """
+    if intervalos.empty:
+        return intervalos[["MATRICULA", "INICIO", "FIM"]]
+    df = intervalos.sort_values(["MATRICULA", "INICIO"], kind="stable").reset_index(drop=True)
+    # Maior FIM visto até a linha anterior, dentro da mesma MATRICULA
+    fim_acum = df.groupby("MATRICULA")["FIM"].cummax()
+    fim_anterior = fim_acum.groupby(df["MATRICULA"]).shift(1)
+    novo_bloco = fim_anterior.isna() | (df["INICIO"] > fim_anterior + pd.Timedelta(days=1))
+    bloco = novo_bloco.cumsum()
+    return (
+        df.groupby(bloco)
+        .agg(MATRICULA=("MATRICULA", "first"), INICIO=("INICIO", "min"), FIM=("FIM", "max"))
+        .reset_index(drop=True)
+    )
+
+
+# ========================
+# Dias úteis perdidos
+# ========================
+def dias_uteis_perdidos(df: pd.DataFrame, intervalos: pd.DataFrame, calendario,
+                        inicio=None, fim=None) -> np.ndarray:
+    """
+    Dias úteis de ausência de cada linha de `df` (MATRICULA, Sindicato)
+    dentro do período do `calendario`, opcionalmente recortado à janela
+    [inicio, fim] de cada colaborador.
+
+    Os intervalos ficam em arrays ordenados por MATRICULA; cada linha
+    localiza os seus com np.searchsorted, os pares (linha, intervalo) são
+    expandidos com np.repeat e contados de uma vez com busday_count.
+    """
+    n = len(df)
+    if n == 0 or intervalos.empty:
+        return np.zeros(n, dtype=np.int64)
+
+    blocos = unir_sobrepostos(intervalos)
+    chaves = pd.to_numeric(blocos["MATRICULA"], errors="coerce").to_numpy(dtype="float64")
+    ordem = np.argsort(chaves, kind="stable")
+    chaves = chaves[ordem]
+    ini_int = blocos["INICIO"].to_numpy().astype("datetime64[D]")[ordem]
+    fim_int = blocos["FIM"].to_numpy().astype("datetime64[D]")[ordem]
+
+    matriculas = pd.to_numeric(df["MATRICULA"], errors="coerce").to_numpy(dtype="float64")
+    esq = np.searchsorted(chaves, matriculas, side="left")
+    dir_ = np.searchsorted(chaves, matriculas, side="right")
+    qtd = np.where(np.isnan(matriculas), 0, dir_ - esq)
+    if qtd.sum() == 0:
+        return np.zeros(n, dtype=np.int64)
+
+    # Pares (linha, intervalo)
+    linhas = np.repeat(np.arange(n), qtd)
+    deslocamento = np.arange(qtd.sum()) - np.repeat(np.cumsum(qtd) - qtd, qtd)
+    idx = np.repeat(esq, qtd) + deslocamento
+
+    ini = ini_int[idx]
+    fim_ = fim_int[idx]
+    if inicio is not None:
+        janela_ini = pd.to_datetime(pd.Series(inicio), errors="coerce").to_numpy().astype("datetime64[D]")[linhas]
+        ini = np.where(np.isnat(janela_ini), ini, np.maximum(ini, janela_ini))
+    if fim is not None:
+        janela_fim = pd.to_datetime(pd.Series(fim), errors="coerce").to_numpy().astype("datetime64[D]")[linhas]
+        fim_ = np.where(np.isnat(janela_fim), fim_, np.minimum(fim_, janela_fim))
+
+    sindicatos = pd.Series(df["Sindicato"]).astype(object).to_numpy()[linhas]
+    dias = calendario.contar(pd.Series(sindicatos), ini, fim_)
+    return np.bincount(linhas, weights=dias, minlength=n).astype(np.int64)
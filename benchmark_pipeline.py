@@ -0,0 +1,160 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from esquema import comparar_memoria
+from gerador_sintetico import gerar_zip
+from processamento import (
+    carregar_bases,
+    consolidar_bases,
+    aplicar_regras_exclusao,
+    calcular_dias_uteis,
+    calcular_valores_vr,
+    exportar_planilha_final,
+)
+
+PASTA_BENCHMARKS = "dados/benchmarks"
+LIMITE_REGRESSAO = 0.20  # 20% mais lento (ou mais memória) que a referência
+
+
+# ========================
+# Etapas medidas
+# ========================
+# Cada etapa lê o que precisa de `estado` e devolve (chave, resultado) para as seguintes
+ETAPAS = [
+    ("carregar_bases", lambda e: ("bases", carregar_bases(e["zip"], usar_cache=False))),
+    ("consolidar_bases", lambda e: ("df_base", consolidar_bases(e["bases"]))),
+    ("aplicar_regras_exclusao", lambda e: ("df_filtrada", aplicar_regras_exclusao(e["bases"], e["df_base"]))),
+    ("calcular_dias_uteis", lambda e: ("df_dias", calcular_dias_uteis(e["df_filtrada"], e["bases"]))),
+    ("calcular_valores_vr", lambda e: ("df_vr", calcular_valores_vr(e["df_dias"], e["bases"]))),
+    ("exportar_planilha_final", lambda e: ("df_final", exportar_planilha_final(e["df_vr"], e["saida"]))),
+]
+
+
+def _linhas(resultado) -> int:
+    if isinstance(resultado, dict):
+        return sum(len(df) for df in resultado.values())
+    return len(resultado)
+
+
+def executar_etapas(caminho_zip: str, medir_memoria: bool = False) -> list:
+    """
+    Roda as etapas em sequência sobre o ZIP e devolve, por etapa, o tempo
+    (s), as linhas de saída e, com `medir_memoria`, o pico de memória
+    alocada pela etapa (MB, via tracemalloc — que deixa tudo mais lento,
+    por isso os tempos só valem na passada sem memória).
+    """
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta:
+        estado = {"zip": caminho_zip, "saida": os.path.join(pasta, "VR MENSAL.xlsx")}
+        for nome, etapa in ETAPAS:
+            if medir_memoria:
+                tracemalloc.start()
+            inicio = time.perf_counter()
+            # Os prints de [DEBUG] das etapas não entram na saída do benchmark
+            with contextlib.redirect_stdout(io.StringIO()):
+                chave, resultado = etapa(estado)
+            segundos = time.perf_counter() - inicio
+            pico_mb = None
+            if medir_memoria:
+                pico_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+                tracemalloc.stop()
+            estado[chave] = resultado
+            resultados.append({"etapa": nome, "segundos": segundos, "pico_mb": pico_mb,
+                               "linhas_saida": _linhas(resultado)})
+    return resultados
+
+
+def memoria_esquema(caminho_zip: str) -> dict:
+    """Footprint da base consolidada com e sem o esquema de tipos (esquema.comparar_memoria)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_base = consolidar_bases(carregar_bases(caminho_zip, usar_cache=False))
+    return comparar_memoria(df_base)
+
+
+def zip_sintetico(headcount: int, semente: int = 0) -> str:
+    """ZIP sintético do tamanho pedido, gerado uma vez e reaproveitado entre execuções."""
+    caminho = os.path.join(PASTA_BENCHMARKS, f"sintetico_{headcount}.zip")
+    if not os.path.exists(caminho):
+        gerar_zip(caminho, headcount, semente=semente)
+    return caminho
+
+
+def benchmark(tamanhos=(10_000, 100_000), medir_memoria: bool = True, repeticoes: int = 1) -> pd.DataFrame:
+    """
+    Uma linha por (tamanho, etapa): linhas, etapa, segundos, pico_mb,
+    linhas_saida. Com `repeticoes` > 1, vale o melhor tempo de cada etapa.
+    """
+    linhas = []
+    for headcount in tamanhos:
+        caminho_zip = zip_sintetico(headcount)
+        print(f"\n[DEBUG] Benchmark com {headcount} ativos ({caminho_zip})")
+        tempos = executar_etapas(caminho_zip)
+        for _ in range(repeticoes - 1):
+            for t, novo in zip(tempos, executar_etapas(caminho_zip)):
+                t["segundos"] = min(t["segundos"], novo["segundos"])
+        if medir_memoria:
+            memoria = executar_etapas(caminho_zip, medir_memoria=True)
+            for t, m in zip(tempos, memoria):
+                t["pico_mb"] = m["pico_mb"]
+            esquema = memoria_esquema(caminho_zip)
+            print(f"  Base consolidada: {esquema['mb_sem_esquema']:.1f} MB sem esquema → "
+                  f"{esquema['mb_com_esquema']:.1f} MB com esquema (-{esquema['reducao_pct']:.1f}%)")
+        for t in tempos:
+            linhas.append({"linhas": headcount, **t})
+            pico = f"{t['pico_mb']:9.1f} MB" if t["pico_mb"] is not None else ""
+            print(f"  {t['etapa']:<24} {t['segundos']:8.3f} s {pico}")
+    return pd.DataFrame(linhas)
+
+
+# ========================
+# Comparação com uma referência
+# ========================
+def comparar(atual: pd.DataFrame, referencia: pd.DataFrame, limite: float = LIMITE_REGRESSAO) -> pd.DataFrame:
+    """
+    Razão atual/referência de tempo e memória por (linhas, etapa); REGRESSAO
+    marca as etapas que passaram de 1 + `limite` em qualquer um dos dois.
+    """
+    df = atual.merge(referencia, on=["linhas", "etapa"], suffixes=("", "_ref"))
+    df["razao_tempo"] = df["segundos"] / df["segundos_ref"]
+    df["razao_memoria"] = df["pico_mb"] / df["pico_mb_ref"]
+    df["REGRESSAO"] = (df["razao_tempo"] > 1 + limite) | (df["razao_memoria"] > 1 + limite)
+    return df[["linhas", "etapa", "segundos", "segundos_ref", "razao_tempo",
+               "pico_mb", "pico_mb_ref", "razao_memoria", "REGRESSAO"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark por etapa do pipeline de VR com dados sintéticos")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000],
+                        help="headcounts de ATIVOS (ex.: 10000 100000 1000000)")
+    parser.add_argument("--repeticoes", type=int, default=1, help="execuções por tamanho (vale o melhor tempo)")
+    parser.add_argument("--sem-memoria", action="store_true", help="não faz a passada com tracemalloc")
+    parser.add_argument("--referencia", help="CSV de um benchmark anterior para detectar regressões")
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO)
+    args = parser.parse_args(argv)
+
+    resultado = benchmark(args.linhas, medir_memoria=not args.sem_memoria, repeticoes=args.repeticoes)
+    os.makedirs(PASTA_BENCHMARKS, exist_ok=True)
+    caminho = os.path.join(PASTA_BENCHMARKS, f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+    resultado.to_csv(caminho, index=False)
+    print(f"\n[DEBUG] Resultados salvos em {caminho}")
+
+    if args.referencia:
+        comparacao = comparar(resultado, pd.read_csv(args.referencia), args.limite)
+        print(comparacao.to_string(index=False))
+        regressoes = comparacao[comparacao["REGRESSAO"]]
+        if len(regressoes):
+            print(f"\n⚠️ {len(regressoes)} etapa(s) acima de {1 + args.limite:.0%} da referência")
+            return 1
+        print("\n✅ Nenhuma regressão em relação à referência")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
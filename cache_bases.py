@@ -0,0 +1,140 @@
+import hashlib
+import importlib.util
+import os
+import zipfile
+
+import pandas as pd
+
+# Só verifica se o pyarrow existe; quem grava o parquet é o pandas
+PARQUET_DISPONIVEL = importlib.util.find_spec("pyarrow") is not None
+
+
+# ========================
+# Configuração do cache
+# ========================
+PASTA_CACHE = "dados/cache"
+TAMANHO_MAXIMO_CACHE = 512 * 1024 * 1024  # 512 MB
+
+# Incrementar quando a forma de ler as planilhas mudar (invalida entradas antigas)
+VERSAO_CACHE = "1"
+
+
+def hash_conteudo(conteudo: bytes) -> str:
+    """Hash do conteúdo bruto de um membro do ZIP (+ versão do cache)."""
+    h = hashlib.sha256()
+    h.update(VERSAO_CACHE.encode())
+    h.update(conteudo)
+    return h.hexdigest()
+
+
+# Parquet é o formato principal; planilhas com colunas de tipos mistos
+# (que o Arrow não serializa) caem para pickle para preservar os dtypes.
+EXTENSOES = (".parquet", ".pkl")
+
+
+def _caminho_entrada(chave: str, pasta: str, extensao: str = ".parquet") -> str:
+    return os.path.join(pasta, f"{chave}{extensao}")
+
+
+# ========================
+# Leitura / gravação
+# ========================
+def ler_do_cache(chave: str, pasta: str = PASTA_CACHE):
+    """Retorna o DataFrame em cache para a chave, ou None se não existir."""
+    caminho = next(
+        (c for c in (_caminho_entrada(chave, pasta, ext) for ext in EXTENSOES) if os.path.exists(c)),
+        None,
+    )
+    if caminho is None:
+        return None
+    try:
+        if caminho.endswith(".parquet"):
+            df = pd.read_parquet(caminho)
+        else:
+            df = pd.read_pickle(caminho)
+    except Exception as e:
+        print(f"⚠️ Entrada de cache corrompida ({caminho}), descartando:", e)
+        os.remove(caminho)
+        return None
+    # Atualiza o mtime para a política LRU da remoção por tamanho
+    os.utime(caminho, None)
+    return df
+
+
+def gravar_no_cache(chave: str, df: pd.DataFrame, pasta: str = PASTA_CACHE,
+                    tamanho_maximo: int = TAMANHO_MAXIMO_CACHE) -> bool:
+    """Grava o DataFrame em Parquet (ou pickle). Retorna False se não foi possível cachear."""
+    os.makedirs(pasta, exist_ok=True)
+    caminho = None
+    if PARQUET_DISPONIVEL:
+        caminho = _caminho_entrada(chave, pasta, ".parquet")
+        try:
+            df.to_parquet(caminho + ".tmp", index=False)
+        except Exception:
+            caminho = None
+    if caminho is None:
+        caminho = _caminho_entrada(chave, pasta, ".pkl")
+        try:
+            df.to_pickle(caminho + ".tmp")
+        except Exception as e:
+            print("⚠️ Não foi possível gravar no cache:", e)
+            for ext in EXTENSOES:
+                tmp = _caminho_entrada(chave, pasta, ext) + ".tmp"
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            return False
+    os.replace(caminho + ".tmp", caminho)
+    aplicar_limite_tamanho(pasta, tamanho_maximo)
+    return True
+
+
+# ========================
+# Remoção / invalidação
+# ========================
+def _entradas(pasta: str):
+    if not os.path.isdir(pasta):
+        return []
+    return [
+        os.path.join(pasta, nome) for nome in os.listdir(pasta) if nome.endswith(EXTENSOES)
+    ]
+
+
+def tamanho_cache(pasta: str = PASTA_CACHE) -> int:
+    return sum(os.path.getsize(c) for c in _entradas(pasta))
+
+
+def aplicar_limite_tamanho(pasta: str = PASTA_CACHE, tamanho_maximo: int = TAMANHO_MAXIMO_CACHE) -> int:
+    """Remove as entradas menos usadas recentemente até caber no limite. Retorna quantas removeu."""
+    entradas = sorted(_entradas(pasta), key=os.path.getmtime)
+    total = sum(os.path.getsize(c) for c in entradas)
+    removidas = 0
+    while entradas and total > tamanho_maximo:
+        caminho = entradas.pop(0)
+        total -= os.path.getsize(caminho)
+        os.remove(caminho)
+        removidas += 1
+    return removidas
+
+
+def invalidar_cache(caminho_zip: str = None, pasta: str = PASTA_CACHE) -> int:
+    """
+    Invalida o cache. Sem argumentos apaga tudo; com `caminho_zip` apaga
+    apenas as entradas correspondentes aos membros atuais daquele ZIP.
+    Retorna quantas entradas foram removidas.
+    """
+    if caminho_zip is None:
+        alvos = _entradas(pasta)
+    else:
+        with zipfile.ZipFile(caminho_zip, "r") as zip_ref:
+            alvos = [
+                _caminho_entrada(hash_conteudo(zip_ref.read(nome)), pasta, ext)
+                for nome in zip_ref.namelist()
+                for ext in EXTENSOES
+            ]
+    removidas = 0
+    for caminho in alvos:
+        if os.path.exists(caminho):
+            os.remove(caminho)
+            removidas += 1
+    print(f"[DEBUG] Cache invalidado: {removidas} entradas removidas")
+    return removidas
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+
+import pandas as pd
+
+
+# ========================
+# Configuração do cache de respostas do agente
+# ========================
+PASTA_RESPOSTAS = "dados/cache/respostas"
+MAXIMO_ENTRADAS = 1000
+TTL_SEGUNDOS = 7 * 24 * 3600  # respostas expiram em 7 dias
+
+
+def normalizar_pergunta(pergunta: str) -> str:
+    """Caixa, espaços repetidos e pontuação final não mudam a resposta."""
+    texto = unicodedata.normalize("NFKC", str(pergunta)).casefold()
+    texto = re.sub(r"\s+", " ", texto).strip()
+    return texto.rstrip("?!. ")
+
+
+def impressao_dataframe(df: pd.DataFrame) -> str:
+    """Hash do conteúdo da planilha (valores, colunas e tipos): muda se qualquer célula mudar."""
+    h = hashlib.sha256()
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def versao_instrucoes(instrucoes: str) -> str:
+    """Versão do prompt: qualquer mudança no texto das instruções invalida as respostas."""
+    return hashlib.sha256(instrucoes.encode()).hexdigest()[:16]
+
+
+class CacheRespostas:
+    """
+    Respostas do agente em disco (um JSON por pergunta), chaveadas por
+    (pergunta normalizada, impressão da planilha, versão das instruções,
+    backend do LLM) — respostas do LLM falso nunca servem para o Gemini.
+    Remove as menos usadas (mtime) acima de `maximo_entradas` e ignora
+    entradas mais velhas que `ttl`.
+    """
+
+    def __init__(self, pasta: str = PASTA_RESPOSTAS, maximo_entradas: int = MAXIMO_ENTRADAS,
+                 ttl: float = TTL_SEGUNDOS):
+        self.pasta = pasta
+        self.maximo_entradas = maximo_entradas
+        self.ttl = ttl
+        self.acertos = 0
+        self.falhas = 0
+        self.expiradas = 0
+
+    @staticmethod
+    def chave(pergunta: str, impressao: str, versao: str, backend: str) -> str:
+        h = hashlib.sha256()
+        for parte in (normalizar_pergunta(pergunta), impressao, versao, backend):
+            h.update(parte.encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.pasta, f"{chave}.json")
+
+    def obter(self, chave: str):
+        """Resposta em cache para a chave, ou None (ausente, expirada ou corrompida)."""
+        caminho = self._caminho(chave)
+        if not os.path.exists(caminho):
+            self.falhas += 1
+            return None
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                entrada = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Resposta em cache corrompida ({caminho}), descartando:", e)
+            os.remove(caminho)
+            self.falhas += 1
+            return None
+        if self.ttl is not None and time.time() - entrada["criado_em"] > self.ttl:
+            os.remove(caminho)
+            self.expiradas += 1
+            self.falhas += 1
+            return None
+        # Atualiza o mtime para a política LRU
+        os.utime(caminho, None)
+        self.acertos += 1
+        return entrada["resposta"]
+
+    def gravar(self, chave: str, pergunta: str, resposta: str):
+        os.makedirs(self.pasta, exist_ok=True)
+        caminho = self._caminho(chave)
+        with open(caminho + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"pergunta": pergunta, "resposta": resposta, "criado_em": time.time()}, f, ensure_ascii=False)
+        os.replace(caminho + ".tmp", caminho)
+        self.aplicar_limite()
+
+    def _entradas(self):
+        if not os.path.isdir(self.pasta):
+            return []
+        return [os.path.join(self.pasta, nome) for nome in os.listdir(self.pasta) if nome.endswith(".json")]
+
+    def aplicar_limite(self) -> int:
+        """Remove as entradas menos usadas recentemente além de `maximo_entradas`."""
+        entradas = sorted(self._entradas(), key=os.path.getmtime)
+        excesso = entradas[:max(0, len(entradas) - self.maximo_entradas)]
+        for caminho in excesso:
+            os.remove(caminho)
+        return len(excesso)
+
+    def limpar(self) -> int:
+        entradas = self._entradas()
+        for caminho in entradas:
+            os.remove(caminho)
+        return len(entradas)
+
+    def estatisticas(self) -> dict:
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "expiradas": self.expiradas,
+            "taxa_acerto": round(self.acertos / consultas, 3) if consultas else 0.0,
+            "entradas": len(self._entradas()),
+        }
@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from dimensao_sindicato import carregar_configuracao, uf_do_nome
+
+
+# ========================
+# Feriados
+# ========================
+# Datas fixas (MM-DD). Estaduais e por sindicato são configuráveis na criação do calendário.
+FERIADOS_NACIONAIS_FIXOS = ["01-01", "04-21", "05-01", "09-07", "10-12", "11-02", "11-15", "11-20", "12-25"]
+
+FERIADOS_ESTADUAIS = {
+    "SP": ["07-09"],
+    "RJ": ["04-23"],
+    "RS": ["09-20"],
+    "PR": ["12-19"],
+}
+
+# Período coberto pela "Base dias uteis" (15/04 a 15/05)
+INICIO_PERIODO = "2025-04-15"
+FIM_PERIODO = "2025-05-15"
+COMPETENCIA_PADRAO = "05.2025"
+
+
+def periodo_competencia(competencia: str) -> tuple:
+    """
+    Período de apuração de uma competência "MM.AAAA": do dia 15 do mês
+    anterior ao dia 15 do mês (ex.: "05.2025" → ("2025-04-15", "2025-05-15")).
+    """
+    mes, ano = (int(parte) for parte in str(competencia).split("."))
+    inicio = date(ano - 1, 12, 15) if mes == 1 else date(ano, mes - 1, 15)
+    return inicio.isoformat(), date(ano, mes, 15).isoformat()
+
+
+def pascoa(ano: int) -> date:
+    """Domingo de Páscoa (algoritmo de Meeus/Jones/Butcher)."""
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(ano, mes, dia + 1)
+
+
+def feriados_nacionais(ano: int) -> list:
+    """Feriados nacionais fixos + móveis (Carnaval, Sexta-feira Santa, Corpus Christi)."""
+    p = pascoa(ano)
+    moveis = [p - timedelta(days=48), p - timedelta(days=47), p - timedelta(days=2), p + timedelta(days=60)]
+    fixos = [date.fromisoformat(f"{ano}-{md}") for md in FERIADOS_NACIONAIS_FIXOS]
+    return fixos + moveis
+
+
+# ========================
+# Calendário por sindicato
+# ========================
+class CalendarioUteis:
+    """
+    Calendários de dias úteis (np.busdaycalendar) por sindicato, combinando
+    feriados nacionais, estaduais (pela UF do sindicato) e os específicos
+    do sindicato. Conta os dias úteis de colunas inteiras de datas com
+    np.busday_count, um grupo por sindicato. A UF vem de
+    dimensao_sindicato.uf_do_nome, com a configuração lida uma vez aqui.
+    """
+
+    def __init__(self, inicio=INICIO_PERIODO, fim=FIM_PERIODO, feriados_estaduais: dict = None,
+                 feriados_sindicato: dict = None, dias_semana: str = "1111100", config: dict = None):
+        self.inicio = np.datetime64(pd.Timestamp(inicio).date(), "D")
+        self.fim = np.datetime64(pd.Timestamp(fim).date(), "D")
+        self.feriados_estaduais = FERIADOS_ESTADUAIS if feriados_estaduais is None else feriados_estaduais
+        self.feriados_sindicato = feriados_sindicato or {}
+        self.dias_semana = dias_semana
+        self.config = carregar_configuracao() if config is None else config
+        self._anos = range(self.inicio.astype(object).year, self.fim.astype(object).year + 1)
+        self._cache = {}
+
+    def feriados(self, sindicato) -> list:
+        datas = [d for ano in self._anos for d in feriados_nacionais(ano)]
+        uf = uf_do_nome(sindicato, self.config)
+        for md in self.feriados_estaduais.get(uf, []):
+            datas += [date.fromisoformat(f"{ano}-{md}") for ano in self._anos]
+        datas += [pd.Timestamp(d).date() for d in self.feriados_sindicato.get(sindicato, [])]
+        return sorted(set(datas))
+
+    def calendario(self, sindicato) -> np.busdaycalendar:
+        if sindicato not in self._cache:
+            self._cache[sindicato] = np.busdaycalendar(
+                weekmask=self.dias_semana, holidays=np.array(self.feriados(sindicato), dtype="datetime64[D]")
+            )
+        return self._cache[sindicato]
+
+    def contar(self, sindicatos: pd.Series, inicio=None, fim=None) -> np.ndarray:
+        """
+        Dias úteis em [inicio, fim] (inclusivo) para cada linha. `inicio`/`fim`
+        podem ser colunas de datas ou omitidos (usa o período do calendário);
+        são recortados ao período e janelas vazias valem 0.
+        """
+        n = len(sindicatos)
+        ini = np.maximum(self._datas(inicio, self.inicio, n), self.inicio)
+        fim_ = np.minimum(self._datas(fim, self.fim, n), self.fim)
+        # busday_count conta [ini, fim); soma 1 dia para incluir o fim (janelas vazias → 0)
+        fim_ = np.maximum(fim_ + np.timedelta64(1, "D"), ini)
+
+        codigos, unicos = pd.factorize(pd.Series(sindicatos).astype(object), use_na_sentinel=True)
+        resultado = np.zeros(n, dtype=np.int64)
+        for k, sindicato in enumerate(list(unicos) + [None]):
+            sel = codigos == (k if sindicato is not None else -1)
+            if sel.any():
+                resultado[sel] = np.busday_count(ini[sel], fim_[sel], busdaycal=self.calendario(sindicato))
+        return resultado
+
+    @staticmethod
+    def _datas(valores, padrao, n) -> np.ndarray:
+        if valores is None:
+            return np.full(n, padrao)
+        datas = pd.to_datetime(pd.Series(valores), errors="coerce").to_numpy().astype("datetime64[D]")
+        return np.where(np.isnat(datas), padrao, datas)
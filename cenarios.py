@@ -0,0 +1,149 @@
+"""
+Motor de cenários de VR: "e se SP for para R$ 40?", "e se a divisão virar 85/15?".
+
+Recebe a base já calculada (DIAS_CALCULADOS e valor unitário por
+colaborador) e avalia todos os cenários de uma vez, numa matriz
+colaboradores × cenários montada por broadcasting do NumPy (colaboradores
+com os mesmos dias, valor e UF entram uma vez, com peso), com as mesmas
+regras do reparador (arredondamento a centavos por colaborador, sem
+negativos). Devolve os totais de VR, EMPRESA e COLABORADOR por cenário.
+
+Uso:
+    python cenarios.py cenarios.json [planilha.xlsx]
+
+onde cenarios.json é uma lista de cenários, por exemplo
+    [{"nome": "SP a 40", "valores": {"SP": 40}},
+     {"nome": "85/15", "empresa": 0.85},
+     {"nome": "reajuste 5%", "reajuste": 1.05}]
+"""
+import itertools
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+from dimensao_sindicato import resolver_uf
+from reparador import COLUNAS_PIPELINE, COLUNAS_PLANILHA
+
+CAMINHO_PLANILHA = "dados/VR MENSAL 05.2025.xlsx"
+
+# Elementos da matriz colaboradores × cenários por bloco (~40 MB em float64)
+ELEMENTOS_POR_BLOCO = 5_000_000
+
+EMPRESA_PADRAO = 0.8
+
+
+# ========================
+# Cenários
+# ========================
+def grade_cenarios(valores: dict = None, empresa=(EMPRESA_PADRAO,), reajuste=(1.0,)) -> list:
+    """
+    Produto cartesiano de parâmetros, ex.:
+        grade_cenarios({"SP": [37.5, 40, 42.5]}, empresa=[0.8, 0.85])  → 6 cenários
+    """
+    valores = valores or {}
+    ufs = list(valores)
+    cenarios = []
+    for combinacao in itertools.product(*(valores[uf] for uf in ufs), empresa, reajuste):
+        por_uf = dict(zip(ufs, combinacao[:len(ufs)]))
+        emp, fator = combinacao[len(ufs):]
+        partes = [f"{uf}={v:g}" for uf, v in por_uf.items()] + [f"{emp * 100:g}/{(1 - emp) * 100:g}"]
+        if fator != 1.0:
+            partes.append(f"x{fator:g}")
+        cenarios.append({"nome": " ".join(partes), "valores": por_uf, "empresa": emp, "reajuste": fator})
+    return cenarios
+
+
+def _parametros(cenarios: list, ufs: pd.Index):
+    """Matriz de valores por UF (cenários × UFs, NaN = mantém o valor atual), fator e % da empresa."""
+    sobrescritos = np.full((len(cenarios), len(ufs)), np.nan)
+    for i, cenario in enumerate(cenarios):
+        for uf, valor in (cenario.get("valores") or {}).items():
+            pos = ufs.get_indexer([uf])[0]
+            if pos >= 0:
+                sobrescritos[i, pos] = valor
+    reajuste = np.array([c.get("reajuste", 1.0) for c in cenarios], dtype=float)
+    empresa = np.array([c.get("empresa", EMPRESA_PADRAO) for c in cenarios], dtype=float)
+    return sobrescritos, reajuste, empresa
+
+
+# ========================
+# Avaliação
+# ========================
+def _colunas(df: pd.DataFrame) -> dict:
+    return COLUNAS_PIPELINE if COLUNAS_PIPELINE["dias"] in df.columns else COLUNAS_PLANILHA
+
+
+def _ufs(df: pd.DataFrame) -> pd.Series:
+    if "UF" in df.columns:
+        return df["UF"].astype(object)
+    coluna = "Sindicato" if "Sindicato" in df.columns else "SINDICATO"
+    return resolver_uf(df[coluna])
+
+
+def avaliar_cenarios(df: pd.DataFrame, cenarios: list, elementos_por_bloco: int = ELEMENTOS_POR_BLOCO) -> pd.DataFrame:
+    """
+    Totais por cenário (VR_TOTAL, VR_EMPRESA, VR_COLABORADOR e a variação do
+    VR_TOTAL sobre a base atual). `df` é a saída do pipeline (DIAS_CALCULADOS,
+    VR_VALOR) ou a planilha final (DIAS ÚTEIS, VALOR UNITÁRIO); a UF vem da
+    coluna UF ou do sindicato. Cada cenário pode ter `valores` (UF → valor
+    diário), `reajuste` (fator sobre todos os valores) e `empresa` (fração
+    paga pela empresa; o colaborador paga o resto).
+    """
+    colunas = _colunas(df)
+    dias = np.clip(np.nan_to_num(pd.to_numeric(df[colunas["dias"]], errors="coerce").to_numpy(dtype=float)), 0, None)
+    valor_atual = pd.to_numeric(df[colunas["valor"]], errors="coerce").to_numpy(dtype=float)
+    codigos, ufs = pd.factorize(_ufs(df))
+    base_total = np.nansum(np.round(dias * np.clip(np.round(valor_atual, 2), 0, None), 2))
+
+    # Colaboradores com os mesmos (dias, valor atual, UF) têm o mesmo resultado em qualquer
+    # cenário: a matriz é montada sobre essas combinações distintas, pesadas pela contagem
+    grupos = (
+        pd.DataFrame({"dias": dias, "valor": valor_atual, "codigo": codigos})
+        .groupby(["dias", "valor", "codigo"], dropna=False, sort=False).size().reset_index(name="n")
+    )
+    dias, valor_atual, codigos = (grupos[c].to_numpy() for c in ("dias", "valor", "codigo"))
+    pesos = grupos["n"].to_numpy(dtype=float)
+
+    sobrescritos, reajuste, empresa = _parametros(cenarios, pd.Index(ufs))
+    # Coluna extra de NaN para colaboradores sem UF (código -1): mantêm o valor atual
+    sobrescritos = np.hstack([sobrescritos, np.full((len(cenarios), 1), np.nan)])
+    colaborador = np.round(1 - empresa, 10)
+
+    totais = np.zeros((3, len(cenarios)))
+    bloco = max(1, elementos_por_bloco // max(len(cenarios), 1))
+    for inicio in range(0, len(grupos), bloco):
+        fim = inicio + bloco
+        # (colaboradores distintos) × cenários
+        valor = sobrescritos[:, codigos[inicio:fim]].T
+        valor = np.where(np.isnan(valor), valor_atual[inicio:fim, None], valor) * reajuste
+        valor = np.clip(np.round(valor, 2), 0, None)
+        vr = np.nan_to_num(np.round(dias[inicio:fim, None] * valor, 2))
+        peso = pesos[inicio:fim]
+        totais[0] += peso @ vr
+        totais[1] += peso @ np.round(vr * empresa, 2)
+        totais[2] += peso @ np.round(vr * colaborador, 2)
+
+    resultado = pd.DataFrame({
+        "VR_TOTAL": totais[0].round(2),
+        "VR_EMPRESA": totais[1].round(2),
+        "VR_COLABORADOR": totais[2].round(2),
+    }, index=pd.Index([c.get("nome", f"cenario_{i}") for i, c in enumerate(cenarios)], name="CENARIO"))
+    resultado["VARIACAO_VR_TOTAL"] = (resultado["VR_TOTAL"] - base_total).round(2)
+    return resultado
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python cenarios.py cenarios.json [planilha.xlsx]")
+        sys.exit(1)
+    with open(sys.argv[1], encoding="utf-8") as f:
+        cenarios = json.load(f)
+    caminho = sys.argv[2] if len(sys.argv) > 2 else CAMINHO_PLANILHA
+    df = pd.read_excel(caminho)
+    print(avaliar_cenarios(df, cenarios).to_string())
+
+
+if __name__ == "__main__":
+    main()
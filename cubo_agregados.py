@@ -0,0 +1,233 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from dimensao_sindicato import UFS, carregar_configuracao, resolver_uf
+from normalizacao import sem_acento
+
+
+# ========================
+# Cubo de agregados da planilha final
+# ========================
+# Soma / contagem / média das colunas de VR por dimensão, calculados uma
+# vez na carga. Perguntas de agregado simples ("total de VR por
+# sindicato", "média de dias úteis em SP") saem direto daqui, sem LLM.
+MEDIDAS = ["VR TOTAL", "EMPRESA (80%)", "COLABORADOR (20%)", "DIAS ÚTEIS", "VALOR UNITÁRIO"]
+DIMENSOES = ["SINDICATO", "UF", "STATUS"]
+
+# Nome por extenso de cada UF (regex sobre o texto sem acento). "Pará" sem acento é a
+# preposição "para": só vale depois de no/do/em ("no Pará"), ou escrito com acento (ver responder)
+NOMES_ESTADO = {uf: rf"\b{re.escape(sem_acento(nome))}\b" for uf, nome in UFS.items() if uf != "PA"}
+NOMES_ESTADO["PA"] = r"\b(?:no|do|em|estado do)\s+para\b"
+
+
+def montar_cubo(df: pd.DataFrame) -> dict:
+    """
+    {"TOTAL": Series, dimensão: DataFrame} com colunas (medida, agregação),
+    agg em ("sum", "count", "mean"), e "COLABORADORES" com a contagem de linhas.
+    """
+    df = df.copy()
+    if "UF" not in df.columns and "SINDICATO" in df.columns:
+        df["UF"] = resolver_uf(df["SINDICATO"], carregar_configuracao())
+    medidas = [m for m in MEDIDAS if m in df.columns]
+
+    total = df[medidas].agg(["sum", "count", "mean"]).T.stack()
+    total[("COLABORADORES", "count")] = len(df)
+    cubo = {"TOTAL": total}
+    for dim in DIMENSOES:
+        if dim not in df.columns:
+            continue
+        grupos = df.groupby(dim, observed=True, sort=True)
+        tabela = grupos[medidas].agg(["sum", "count", "mean"])
+        tabela[("COLABORADORES", "count")] = grupos.size()
+        cubo[dim] = tabela
+    return cubo
+
+
+# ========================
+# Roteador de perguntas
+# ========================
+# O cubo só responde quando toda palavra da pergunta é reconhecida (agregação,
+# medida, no máximo um filtro ou agrupamento e palavras de ligação). Qualquer
+# outro qualificador ("admitidos em abril", "dos analistas", "VR zerado")
+# manda a pergunta para o agente.
+
+# Perguntas com estes termos vão para o agente (explicações, colaborador específico...)
+TERMOS_ABERTOS = ["por que", "porque", "explique", "explica", "como foi", "como e", "matricula",
+                  "compare", "compara", "diferenca", "maior", "menor", "ranking", "top", "quem", "liste"]
+
+AGREGACOES = [
+    ("mean", r"\bem media\b|\bmedi[ao]s?\b"),
+    ("count", r"\bquant[oa]s\b|\bquantidade( de)?\b|\bnumero( de)?\b|\bcontagem\b"),
+    ("sum", r"\btota(l|is)\b|\bsoma\b|\bsomado\b|\bquanto\b"),
+]
+
+# Medidas específicas, na ordem em que são consumidas do texto
+MEDIDAS_PADROES = [
+    ("COLABORADOR (20%)", r"\b(parte|desconto|valor) do colaborador\b|\bcolaborador \(20 ?%\)|\b20 ?%|\bdesconto\b"),
+    ("EMPRESA (80%)", r"\b(parte|valor) da empresa\b|\bempresa \(80 ?%\)|\b80 ?%|\bempresa\b"),
+    ("DIAS ÚTEIS", r"\bdias?( uteis)?\b"),
+    ("VALOR UNITÁRIO", r"\bvalor(es)? unitarios?\b|\bunitarios?\b"),
+]
+PADRAO_VR = r"\bvr( total)?\b|\bvale[- ]refeicao\b|\bvales?\b"
+PADRAO_PESSOAS = r"\b(colaboradores|funcionari[oa]s|empregad[oa]s|pessoas)\b"
+
+# Palavras de ligação que não mudam a pergunta
+PALAVRAS_LIGACAO = {
+    "qual", "quais", "e", "o", "a", "os", "as", "de", "do", "da", "dos", "das", "em", "no", "na", "nos",
+    "nas", "ao", "aos", "para", "pelo", "pela", "com", "que", "foi", "foram", "sao", "esta", "estao",
+    "ha", "tem", "existem", "um", "uma", "me", "diga", "informe", "mostre", "valor", "geral", "sindicato",
+    "sindicatos", "estado", "uf", "pago", "paga", "pagos", "recebem", "recebido", "planilha", "base",
+}
+
+# Sigla de UF só vale em forma explícita ("UF SP", "do SP", "em SP"): sozinha, "se", "ma",
+# "pa", "to"... são palavras comuns
+PREFIXOS_SIGLA = r"(?:uf|estado|do|da|de|em|no|na)"
+
+
+def _consumir(texto: str, padrao: str):
+    """(texto sem os trechos que casam com `padrao`, houve casamento)."""
+    novo, n = re.subn(padrao, " ", texto)
+    return novo, n > 0
+
+
+def _agregacao(texto: str):
+    """(agregação de maior prioridade citada, texto sem as palavras de agregação)."""
+    encontradas = []
+    for agg, padrao in AGREGACOES:
+        texto, achou = _consumir(texto, padrao)
+        if achou:
+            encontradas.append(agg)
+    return (encontradas[0] if encontradas else None), texto
+
+
+def _medida(texto: str):
+    """(medida citada, ou None; texto sem as palavras de medida). Duas medidas específicas: ambígua."""
+    especificas = []
+    for medida, padrao in MEDIDAS_PADROES:
+        texto, achou = _consumir(texto, padrao)
+        if achou:
+            especificas.append(medida)
+    texto, vr = _consumir(texto, PADRAO_VR)
+    texto, pessoas = _consumir(texto, PADRAO_PESSOAS)
+    if len(especificas) > 1:
+        return "AMBIGUA", texto
+    if especificas:
+        return especificas[0], texto
+    if vr:
+        return "VR TOTAL", texto
+    return ("COLABORADORES" if pessoas else None), texto
+
+
+def _filtros(texto: str, cubo: dict):
+    """
+    ([(dimensão, valor), ...] citados na pergunta, texto sem eles). Estado
+    citado que não está no cubo entra como ("UF", None): o cubo não sabe responder.
+    """
+    filtros = []
+    if "SINDICATO" in cubo:
+        for nome in cubo["SINDICATO"].index:
+            completo = sem_acento(nome)
+            curto = completo.split(" - ")[0].strip()
+            for trecho in (completo, curto if len(curto) >= 4 else None):
+                if trecho and trecho in texto:
+                    texto = texto.replace(trecho, " ")
+                    filtros.append(("SINDICATO", nome))
+                    break
+    ufs_cubo = set(cubo["UF"].index) if "UF" in cubo else set()
+    # Nomes mais longos primeiro ("mato grosso do sul" antes de "mato grosso")
+    for uf, padrao in sorted(NOMES_ESTADO.items(), key=lambda par: -len(par[1])):
+        texto, achou = _consumir(texto, padrao)
+        if achou:
+            filtros.append(("UF", uf if uf in ufs_cubo else None))
+    siglas = "|".join(uf.lower() for uf in UFS)
+    for sigla in re.findall(rf"\b{PREFIXOS_SIGLA}\s+({siglas})\b", texto):
+        uf = sigla.upper()
+        filtros.append(("UF", uf if uf in ufs_cubo else None))
+    texto = re.sub(rf"\b{PREFIXOS_SIGLA}\s+(?:{siglas})\b", " ", texto)
+    return list(dict.fromkeys(filtros)), texto
+
+
+def _agrupamento(texto: str, cubo: dict):
+    """(dimensão de "por sindicato" / "por UF" / "por estado" / "por status", texto sem o trecho)."""
+    achado = re.search(r"\bpor (sindicato|uf|estado|status)s?\b", texto)
+    if achado is None:
+        return None, texto
+    dim = {"estado": "UF"}.get(achado.group(1), achado.group(1).upper())
+    if dim not in cubo:
+        return "AUSENTE", texto
+    return dim, texto[:achado.start()] + " " + texto[achado.end():]
+
+
+def _sobra(texto: str) -> list:
+    """Palavras que nenhum padrão reconheceu."""
+    return [p for p in re.findall(r"[a-z0-9%]+", texto) if p not in PALAVRAS_LIGACAO]
+
+
+def _formatar(valor: float, medida: str, agg: str) -> str:
+    if agg == "count":
+        return f"{int(valor)}"
+    if medida in ("DIAS ÚTEIS",):
+        return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return "R$ " + f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+NOMES_AGREGACAO = {"sum": "Total", "count": "Quantidade", "mean": "Média"}
+
+
+def responder(pergunta: str, cubo: dict):
+    """
+    Resposta direta do cubo para perguntas de agregado, ou None quando a
+    pergunta não segue um padrão conhecido (vai para o agente LLM).
+    """
+    # "Pará" com acento é o estado, nunca a preposição
+    texto = sem_acento(re.sub(r"\bpará\b", "estado do pará", pergunta.casefold()))
+    texto = texto.replace("headcount", "quantidade de colaboradores")
+    if any(t in texto for t in TERMOS_ABERTOS):
+        return None
+    texto = re.sub(r"[?!.,;:]", " ", texto)
+
+    agrupar, texto = _agrupamento(texto, cubo)
+    filtros, texto = _filtros(texto, cubo)
+    # Agregação antes da medida: em "VR total", o "total" é a agregação
+    agg, texto = _agregacao(texto)
+    medida, texto = _medida(texto)
+    if agg is None or medida in (None, "AMBIGUA") or agrupar == "AUSENTE" or _sobra(texto):
+        return None
+    # Contagem só de colaboradores ("quantos dias úteis..." não é contagem de linhas)
+    if medida == "COLABORADORES" and agg == "sum":
+        agg = "count"
+    if agg == "count" and medida == "VR TOTAL":
+        medida = "COLABORADORES"
+    if (agg == "count") != (medida == "COLABORADORES"):
+        return None
+    # No máximo um qualificador: um filtro ou um agrupamento
+    if len(filtros) + (agrupar is not None) > 1 or any(valor is None for _, valor in filtros):
+        return None
+
+    rotulo = f"{NOMES_AGREGACAO[agg]} de {medida}"
+    if agrupar is not None:
+        if (medida, agg) not in cubo[agrupar].columns:
+            return None
+        serie = cubo[agrupar][(medida, agg)]
+        linhas = [f"- {idx}: {_formatar(v, medida, agg)}" for idx, v in serie.items()]
+        return (f"🔢 {rotulo} por {agrupar}:\n" + "\n".join(linhas)
+                + f"\n📖 Calculado sobre a planilha carregada ({agg} de {medida} agrupado por {agrupar}).")
+
+    if filtros:
+        dim, valor = filtros[0]
+        tabela = cubo[dim]
+        if (medida, agg) not in tabela.columns:
+            return None
+        resultado = tabela.loc[valor, (medida, agg)]
+        contexto = f" em {dim} = {valor}"
+    else:
+        if (medida, agg) not in cubo["TOTAL"].index:
+            return None
+        resultado = cubo["TOTAL"][(medida, agg)]
+        contexto = " (todos os colaboradores)"
+    if pd.isna(resultado):
+        return None
+    return (f"🔢 {rotulo}{contexto}: {_formatar(float(np.asarray(resultado)), medida, agg)}"
+            f"\n📖 Calculado sobre a planilha carregada ({agg} de {medida}{contexto}).")
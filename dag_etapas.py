@@ -0,0 +1,411 @@
+"""
+Pipeline de VR como um DAG de etapas com checkpoints.
+
+Cada etapa declara as etapas de que depende, o código que a implementa e
+a sua configuração. A chave do checkpoint de uma etapa é o hash do nome,
+do código-fonte desse código e de tudo o que ele usa no projeto (funções
+e métodos chamados, constantes, módulos importados, inclusive dentro das
+funções), da configuração e das chaves das etapas de entrada (a etapa raiz
+usa o hash de cada membro do ZIP). A saída é gravada
+em Parquet (ver cache_bases.py) sob essa chave; numa nova execução, etapas
+cuja chave não mudou são lidas do checkpoint, e só as entradas realmente
+necessárias são carregadas. Alterar uma regra de calcular_valores_vr, por
+exemplo, refaz apenas valores → reparada → final; se só a exportação
+falhou, a execução seguinte retoma do checkpoint de "reparada".
+"""
+import ast
+import datetime
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import re
+import textwrap
+import zipfile
+
+import numpy as np
+
+from cache_bases import gravar_no_cache, hash_conteudo, ler_do_cache
+from dimensao_sindicato import carregar_configuracao
+from execucao_fatiada import calcular_dias_uteis_fatiado, calcular_valores_vr_fatiado
+from processamento import (
+    ARQUIVOS_BASES,
+    aplicar_regras_exclusao,
+    calcular_dias_uteis,
+    calcular_valores_vr,
+    carregar_bases_paralelo,
+    consolidar_bases,
+    exportar_planilha_final,
+    reparar_valores_vr,
+)
+
+PASTA_CHECKPOINTS = "dados/checkpoints"
+TAMANHO_MAXIMO_CHECKPOINTS = 1024 * 1024 * 1024  # 1 GB
+
+# Incrementar quando o formato dos checkpoints mudar (invalida todos)
+VERSAO_CHECKPOINT = "2"
+
+PASTA_PROJETO = os.path.dirname(os.path.abspath(__file__))
+
+
+# ========================
+# Etapas
+# ========================
+class Etapa:
+    """
+    Nó do DAG: `funcao(*saidas das entradas, **config)` produz um DataFrame
+    (ou um dict de DataFrames). `codigo` lista os pontos de entrada (funções,
+    classes, módulos) e constantes cujo conteúdo entra na chave do checkpoint;
+    o que eles usam no projeto entra junto (ver fechamento_codigo). `arquivos`
+    marca etapas com efeito em disco: o checkpoint só vale se os arquivos
+    ainda forem os gravados pela execução com essa mesma chave.
+    """
+
+    def __init__(self, nome: str, funcao, entradas=(), codigo=(), config: dict = None, arquivos=()):
+        self.nome = nome
+        self.funcao = funcao
+        self.entradas = tuple(entradas)
+        self.codigo = tuple(codigo) or (funcao,)
+        self.config = config or {}
+        self.arquivos = (arquivos,) if isinstance(arquivos, str) else tuple(arquivos)
+
+    def executar(self, *entradas):
+        return self.funcao(*entradas, **self.config)
+
+
+# ========================
+# Impressão do código
+# ========================
+def _do_projeto(obj) -> bool:
+    modulo = obj if inspect.ismodule(obj) else inspect.getmodule(obj)
+    arquivo = getattr(modulo, "__file__", None)
+    return bool(arquivo) and os.path.dirname(os.path.abspath(arquivo)) == PASTA_PROJETO
+
+
+def _valor_estavel(valor):
+    """repr determinístico de constantes simples; None para objetos sem repr estável."""
+    if valor is None or isinstance(valor, (bool, int, float, str, bytes, np.generic, datetime.date)):
+        return repr(valor)
+    if isinstance(valor, re.Pattern):
+        return f"re.compile({valor.pattern!r}, {valor.flags})"
+    if isinstance(valor, (tuple, list, set, frozenset)):
+        partes = [_valor_estavel(v) for v in valor]
+        if any(p is None for p in partes):
+            return None
+        if isinstance(valor, (set, frozenset)):
+            partes = sorted(partes)
+        return f"{type(valor).__name__}[{', '.join(partes)}]"
+    if isinstance(valor, dict):
+        partes = [(_valor_estavel(k), _valor_estavel(v)) for k, v in valor.items()]
+        if any(k is None or v is None for k, v in partes):
+            return None
+        return "dict{" + ", ".join(f"{k}: {v}" for k, v in partes) + "}"
+    return None
+
+
+def _fonte(obj) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return repr(getattr(obj, "__qualname__", obj))
+
+
+def _imports_do_projeto(fonte: str) -> list:
+    """Módulos do projeto (ou nomes deles) importados em `fonte`, em qualquer nível."""
+    objetos = []
+    for no in ast.walk(ast.parse(textwrap.dedent(fonte))):
+        if isinstance(no, ast.Import):
+            pares = [(alias.name, None) for alias in no.names]
+        elif isinstance(no, ast.ImportFrom) and no.module and not no.level:
+            pares = [(no.module, alias.name) for alias in no.names]
+        else:
+            continue
+        for modulo, nome in pares:
+            if os.path.exists(os.path.join(PASTA_PROJETO, modulo.split(".")[0] + ".py")):
+                mod = importlib.import_module(modulo)
+                objetos.append(getattr(mod, nome, mod) if nome else mod)
+    return objetos
+
+
+def _nomes_usados(codigo) -> set:
+    """Nomes globais, atributos e strings constantes de um code object e dos aninhados (lambdas, comprehensions)."""
+    nomes = set(codigo.co_names)
+    for const in codigo.co_consts:
+        if inspect.iscode(const):
+            nomes |= _nomes_usados(const)
+        elif isinstance(const, str) and const.isidentifier():
+            # getattr(pipeline, "calcular_dias") chama o método pelo nome
+            nomes.add(const)
+    return nomes
+
+
+def fechamento_codigo(objetos) -> dict:
+    """
+    Textos (código-fonte ou repr) de `objetos` e de tudo o que eles usam no
+    projeto, por chave. Funções entram com as funções, classes, constantes e
+    módulos globais que referenciam (e os imports feitos dentro delas);
+    classes entram com os métodos cujos nomes aparecem em algum código
+    alcançado (o método chamado em `obj.metodo()` pode estar em outro módulo);
+    módulos importados inteiros entram com o código-fonte todo.
+    Bibliotecas fora da pasta do projeto ficam de fora.
+    """
+    textos = {}
+    nomes = set()
+    classes = []
+    pendentes = list(objetos)
+
+    def visitar(obj):
+        if inspect.ismodule(obj):
+            if not _do_projeto(obj) or ("modulo", obj.__name__) in textos:
+                return
+            fonte = _fonte(obj)
+            textos[("modulo", obj.__name__)] = fonte
+            pendentes.extend(_imports_do_projeto(fonte))
+        elif inspect.isclass(obj):
+            chave = ("classe", obj.__module__, obj.__qualname__)
+            if not _do_projeto(obj) or chave in textos:
+                return
+            atributos = {n: _valor_estavel(v) for n, v in vars(obj).items()
+                         if not callable(v) and not isinstance(v, (staticmethod, classmethod, property))}
+            textos[chave] = repr(([b.__qualname__ for b in obj.__bases__], sorted(atributos.items(), key=str)))
+            pendentes.extend(b for b in obj.__bases__ if _do_projeto(b))
+            classes.append(obj)
+        elif callable(obj):
+            funcao = inspect.unwrap(obj)
+            if not inspect.isfunction(funcao):
+                if _do_projeto(type(funcao)):
+                    pendentes.append(type(funcao))
+                return
+            chave = ("funcao", funcao.__module__, funcao.__qualname__, funcao.__code__.co_firstlineno)
+            if not _do_projeto(funcao) or chave in textos:
+                return
+            fonte = _fonte(funcao)
+            padroes = [_valor_estavel(v) for v in (funcao.__defaults__ or ())]
+            textos[chave] = fonte + repr(padroes)
+            pendentes.extend(v for v in (funcao.__defaults__ or ()) if callable(v) or inspect.ismodule(v))
+            usados = _nomes_usados(funcao.__code__)
+            nomes.update(usados)
+            for nome in sorted(usados):
+                if nome not in funcao.__globals__:
+                    continue
+                valor = funcao.__globals__[nome]
+                if inspect.ismodule(valor) or callable(valor):
+                    pendentes.append(valor)
+                elif _valor_estavel(valor) is not None:
+                    textos[("valor", funcao.__module__, nome)] = _valor_estavel(valor)
+                elif _do_projeto(type(valor)):
+                    pendentes.append(type(valor))
+            for celula in funcao.__closure__ or ():
+                pendentes.append(celula.cell_contents)
+            # Classe dona do método e imports feitos dentro da função
+            dona = funcao.__globals__.get(funcao.__qualname__.split(".")[0])
+            if "." in funcao.__qualname__ and inspect.isclass(dona):
+                pendentes.append(dona)
+            pendentes.extend(_imports_do_projeto(fonte))
+        else:
+            texto = _valor_estavel(obj)
+            textos[("constante", len(textos))] = texto if texto is not None else repr(obj)
+
+    while pendentes:
+        while pendentes:
+            visitar(pendentes.pop())
+        # Métodos das classes alcançadas cujo nome apareceu em algum código (até estabilizar)
+        for classe in classes:
+            for nome, membro in vars(classe).items():
+                if nome in nomes or (nome.startswith("__") and nome.endswith("__")):
+                    if isinstance(membro, (staticmethod, classmethod)):
+                        membro = membro.__func__
+                    elif isinstance(membro, property):
+                        membro = membro.fget
+                    if inspect.isfunction(membro):
+                        chave = ("funcao", membro.__module__, membro.__qualname__, membro.__code__.co_firstlineno)
+                        if chave not in textos:
+                            pendentes.append(membro)
+    return textos
+
+
+def impressao_codigo(objetos) -> str:
+    """Hash do fechamento de `objetos` (ver fechamento_codigo)."""
+    h = hashlib.sha256()
+    for chave, texto in sorted(fechamento_codigo(objetos).items(), key=lambda par: repr(par[0])):
+        h.update(repr(chave).encode())
+        h.update(texto.encode())
+    return h.hexdigest()
+
+
+def hashes_zip(caminho_zip) -> dict:
+    """Hash do conteúdo de cada planilha do ZIP (a mesma chave do cache de planilhas)."""
+    with zipfile.ZipFile(caminho_zip, "r") as zip_ref:
+        return {chave: hash_conteudo(zip_ref.read(arquivo)) for chave, arquivo in ARQUIVOS_BASES.items()}
+
+
+def _carregar_bases(caminho_zip, hashes: dict):
+    # `hashes` só entra na chave do checkpoint; a leitura usa o ZIP
+    return carregar_bases_paralelo(caminho_zip)
+
+
+def etapas_vr(caminho_zip, caminho_saida: str = "dados/VR MENSAL 05.2025.xlsx", formatos_extras=(),
+              fatiar: str = None, periodo=None) -> list:
+    """
+    O fluxo de main.py como DAG: bases → consolidada → filtrada → dias → valores → reparada → final.
+    Com `fatiar` ("sindicato" ou "matricula"), dias e valores rodam por fatias
+    num pool de processos (execucao_fatiada.py); o resultado é o mesmo.
+    `periodo` (início, fim) é o período da competência (ver calcular_dias_uteis).
+    """
+    # A configuração dos sindicatos (dados/config/sindicatos.json) é dado, não código: entra explícita
+    config_sindicatos = carregar_configuracao()
+    periodo = tuple(periodo) if periodo else None
+    if fatiar:
+        dias = Etapa("dias", calcular_dias_uteis_fatiado, ["filtrada", "bases"],
+                     codigo=(calcular_dias_uteis_fatiado, config_sindicatos),
+                     config={"chave": fatiar, "periodo": periodo})
+        valores = Etapa("valores", calcular_valores_vr_fatiado, ["dias", "bases"],
+                        codigo=(calcular_valores_vr_fatiado, config_sindicatos), config={"chave": fatiar})
+    else:
+        dias = Etapa("dias", calcular_dias_uteis, ["filtrada", "bases"], codigo=(calcular_dias_uteis, config_sindicatos),
+                     config={"periodo": periodo})
+        valores = Etapa("valores", calcular_valores_vr, ["dias", "bases"],
+                        codigo=(calcular_valores_vr, config_sindicatos))
+    base_saida = os.path.splitext(caminho_saida)[0]
+    return [
+        Etapa("bases", _carregar_bases,
+              config={"caminho_zip": caminho_zip, "hashes": hashes_zip(caminho_zip)}),
+        Etapa("consolidada", consolidar_bases, ["bases"]),
+        Etapa("filtrada", aplicar_regras_exclusao, ["bases", "consolidada"]),
+        dias,
+        valores,
+        Etapa("reparada", reparar_valores_vr, ["valores"]),
+        Etapa("final", exportar_planilha_final, ["reparada"],
+              config={"caminho_saida": caminho_saida, "formatos_extras": tuple(formatos_extras)},
+              arquivos=[caminho_saida] + [f"{base_saida}.{formato}" for formato in formatos_extras]),
+    ]
+
+
+# ========================
+# Execução com checkpoints
+# ========================
+class PipelineDAG:
+    """
+    Executa um DAG de etapas reaproveitando checkpoints:
+
+        PipelineDAG(etapas_vr("dados/Desafio 4 - Dados.zip")).executar("final")
+
+    `refazer` força a execução das etapas indicadas e das que dependem delas. Sem `usar_checkpoints`, tudo é recalculado e nada é gravado.
+    """
+
+    def __init__(self, etapas: list, pasta: str = PASTA_CHECKPOINTS, usar_checkpoints: bool = True,
+                 refazer=()):
+        self.etapas = {}
+        for etapa in etapas:
+            faltando = [e for e in etapa.entradas if e not in self.etapas]
+            if faltando:
+                raise ValueError(f"Etapa '{etapa.nome}' depende de etapas não declaradas antes: {faltando}")
+            self.etapas[etapa.nome] = etapa
+        self.pasta = pasta
+        self.usar_checkpoints = usar_checkpoints
+        # Refazer uma etapa refaz também tudo o que depende dela
+        self.refazer = set(refazer)
+        for nome, etapa in self.etapas.items():
+            if self.refazer.intersection(etapa.entradas):
+                self.refazer.add(nome)
+        # Em ordem de declaração: a chave de cada etapa usa as chaves das entradas
+        self.chaves = {}
+        for nome, etapa in self.etapas.items():
+            self.chaves[nome] = self._chave(etapa)
+        self.origem = {}  # etapa → "checkpoint" ou "executada"
+        self._saidas = {}
+
+    def _chave(self, etapa: Etapa) -> str:
+        h = hashlib.sha256()
+        h.update(VERSAO_CHECKPOINT.encode())
+        h.update(etapa.nome.encode())
+        h.update(impressao_codigo(etapa.codigo).encode())
+        h.update(json.dumps(etapa.config, sort_keys=True, default=str).encode())
+        for entrada in etapa.entradas:
+            h.update(self.chaves[entrada].encode())
+        return h.hexdigest()
+
+    # --- Checkpoints ---
+    def _nome_checkpoint(self, nome: str) -> str:
+        return f"{nome}_{self.chaves[nome][:32]}"
+
+    def _ler_checkpoint(self, nome: str):
+        etapa = self.etapas[nome]
+        if not self.usar_checkpoints or nome in self.refazer:
+            return None
+        base = self._nome_checkpoint(nome)
+        if etapa.arquivos:
+            # Arquivo ausente, alterado ou gravado por uma execução com outra chave: refaz
+            hashes = self._hashes_arquivos(etapa)
+            if hashes is None or hashes != self._ler_json(base + ".arquivos.json"):
+                return None
+        partes = self._ler_json(base + ".json")
+        if partes is not None:
+            # Saída em dict: uma entrada por parte; se alguma foi removida pelo limite de tamanho, refaz
+            saida = {parte: ler_do_cache(f"{base}__{i}", self.pasta) for i, parte in enumerate(partes)}
+            if any(df is None for df in saida.values()):
+                return None
+            return saida
+        return ler_do_cache(base, self.pasta)
+
+    @staticmethod
+    def _hashes_arquivos(etapa: Etapa) -> dict:
+        hashes = {}
+        for caminho in etapa.arquivos:
+            if not os.path.exists(caminho):
+                return None
+            with open(caminho, "rb") as f:
+                hashes[caminho] = hash_conteudo(f.read())
+        return hashes
+
+    def _ler_json(self, nome_arquivo: str):
+        caminho = os.path.join(self.pasta, nome_arquivo)
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _gravar_checkpoint(self, nome: str, saida):
+        if not self.usar_checkpoints:
+            return
+        base = self._nome_checkpoint(nome)
+        etapa = self.etapas[nome]
+        if etapa.arquivos:
+            os.makedirs(self.pasta, exist_ok=True)
+            with open(os.path.join(self.pasta, base + ".arquivos.json"), "w", encoding="utf-8") as f:
+                json.dump(self._hashes_arquivos(etapa), f, ensure_ascii=False)
+        if isinstance(saida, dict):
+            for i, df in enumerate(saida.values()):
+                gravar_no_cache(f"{base}__{i}", df, self.pasta, TAMANHO_MAXIMO_CHECKPOINTS)
+            with open(os.path.join(self.pasta, base + ".json"), "w", encoding="utf-8") as f:
+                json.dump(list(saida), f, ensure_ascii=False)
+        else:
+            gravar_no_cache(base, saida, self.pasta, TAMANHO_MAXIMO_CHECKPOINTS)
+
+    # --- Execução ---
+    def obter(self, nome: str):
+        """Saída da etapa `nome`: da memória, do checkpoint ou executando (e as entradas que faltarem)."""
+        if nome in self._saidas:
+            return self._saidas[nome]
+        etapa = self.etapas[nome]
+        saida = self._ler_checkpoint(nome)
+        if saida is not None:
+            self.origem[nome] = "checkpoint"
+            print(f"\n[DEBUG] Etapa '{nome}': checkpoint {self.chaves[nome][:12]} reaproveitado")
+        else:
+            entradas = [self.obter(e) for e in etapa.entradas]
+            print(f"\n[DEBUG] Etapa '{nome}': executando (chave {self.chaves[nome][:12]})")
+            saida = etapa.executar(*entradas)
+            self._gravar_checkpoint(nome, saida)
+            self.origem[nome] = "executada"
+        self._saidas[nome] = saida
+        return saida
+
+    def executar(self, alvo: str = None):
+        """Executa até `alvo` (padrão: a última etapa declarada) e devolve a saída dele."""
+        alvo = alvo or list(self.etapas)[-1]
+        saida = self.obter(alvo)
+        print("\n[DEBUG] Etapas:", ", ".join(f"{n}={o}" for n, o in self.origem.items()))
+        return saida
+
@@ -0,0 +1,109 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from normalizacao import sem_acento
+
+# ========================
+# UFs e configuração
+# ========================
+UFS = {
+    "AC": "Acre", "AL": "Alagoas", "AP": "Amapá", "AM": "Amazonas", "BA": "Bahia",
+    "CE": "Ceará", "DF": "Distrito Federal", "ES": "Espírito Santo", "GO": "Goiás",
+    "MA": "Maranhão", "MT": "Mato Grosso", "MS": "Mato Grosso do Sul", "MG": "Minas Gerais",
+    "PA": "Pará", "PB": "Paraíba", "PR": "Paraná", "PE": "Pernambuco", "PI": "Piauí",
+    "RJ": "Rio de Janeiro", "RN": "Rio Grande do Norte", "RS": "Rio Grande do Sul",
+    "RO": "Rondônia", "RR": "Roraima", "SC": "Santa Catarina", "SP": "São Paulo",
+    "SE": "Sergipe", "TO": "Tocantins",
+}
+
+# Opcional. Exemplo:
+# {"termos": {"CURITIBA": "PR"},
+#  "sindicatos": {"SITEPD PR - SIND DOS TRAB ...": {"UF": "PR", "VR_VALOR": 35.0, "DIAS_UTEIS": 22}}}
+# "termos" são trechos do nome que indicam a UF; "sindicatos" fixa UF/valor/dias de um sindicato.
+CAMINHO_CONFIG = "dados/config/sindicatos.json"
+
+_SIGLA = re.compile(r"\b(" + "|".join(UFS) + r")\b")
+
+
+# Nomes por extenso, dos mais longos para os mais curtos ("MATO GROSSO DO SUL" antes de "MATO GROSSO").
+# "Pará" fica de fora: "PARA" é preposição e aparece em nomes de sindicato.
+_NOMES = sorted(
+    ((re.compile(r"\b" + sem_acento(nome).upper() + r"\b"), uf) for uf, nome in UFS.items() if uf != "PA"),
+    key=lambda par: -len(par[0].pattern),
+)
+
+
+def carregar_configuracao(caminho: str = CAMINHO_CONFIG) -> dict:
+    if not caminho or not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def uf_do_nome(nome, config: dict = None):
+    """
+    UF de um nome de sindicato (ou de estado), na ordem: UF fixada na
+    configuração, primeira sigla de UF no nome (ex.: 'SINDPD SP - ...'),
+    termos da configuração e nome do estado por extenso. None se nenhuma bater.
+    """
+    if not isinstance(nome, str):
+        return None
+    config = config or {}
+    fixo = config.get("sindicatos", {}).get(nome, {}).get("UF")
+    if fixo:
+        return fixo
+    sigla = _SIGLA.search(nome.strip())
+    if sigla:
+        return sigla.group(1)
+    texto = sem_acento(nome).upper()
+    for termo, uf in config.get("termos", {}).items():
+        if sem_acento(termo).upper() in texto:
+            return uf
+    return next((uf for padrao, uf in _NOMES if padrao.search(texto)), None)
+
+
+def resolver_uf(sindicatos: pd.Series, config: dict = None) -> pd.Series:
+    """UF de cada linha, resolvida uma vez por sindicato distinto e espalhada pelos códigos."""
+    codigos, unicos = pd.factorize(sindicatos.astype(object))
+    ufs = np.array([uf_do_nome(nome, config) for nome in unicos] + [np.nan], dtype=object)
+    # Código -1 (nulo) aponta para o NaN do fim
+    return pd.Series(ufs[codigos], index=sindicatos.index)
+
+
+# ========================
+# Tabela de dimensão
+# ========================
+def montar_dimensao(nomes, valores: pd.Series, dias: pd.Series, config: dict = None) -> pd.DataFrame:
+    """
+    Uma linha por sindicato em `nomes`, com UF, ESTADO, VR_VALOR e DIAS_UTEIS.
+    `valores` é o VR diário indexado pelo estado (nome ou sigla), `dias` os
+    dias úteis indexados pelo nome do sindicato. Valores fixados em
+    config["sindicatos"] têm prioridade.
+    """
+    config = config if config is not None else carregar_configuracao()
+    nomes = pd.Index(pd.unique(pd.Series(list(nomes), dtype=object).dropna()))
+
+    valores_uf = pd.Series(valores.to_numpy(), index=[uf_do_nome(e, config) for e in valores.index])
+    valores_uf = valores_uf[valores_uf.index.notna() & ~valores_uf.index.duplicated()]
+    dias = dias[~dias.index.duplicated()]
+
+    ufs = [uf_do_nome(n, config) for n in nomes]
+    dim = pd.DataFrame({
+        "UF": ufs,
+        "ESTADO": [UFS.get(uf) for uf in ufs],
+        "VR_VALOR": valores_uf.reindex(ufs).to_numpy(dtype=float),
+        "DIAS_UTEIS": pd.to_numeric(dias.reindex(nomes), errors="coerce").to_numpy(dtype=float),
+    }, index=nomes)
+    dim["UF"] = dim["UF"].where(dim["UF"].notna(), np.nan)
+    dim["ESTADO"] = dim["ESTADO"].where(dim["ESTADO"].notna(), np.nan)
+
+    for nome, fixo in config.get("sindicatos", {}).items():
+        if nome in dim.index:
+            for col in ("VR_VALOR", "DIAS_UTEIS"):
+                if col in fixo:
+                    dim.loc[nome, col] = float(fixo[col])
+    return dim
@@ -0,0 +1,79 @@
+import pandas as pd
+
+
+# ========================
+# Esquema de tipos das bases
+# ========================
+# MATRICULA (qualquer coluna com "MATRIC") vira inteiro; textos muito
+# repetidos viram categoria; colunas de data viram datetime64.
+COLUNAS_CATEGORICAS = ["Sindicato", "TITULO DO CARGO", "Cargo", "STATUS", "UF", "DESC. SITUACAO"]
+MARCADORES_DATA = ["DATA", "ADMISS", "DEMISS"]
+
+
+def _eh_coluna_data(col: str) -> bool:
+    return any(m in col.upper() for m in MARCADORES_DATA)
+
+
+def _para_inteiro(serie: pd.Series) -> pd.Series:
+    """Converte para int64 (Int64 se houver nulos); mantém a coluna se houver valores não inteiros."""
+    if pd.api.types.is_integer_dtype(serie):
+        return serie
+    num = pd.to_numeric(serie, errors="coerce")
+    if (num.isna() & serie.notna()).any() or (num.dropna() % 1 != 0).any():
+        return serie
+    return num.astype("Int64" if num.isna().any() else "int64")
+
+
+def aplicar_esquema(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica o esquema às colunas presentes em `df` (altera e retorna o próprio df)."""
+    for col in df.columns:
+        if not isinstance(col, str):
+            continue
+        if "MATRIC" in col.upper():
+            df[col] = _para_inteiro(df[col])
+        elif col in COLUNAS_CATEGORICAS:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+        elif _eh_coluna_data(col) and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            convertida = pd.to_datetime(df[col], errors="coerce")
+            # Só converte se nenhum valor preenchido for perdido
+            if not (convertida.isna() & df[col].notna()).any():
+                df[col] = convertida
+    return df
+
+
+def aplicar_esquema_bases(bases: dict) -> dict:
+    for chave, df in bases.items():
+        if isinstance(df, pd.DataFrame):
+            bases[chave] = aplicar_esquema(df)
+    return bases
+
+
+# ========================
+# Relatório de memória
+# ========================
+def memoria_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def comparar_memoria(df: pd.DataFrame) -> dict:
+    """
+    Compara o footprint de `df` com o esquema aplicado e sem ele
+    (todas as colunas de texto/categoria como object, MATRICULA como str,
+    que é como o fluxo tratava os dados antes).
+    """
+    sem_esquema = df.copy()
+    for col in sem_esquema.columns:
+        if isinstance(sem_esquema[col].dtype, pd.CategoricalDtype):
+            sem_esquema[col] = sem_esquema[col].astype(object)
+        elif isinstance(col, str) and "MATRIC" in col.upper():
+            sem_esquema[col] = sem_esquema[col].astype(str)
+    com_esquema = aplicar_esquema(df.copy())
+    antes = memoria_mb(sem_esquema)
+    depois = memoria_mb(com_esquema)
+    return {
+        "linhas": len(df),
+        "mb_sem_esquema": round(float(antes), 2),
+        "mb_com_esquema": round(float(depois), 2),
+        "reducao_pct": round(float(100 * (1 - depois / antes)), 1) if antes else 0.0,
+    }
@@ -0,0 +1,201 @@
+"""
+Execução fatiada de calcular_dias_uteis / calcular_valores_vr.
+
+Cada linha depende só dela mesma e das tabelas de referência (férias,
+desligados, dias úteis e valores do sindicato), então a base filtrada pode
+ser dividida por Sindicato (ou por MATRICULA) e calculada num pool de
+processos. A base vai uma única vez para a memória compartilhada em formato
+Arrow IPC: cada worker lê dali só as posições da sua fatia, sem cópia, e
+devolve o resultado também como buffer Arrow. Só as bases de referência
+(BASES_WORKER) são enviadas, uma vez por worker (inicializador do pool,
+como em lote.py); ATIVOS, ADMITIDOS e as bases de exclusão ficam de fora.
+O resultado volta na ordem original das linhas, idêntico ao sequencial.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from esquema import aplicar_esquema
+from instrumentacao import instrumentar
+from processamento import PipelineVR, calcular_dias_uteis, calcular_valores_vr
+
+try:
+    import pyarrow as pa
+    ARROW_DISPONIVEL = True
+except ImportError:
+    ARROW_DISPONIVEL = False
+
+# Abaixo disso o custo de subir o pool supera o ganho
+MINIMO_LINHAS = 200_000
+CHAVES_FATIA = ("sindicato", "matricula")
+
+# Bases lidas por PipelineVR.calcular_dias / calcular_valores
+BASES_WORKER = ("ferias", "desligados", "afastamentos", "dias_uteis", "sindicato_valores")
+
+# Preenchido em cada worker pelo inicializador do pool
+_WORKER = {}
+
+
+# ========================
+# Arrow IPC
+# ========================
+def _escrever_ipc(tabela, saida):
+    with pa.ipc.new_stream(saida, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+
+
+def _para_ipc(df: pd.DataFrame) -> bytes:
+    saida = pa.BufferOutputStream()
+    _escrever_ipc(pa.Table.from_pandas(df, preserve_index=False), saida)
+    return saida.getvalue()
+
+
+def _de_ipc(buffer) -> pa.Table:
+    return pa.ipc.open_stream(buffer).read_all()
+
+
+# ========================
+# Worker
+# ========================
+def _inicializar_worker(nome_memoria: str, tamanho: int, bases: dict, calendario, periodo):
+    # Os workers herdam o resource_tracker do processo principal, que é quem remove o segmento
+    shm = shared_memory.SharedMemory(name=nome_memoria)
+    _WORKER.update(
+        memoria=shm,  # mantém o segmento aberto enquanto a tabela aponta para ele
+        tabela=_de_ipc(pa.py_buffer(shm.buf)[:tamanho]),
+        bases=bases,
+        calendario=calendario,
+        periodo=periodo,
+    )
+
+
+def _calcular_fatia(indice: int, posicoes: np.ndarray, etapas: tuple):
+    fatia = _WORKER["tabela"].take(pa.array(posicoes)).to_pandas()
+    pipeline = PipelineVR(_WORKER["bases"], _WORKER["calendario"], df=fatia, periodo=_WORKER["periodo"])
+    for etapa in etapas:
+        getattr(pipeline, etapa)()
+    resultado = pipeline.resultado()
+    try:
+        return indice, _para_ipc(resultado)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Colunas de tipos mistos não viram Arrow; a fatia volta por pickle
+        return indice, resultado
+
+
+def bases_worker(bases: dict) -> dict:
+    """Só as bases de referência que as etapas fatiadas usam (as que vão para cada worker)."""
+    return {chave: bases[chave] for chave in BASES_WORKER if chave in bases}
+
+
+# ========================
+# Fatias
+# ========================
+def dividir_fatias(df: pd.DataFrame, chave: str = "sindicato", quantidade: int = None) -> list:
+    """
+    Posições de cada fatia, em ordem crescente dentro da fatia.
+    - "sindicato": uma fatia por sindicato (pelos códigos da categoria; nulos numa fatia própria);
+    - "matricula": `quantidade` fatias por MATRICULA módulo `quantidade` (mais equilibradas).
+    """
+    if chave == "sindicato":
+        codigos = pd.Categorical(df["Sindicato"]).codes
+    elif chave == "matricula":
+        quantidade = quantidade or os.cpu_count() or 1
+        codigos = pd.to_numeric(df["MATRICULA"], errors="coerce").fillna(0).to_numpy().astype(np.int64) % quantidade
+    else:
+        raise ValueError(f"Chave de fatia inválida: {chave} (use {', '.join(CHAVES_FATIA)})")
+    ordem = np.argsort(codigos, kind="stable")
+    _, inicios = np.unique(codigos[ordem], return_index=True)
+    return [f for f in np.split(ordem, inicios[1:]) if len(f)]
+
+
+def executar_fatiado(df: pd.DataFrame, bases: dict, etapas=("calcular_dias",), calendario=None,
+                     chave: str = "sindicato", max_workers: int = None,
+                     minimo_linhas: int = MINIMO_LINHAS, periodo=None) -> pd.DataFrame:
+    """
+    Aplica os métodos `etapas` de PipelineVR a cada fatia de `df` num pool
+    de processos e junta as fatias na ordem original das linhas. Bases
+    pequenas, ou sem pyarrow, seguem pelo caminho sequencial.
+    """
+    fatias = dividir_fatias(df, chave, max_workers)
+    if not ARROW_DISPONIVEL or len(df) < minimo_linhas or len(fatias) < 2:
+        pipeline = PipelineVR(bases, calendario, df=df.copy(), periodo=periodo)
+        for etapa in etapas:
+            getattr(pipeline, etapa)()
+        return pipeline.resultado()
+
+    # Mede o stream primeiro e grava direto no segmento compartilhado (sem cópia intermediária)
+    tabela = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    medidor = pa.MockOutputStream()
+    _escrever_ipc(tabela, medidor)
+    tamanho = medidor.size()
+    shm = shared_memory.SharedMemory(create=True, size=tamanho)
+    try:
+        _escrever_ipc(tabela, pa.FixedSizeBufferWriter(pa.py_buffer(shm.buf)))
+        del tabela
+        max_workers = max_workers or min(len(fatias), os.cpu_count() or 1)
+        # Maiores primeiro: o sindicato mais populoso não fica por último no pool
+        ordem_envio = sorted(range(len(fatias)), key=lambda i: -len(fatias[i]))
+        partes = [None] * len(fatias)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_inicializar_worker,
+                                 initargs=(shm.name, tamanho, bases_worker(bases), calendario, periodo)) as pool:
+            futuros = [pool.submit(_calcular_fatia, i, fatias[i], tuple(etapas)) for i in ordem_envio]
+            for futuro in futuros:
+                i, resultado = futuro.result()
+                partes[i] = resultado if isinstance(resultado, pd.DataFrame) else _de_ipc(resultado).to_pandas()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # Junção determinística: fatias na ordem dos códigos e depois as linhas de volta à posição original
+    df_vr = pd.concat(partes, ignore_index=True)
+    posicoes = np.concatenate(fatias)
+    df_vr = df_vr.iloc[np.argsort(posicoes, kind="stable")].reset_index(drop=True)
+    # Colunas categóricas da entrada voltam às categorias originais; as criadas em
+    # cada fatia (ex.: UF) têm categorias diferentes e são recriadas sobre a base inteira
+    for col in df_vr.columns:
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df_vr[col] = df_vr[col].astype(df[col].dtype)
+        elif isinstance(df_vr[col].dtype, pd.CategoricalDtype):
+            df_vr[col] = df_vr[col].astype(object)
+    aplicar_esquema(df_vr)
+    print(f"\n[DEBUG] {len(fatias)} fatias ({chave}) calculadas em {max_workers} processos")
+    return df_vr
+
+
+@instrumentar
+def calcular_dias_uteis_fatiado(df_base: pd.DataFrame, bases: dict, calendario=None, chave: str = "sindicato",
+                                max_workers: int = None, periodo=None) -> pd.DataFrame:
+    """calcular_dias_uteis por fatias num pool de processos (mesmo resultado)."""
+    return executar_fatiado(df_base, bases, ("calcular_dias",), calendario, chave, max_workers, periodo=periodo)
+
+
+@instrumentar
+def calcular_valores_vr_fatiado(df_base: pd.DataFrame, bases: dict, chave: str = "sindicato",
+                                max_workers: int = None) -> pd.DataFrame:
+    """calcular_valores_vr por fatias num pool de processos (mesmo resultado)."""
+    return executar_fatiado(df_base, bases, ("calcular_valores",), None, chave, max_workers)
+
+
+def comparar_com_sequencial(df_filtrada: pd.DataFrame, bases: dict, chave: str = "sindicato",
+                            max_workers: int = None) -> dict:
+    """Tempos sequencial × fatiado de dias + valores e se os resultados são idênticos."""
+    inicio = time.perf_counter()
+    sequencial = calcular_valores_vr(calcular_dias_uteis(df_filtrada, bases), bases)
+    tempo_seq = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    fatiado = executar_fatiado(df_filtrada, bases, ("calcular_dias", "calcular_valores"), None, chave,
+                               max_workers, minimo_linhas=0)
+    tempo_fat = time.perf_counter() - inicio
+
+    try:
+        pd.testing.assert_frame_equal(sequencial, fatiado)
+        iguais = True
+    except AssertionError:
+        iguais = False
+    return {"linhas": len(df_filtrada), "sequencial_s": round(tempo_seq, 3), "fatiado_s": round(tempo_fat, 3),
+            "iguais": iguais}
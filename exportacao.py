@@ -0,0 +1,97 @@
+import os
+
+import pandas as pd
+
+try:
+    import xlsxwriter
+    XLSXWRITER_DISPONIVEL = True
+except ImportError:
+    XLSXWRITER_DISPONIVEL = False
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+# Linhas convertidas para objetos Python por vez (limita a memória da escrita)
+TAMANHO_LOTE = 50_000
+
+FORMATO_DATA = "yyyy-mm-dd hh:mm:ss"
+
+
+# ========================
+# Escrita xlsx em streaming
+# ========================
+def _linhas(df: pd.DataFrame, tamanho_lote: int):
+    """Gera as linhas de `df` como tuplas de valores Python (NaN/NaT → None), lote a lote."""
+    for inicio in range(0, len(df), tamanho_lote):
+        lote = df.iloc[inicio:inicio + tamanho_lote]
+        colunas = []
+        for col in lote.columns:
+            serie = lote[col]
+            valores = serie.to_numpy(dtype=object)
+            valores[pd.isna(serie).to_numpy()] = None
+            colunas.append(valores)
+        yield from zip(*colunas)
+
+
+def _escrever_xlsxwriter(df: pd.DataFrame, caminho: str, nome_aba: str, tamanho_lote: int):
+    wb = xlsxwriter.Workbook(caminho, {"constant_memory": True, "default_date_format": FORMATO_DATA})
+    ws = wb.add_worksheet(nome_aba)
+    ws.write_row(0, 0, [str(c) for c in df.columns], wb.add_format({"bold": True}))
+    for i, linha in enumerate(_linhas(df, tamanho_lote), start=1):
+        ws.write_row(i, 0, linha)
+    wb.close()
+
+
+def _escrever_openpyxl(df: pd.DataFrame, caminho: str, nome_aba: str, tamanho_lote: int):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(nome_aba)
+    negrito = Font(bold=True)
+    cabecalho = []
+    for c in df.columns:
+        cell = WriteOnlyCell(ws, value=str(c))
+        cell.font = negrito
+        cabecalho.append(cell)
+    ws.append(cabecalho)
+    for linha in _linhas(df, tamanho_lote):
+        ws.append(linha)
+    wb.save(caminho)
+
+
+def escrever_xlsx(df: pd.DataFrame, caminho: str, nome_aba: str = "Sheet1",
+                  tamanho_lote: int = TAMANHO_LOTE):
+    """
+    Grava `df` (sem índice) num xlsx linha a linha, sem montar o workbook
+    inteiro em memória: xlsxwriter em modo constant_memory quando instalado,
+    senão openpyxl em modo write-only.
+    """
+    if XLSXWRITER_DISPONIVEL:
+        _escrever_xlsxwriter(df, caminho, nome_aba, tamanho_lote)
+    else:
+        _escrever_openpyxl(df, caminho, nome_aba, tamanho_lote)
+
+
+# ========================
+# Exportação com formatos extras
+# ========================
+def exportar(df: pd.DataFrame, caminho_xlsx: str, formatos_extras=()) -> list:
+    """
+    Grava o xlsx e, opcionalmente, irmãos em "parquet" e/ou "csv" com o
+    mesmo nome-base (ex.: 'VR MENSAL 05.2025.parquet'), para quem consome
+    os dados sem precisar ler Excel. Retorna os caminhos gravados.
+    """
+    escrever_xlsx(df, caminho_xlsx)
+    caminhos = [caminho_xlsx]
+
+    base = os.path.splitext(caminho_xlsx)[0]
+    for formato in formatos_extras:
+        if formato == "parquet":
+            caminho = base + ".parquet"
+            df.to_parquet(caminho, index=False)
+        elif formato == "csv":
+            caminho = base + ".csv"
+            df.to_csv(caminho, index=False, encoding="utf-8-sig")
+        else:
+            raise ValueError(f"Formato de exportação desconhecido: {formato}")
+        caminhos.append(caminho)
+    return caminhos
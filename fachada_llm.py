@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MODELO_PADRAO = "gemini-1.5-flash"
+
+
+# ========================
+# LLM sob demanda
+# ========================
+class LLMPreguicoso:
+    """
+    Fachada do Gemini: langchain_google_genai só é importado, e o
+    ChatGoogleGenerativeAI só é criado, na primeira chamada de invoke()
+    (ou no acesso a .modelo). Sem GOOGLE_API_KEY, `disponivel` é False e
+    quem usa o LLM pode seguir sem ele.
+    """
+
+    def __init__(self, modelo: str = MODELO_PADRAO, temperatura: float = 0, chave: str = None):
+        self.nome_modelo = modelo
+        self.temperatura = temperatura
+        self.chave = chave if chave is not None else os.getenv("GOOGLE_API_KEY")
+        self._modelo = None
+
+    @property
+    def disponivel(self) -> bool:
+        return bool(self.chave)
+
+    @property
+    def modelo(self):
+        if self._modelo is None:
+            if not self.disponivel:
+                raise ValueError("❌ GOOGLE_API_KEY não encontrada no .env")
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            self._modelo = ChatGoogleGenerativeAI(
+                model=self.nome_modelo,
+                temperature=self.temperatura,
+                google_api_key=self.chave,
+            )
+        return self._modelo
+
+    @property
+    def carregado(self) -> bool:
+        return self._modelo is not None
+
+    def invoke(self, prompt):
+        return self.modelo.invoke(prompt)
+
+
+# ========================
+# Tempo de inicialização
+# ========================
+def medir_importacao(modulo: str, repeticoes: int = 3) -> float:
+    """Melhor tempo (s) de `import modulo` num interpretador novo; None se o import falhar."""
+    codigo = (
+        "import time; t = time.perf_counter(); "
+        f"import {modulo}; print(time.perf_counter() - t)"
+    )
+    tempos = []
+    for _ in range(repeticoes):
+        proc = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+        if proc.returncode != 0:
+            return None
+        tempos.append(float(proc.stdout.strip().splitlines()[-1]))
+    return min(tempos)
+
+
+def relatorio_inicializacao(modulos=("agente_validacao", "agente", "langchain_google_genai")) -> dict:
+    """
+    Tempo de import dos scripts e, para comparação, do langchain_google_genai
+    (o custo que eles pagavam no import antes da fachada).
+    """
+    return {modulo: medir_importacao(modulo) for modulo in modulos}
+
+
+if __name__ == "__main__":
+    for modulo, segundos in relatorio_inicializacao().items():
+        texto = f"{segundos:.3f} s" if segundos is not None else "falhou (não instalado?)"
+        print(f"import {modulo:<24} {texto}")
@@ -0,0 +1,117 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from normalizacao import sem_acento
+
+
+# ========================
+# Índices da planilha final
+# ========================
+class IndicePlanilha:
+    """
+    Índices montados uma vez na carga da planilha, usados pelas ferramentas
+    do agente no lugar de filtros gerados pelo LLM:
+    - MATRICULA → posições (dicionário/hash, consulta O(1));
+    - SINDICATO → faixa contígua de posições (códigos da categoria
+      ordenados, como um índice CSR);
+    - ordem decrescente de VR TOTAL pré-calculada (top-N é um fatiamento).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.reset_index(drop=True)
+        n = len(self.df)
+
+        matriculas = pd.to_numeric(self.df["MATRICULA"], errors="coerce")
+        self._por_matricula = {
+            int(m): pos for m, pos in pd.Series(np.arange(n)).groupby(matriculas.to_numpy()).indices.items()
+        }
+
+        sindicatos = pd.Categorical(self.df["SINDICATO"].astype(object))
+        codigos = sindicatos.codes
+        self._ordem_sindicato = np.argsort(codigos, kind="stable")
+        # Início/fim de cada categoria em _ordem_sindicato (nulos, código -1, ficam antes de 0)
+        self._limites = np.searchsorted(codigos[self._ordem_sindicato], np.arange(len(sindicatos.categories) + 1))
+        self._categorias = list(sindicatos.categories)
+        self._categorias_busca = [sem_acento(c) for c in self._categorias]
+
+        vr = pd.to_numeric(self.df["VR TOTAL"], errors="coerce").to_numpy(dtype="float64")
+        # Decrescente, estável, com NaN no fim
+        self._ordem_vr = np.argsort(np.where(np.isnan(vr), np.inf, -vr), kind="stable")
+
+    def _registros(self, posicoes) -> list:
+        linhas = self.df.iloc[np.asarray(posicoes)]
+        return json.loads(linhas.to_json(orient="records", force_ascii=False))
+
+    # --- Ferramentas (as docstrings são a descrição vista pelo LLM) ---
+    def buscar_matricula(self, matricula: int) -> str:
+        """Dados completos de um colaborador pela MATRICULA (dias úteis, valor unitário, VR total, 80%/20%)."""
+        try:
+            posicoes = self._por_matricula.get(int(float(matricula)))
+        except (TypeError, ValueError):
+            posicoes = None
+        if posicoes is None:
+            return json.dumps({"erro": f"MATRICULA {matricula} não encontrada"}, ensure_ascii=False)
+        return json.dumps(self._registros(posicoes), ensure_ascii=False)
+
+    def posicoes_sindicato(self, sindicato: str):
+        """Posições das linhas do sindicato (nome completo, sigla ou trecho) e o nome encontrado."""
+        if sindicato in self._categorias:
+            candidatos = [self._categorias.index(sindicato)]
+        else:
+            busca = sem_acento(sindicato).strip()
+            candidatos = [i for i, c in enumerate(self._categorias_busca) if busca and busca in c]
+        if len(candidatos) != 1:
+            return None, [self._categorias[i] for i in candidatos]
+        k = candidatos[0]
+        return self._ordem_sindicato[self._limites[k]:self._limites[k + 1]], self._categorias[k]
+
+    def listar_sindicato(self, sindicato: str, limite: int = 50) -> str:
+        """Colaboradores de um SINDICATO (nome completo ou sigla, ex.: 'SINDPD SP'), até `limite` linhas."""
+        posicoes, nome = self.posicoes_sindicato(sindicato)
+        if posicoes is None:
+            opcoes = nome or self._categorias
+            return json.dumps({"erro": f"Sindicato '{sindicato}' ambíguo ou não encontrado", "opcoes": opcoes},
+                              ensure_ascii=False)
+        return json.dumps({
+            "sindicato": nome,
+            "colaboradores": int(len(posicoes)),
+            "linhas": self._registros(posicoes[:int(limite)]),
+        }, ensure_ascii=False)
+
+    def top_vr(self, n: int = 10) -> str:
+        """Os `n` colaboradores com maior VR TOTAL, em ordem decrescente."""
+        return json.dumps(self._registros(self._ordem_vr[:int(n)]), ensure_ascii=False)
+
+
+def resumo_agregados(cubo: dict, dimensao: str = "SINDICATO") -> str:
+    """Soma/contagem/média das colunas de VR por SINDICATO ou UF (ou TOTAL), a partir do cubo."""
+    dimensao = dimensao.upper()
+    if dimensao not in cubo:
+        return json.dumps({"erro": f"Dimensão '{dimensao}' indisponível", "opcoes": list(cubo)}, ensure_ascii=False)
+    tabela = cubo[dimensao]
+    if isinstance(tabela, pd.Series):
+        return json.dumps({f"{m} ({a})": v for (m, a), v in tabela.items()}, ensure_ascii=False)
+    tabela = tabela.copy()
+    tabela.columns = [f"{m} ({a})" for m, a in tabela.columns]
+    return tabela.to_json(orient="index", force_ascii=False)
+
+
+# ========================
+# Ferramentas LangChain
+# ========================
+def criar_ferramentas(indice: IndicePlanilha, cubo: dict) -> list:
+    """Ferramentas tipadas para o agente (langchain_core só é importado aqui)."""
+    from langchain_core.tools import StructuredTool
+
+    def agregados(dimensao: str = "SINDICATO") -> str:
+        """Soma, contagem e média de VR TOTAL, EMPRESA (80%), COLABORADOR (20%), DIAS ÚTEIS e VALOR UNITÁRIO por SINDICATO, UF ou TOTAL."""
+        return resumo_agregados(cubo, dimensao)
+
+    return [
+        StructuredTool.from_function(indice.buscar_matricula, name="buscar_matricula"),
+        StructuredTool.from_function(indice.listar_sindicato, name="listar_sindicato"),
+        StructuredTool.from_function(indice.top_vr, name="top_vr"),
+        StructuredTool.from_function(agregados, name="agregados"),
+    ]
@@ -0,0 +1,164 @@
+import os
+import sys
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from exportacao import escrever_xlsx
+from processamento import ARQUIVOS_BASES
+
+
+# ========================
+# Parâmetros da base sintética
+# ========================
+# Frações sobre o headcount de ATIVOS (aproximam um mês típico da base real)
+TAXAS_PADRAO = {
+    "admissao": 0.05,       # admitidos no mês (ADMISSÃO ABRIL)
+    "desligamento": 0.04,   # DESLIGADOS
+    "comunicado_ok": 0.60,  # desligados com comunicado "OK"
+    "ferias": 0.10,         # FÉRIAS
+    "estagio": 0.03,        # ESTÁGIO
+    "aprendiz": 0.02,       # APRENDIZ
+    "afastamento": 0.02,    # AFASTAMENTOS
+    "exterior": 0.01,       # EXTERIOR
+    "diretor": 0.005,       # cargos de diretoria em ATIVOS
+}
+
+# Sindicato → (estado, VR diário, dias úteis no período, peso no headcount)
+SINDICATOS = {
+    "SINDPD SP - SIND.TRAB.EM PROC DADOS E EMPR.EMPRESAS PROC DADOS ESTADO DE SP.": ("São Paulo", 37.5, 22, 0.45),
+    "SINDPPD RS - SINDICATO DOS TRAB. EM PROC. DE DADOS RIO GRANDE DO SUL": ("Rio Grande do Sul", 35.0, 21, 0.15),
+    "SITEPD PR - SIND DOS TRAB EM EMPR PRIVADAS DE PROC DE DADOS DE CURITIBA E REGIAO METROPOLITANA": ("Paraná", 35.0, 22, 0.20),
+    "SINDPD RJ - SINDICATO PROFISSIONAIS DE PROC DADOS DO RIO DE JANEIRO": ("Rio de Janeiro", 35.0, 21, 0.20),
+}
+
+CARGOS = ["ANALISTA", "ANALISTA SENIOR", "TECH RECRUITER II", "COORDENADOR ADMINISTRATIVO",
+          "DESENVOLVEDOR", "GERENTE DE PROJETOS"]
+SITUACOES_AFASTAMENTO = ["Licença Maternidade", "Auxílio Doença", "Atestado"]
+
+
+def _datas(rng, n, inicio: str, fim: str) -> np.ndarray:
+    ini, fim_ = np.datetime64(inicio), np.datetime64(fim)
+    return ini + rng.integers(0, (fim_ - ini).astype(int) + 1, n).astype("timedelta64[D]")
+
+
+def gerar_bases(headcount: int, taxas: dict = None, semente: int = 0, com_intervalos: bool = False) -> dict:
+    """
+    As dez planilhas do ZIP (chaves de processamento.ARQUIVOS_BASES) para
+    `headcount` colaboradores ativos, no layout das planilhas reais.
+    Com `com_intervalos`, FÉRIAS e AFASTAMENTOS ganham colunas de início/fim.
+    """
+    taxas = {**TAXAS_PADRAO, **(taxas or {})}
+    rng = np.random.default_rng(semente)
+    nomes = list(SINDICATOS)
+    pesos = np.array([s[3] for s in SINDICATOS.values()])
+
+    def qtd(taxa):
+        return int(round(headcount * taxas[taxa]))
+
+    # --- ATIVOS (estagiários, aprendizes e diretores marcados pelo cargo) ---
+    matriculas = np.arange(10_000, 10_000 + headcount)
+    cargos = np.array(CARGOS, dtype=object)[rng.integers(0, len(CARGOS), headcount)]
+    embaralhadas = rng.permutation(matriculas)
+    fatias = {}
+    inicio = 0
+    for nome in ["estagio", "aprendiz", "diretor"]:
+        fatias[nome] = embaralhadas[inicio:inicio + qtd(nome)]
+        inicio += qtd(nome)
+    cargos[fatias["estagio"] - 10_000] = "ESTAGIARIO"
+    cargos[fatias["aprendiz"] - 10_000] = "APRENDIZ"
+    cargos[fatias["diretor"] - 10_000] = "DIRETOR"
+    ativos = pd.DataFrame({
+        "EMPRESA": 1410,
+        "MATRICULA": matriculas,
+        "TITULO DO CARGO": cargos,
+        "DESC. SITUACAO": "Trabalhando",
+        "Sindicato": np.array(nomes, dtype=object)[rng.choice(len(nomes), headcount, p=pesos)],
+    })
+
+    # --- ADMISSÃO ABRIL (matrículas novas) ---
+    n_adm = qtd("admissao")
+    admitidos = pd.DataFrame({
+        "MATRICULA": np.arange(10_000 + headcount, 10_000 + headcount + n_adm),
+        "Admissão": _datas(rng, n_adm, "2025-04-01", "2025-04-30"),
+        "Cargo": np.array(CARGOS, dtype=object)[rng.integers(0, len(CARGOS), n_adm)],
+        "Sindicato": np.array(nomes, dtype=object)[rng.choice(len(nomes), n_adm, p=pesos)],
+    })
+
+    # --- FÉRIAS ---
+    n_fer = qtd("ferias")
+    dias_ferias = rng.choice([5, 10, 15, 20, 30], n_fer, p=[0.1, 0.3, 0.2, 0.1, 0.3])
+    ferias = pd.DataFrame({
+        "MATRICULA": rng.choice(matriculas, n_fer, replace=False),
+        "DESC. SITUACAO": "Férias",
+        "DIAS DE FÉRIAS": dias_ferias,
+    })
+    if com_intervalos:
+        ini = _datas(rng, n_fer, "2025-04-01", "2025-05-15")
+        ferias["INICIO FÉRIAS"] = ini
+        ferias["FIM FÉRIAS"] = ini + (dias_ferias - 1).astype("timedelta64[D]")
+
+    # --- DESLIGADOS ---
+    n_desl = qtd("desligamento")
+    desligados = pd.DataFrame({
+        "MATRICULA ": rng.choice(matriculas, n_desl, replace=False),
+        "DATA DEMISSÃO": _datas(rng, n_desl, "2025-05-01", "2025-05-31"),
+        "COMUNICADO DE DESLIGAMENTO": np.where(rng.random(n_desl) < taxas["comunicado_ok"], "OK", None),
+    })
+
+    # --- Exclusões ---
+    estagio = pd.DataFrame({"MATRICULA": np.sort(fatias["estagio"]), "TITULO DO CARGO": "ESTAGIARIO"})
+    aprendiz = pd.DataFrame({"MATRICULA": np.sort(fatias["aprendiz"]), "TITULO DO CARGO": "APRENDIZ"})
+    n_afa = qtd("afastamento")
+    afastamentos = pd.DataFrame({
+        "MATRICULA": rng.choice(matriculas, n_afa, replace=False),
+        "DESC. SITUACAO": np.array(SITUACOES_AFASTAMENTO, dtype=object)[rng.integers(0, 3, n_afa)],
+    })
+    if com_intervalos:
+        ini = _datas(rng, n_afa, "2025-03-01", "2025-05-15")
+        afastamentos["DATA INICIO"] = ini
+        afastamentos["DATA FIM"] = ini + rng.integers(3, 90, n_afa).astype("timedelta64[D]")
+    exterior = pd.DataFrame({"Cadastro": rng.choice(matriculas, qtd("exterior"), replace=False), "Valor": 0})
+
+    # --- Referências ---
+    estados = sorted({s[0]: s[1] for s in SINDICATOS.values()}.items())
+    sindicato_valores = pd.DataFrame({"ESTADO": [e for e, _ in estados], "VALOR": [v for _, v in estados]})
+    dias_uteis = pd.DataFrame({
+        "BASE DIAS UTEIS DE 15/04 a 15/05": ["SINDICADO"] + nomes,
+        "Unnamed: 1": ["DIAS UTEIS"] + [s[2] for s in SINDICATOS.values()],
+    })
+
+    return {
+        "ativos": ativos,
+        "ferias": ferias,
+        "desligados": desligados,
+        "admitidos": admitidos,
+        "sindicato_valores": sindicato_valores,
+        "dias_uteis": dias_uteis,
+        "estagio": estagio,
+        "aprendiz": aprendiz,
+        "afastamentos": afastamentos,
+        "exterior": exterior,
+    }
+
+
+def gerar_zip(caminho_zip: str, headcount: int, taxas: dict = None, semente: int = 0,
+              com_intervalos: bool = False) -> str:
+    """Grava as planilhas sintéticas num ZIP com os mesmos nomes de arquivo do ZIP real."""
+    bases = gerar_bases(headcount, taxas, semente, com_intervalos)
+    os.makedirs(os.path.dirname(caminho_zip) or ".", exist_ok=True)
+    with tempfile.TemporaryDirectory() as pasta, zipfile.ZipFile(caminho_zip, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        for chave, nome_arquivo in ARQUIVOS_BASES.items():
+            caminho = os.path.join(pasta, nome_arquivo)
+            escrever_xlsx(bases[chave], caminho)
+            zip_ref.write(caminho, arcname=nome_arquivo)
+    print(f"[DEBUG] ZIP sintético com {headcount} ativos salvo em {caminho_zip}")
+    return caminho_zip
+
+
+if __name__ == "__main__":
+    headcount = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    destino = sys.argv[2] if len(sys.argv) > 2 else f"dados/sintetico_{headcount}.zip"
+    gerar_zip(destino, headcount)
@@ -0,0 +1,212 @@
+"""
+Recalculo incremental mês a mês.
+
+Guarda, por MATRICULA, uma impressão digital (hash) de tudo que influencia
+o cálculo — linha(s) da base consolidada, férias, afastamentos, desligamento e os
+valores de referência do sindicato — junto com o resultado do mês
+anterior. No mês seguinte só as MATRICULAs cuja impressão mudou passam
+por calcular_dias_uteis / calcular_valores_vr; as demais reaproveitam o
+resultado salvo. A saída é idêntica à de um recálculo completo. O estado
+vale para um período de competência: outro período recalcula tudo.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from calendario import FIM_PERIODO, INICIO_PERIODO
+from esquema import aplicar_esquema
+from processamento import (
+    aplicar_regras_exclusao,
+    calcular_dias_uteis,
+    calcular_valores_vr,
+    consolidar_bases,
+    montar_dimensao_sindicatos,
+)
+
+PASTA_ESTADO = "dados/incremental"
+
+# Incrementar sempre que as regras de cálculo mudarem (força recálculo completo)
+VERSAO_REGRAS = "3"
+
+COMPONENTES = ["base", "ferias", "afastamento", "desligamento", "sindicato"]
+
+_MISTURA = np.uint64(0x9E3779B97F4A7C15)
+
+
+# ========================
+# Impressões digitais
+# ========================
+def _chave(matricula: pd.Series) -> pd.Series:
+    return matricula.astype(str)
+
+
+def _normalizar_matricula(df: pd.DataFrame) -> pd.DataFrame:
+    return df.rename(columns={col: "MATRICULA" for col in df.columns if "MATRIC" in col.upper()})
+
+
+def _hash_por_chave(chaves: pd.Series, df: pd.DataFrame) -> pd.Series:
+    """Combina os hashes das linhas de cada chave, respeitando a ordem das linhas."""
+    if df.empty:
+        return pd.Series(dtype="uint64")
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    ordem = chaves.groupby(chaves.to_numpy()).cumcount().to_numpy().astype(np.uint64)
+    misturado = hashes ^ ((ordem + np.uint64(1)) * _MISTURA)
+    return pd.Series(misturado, index=chaves.to_numpy()).groupby(level=0).sum()
+
+
+def _hash_sindicatos(sindicatos: pd.Series, bases: dict) -> pd.Series:
+    """Hash dos DIAS_UTEIS e VR_VALOR que cada sindicato recebe."""
+    dim = montar_dimensao_sindicatos(sindicatos.astype(object).dropna().unique(), bases)
+    df = dim[["DIAS_UTEIS", "VR_VALOR"]].rename_axis("Sindicato").reset_index()
+    return _hash_por_chave(df["Sindicato"], df)
+
+
+def calcular_impressoes(df_filtrada: pd.DataFrame, bases: dict) -> pd.DataFrame:
+    """Uma linha por MATRICULA (como str) com o hash de cada componente de entrada."""
+    chaves = _chave(df_filtrada["MATRICULA"])
+    impressoes = pd.DataFrame(index=pd.Index(chaves.unique(), name="CHAVE"))
+
+    impressoes["base"] = _hash_por_chave(chaves, df_filtrada)
+
+    # Afastamentos com início/fim alteram os dias descontados (ausencias.py)
+    fontes = (("ferias", "ferias"), ("afastamento", "afastamentos"), ("desligamento", "desligados"))
+    for componente, chave_base in fontes:
+        if bases.get(chave_base) is None:
+            continue
+        df_sub = _normalizar_matricula(bases[chave_base])
+        if "MATRICULA" in df_sub.columns:
+            impressoes[componente] = _hash_por_chave(_chave(df_sub["MATRICULA"]), df_sub)
+
+    hash_sind = _hash_sindicatos(df_filtrada["Sindicato"], bases)
+    linha_sind = pd.Series(
+        df_filtrada["Sindicato"].astype(object).map(hash_sind).fillna(0).to_numpy(dtype="uint64"),
+        index=chaves.to_numpy(),
+    )
+    impressoes["sindicato"] = linha_sind.groupby(level=0).sum()
+
+    for componente in COMPONENTES:
+        if componente not in impressoes.columns:
+            impressoes[componente] = np.uint64(0)
+    return impressoes[COMPONENTES].fillna(0).astype("uint64")
+
+
+# ========================
+# Estado salvo
+# ========================
+def versao_estado(periodo=None) -> str:
+    """Versão das regras + período da competência (o padrão de calcular_dias_uteis se None)."""
+    inicio, fim = periodo or (INICIO_PERIODO, FIM_PERIODO)
+    return f"{VERSAO_REGRAS}|{pd.Timestamp(inicio).date()}|{pd.Timestamp(fim).date()}"
+
+
+def _caminhos(pasta: str):
+    return (
+        os.path.join(pasta, "saida.pkl"),
+        os.path.join(pasta, "impressoes.pkl"),
+        os.path.join(pasta, "versao.txt"),
+    )
+
+
+def carregar_estado(pasta: str = PASTA_ESTADO, periodo=None):
+    """Retorna (saida, impressoes) do mês anterior ou (None, None)."""
+    caminho_saida, caminho_imp, caminho_versao = _caminhos(pasta)
+    if not all(os.path.exists(c) for c in (caminho_saida, caminho_imp, caminho_versao)):
+        return None, None
+    with open(caminho_versao, encoding="utf-8") as f:
+        if f.read().strip() != versao_estado(periodo):
+            print("[DEBUG] Estado incremental de outra versão das regras ou outro período; recálculo completo.")
+            return None, None
+    return pd.read_pickle(caminho_saida), pd.read_pickle(caminho_imp)
+
+
+def salvar_estado(saida: pd.DataFrame, impressoes: pd.DataFrame, pasta: str = PASTA_ESTADO, periodo=None):
+    os.makedirs(pasta, exist_ok=True)
+    caminho_saida, caminho_imp, caminho_versao = _caminhos(pasta)
+    saida.to_pickle(caminho_saida)
+    impressoes.to_pickle(caminho_imp)
+    with open(caminho_versao, "w", encoding="utf-8") as f:
+        f.write(versao_estado(periodo))
+
+
+# ========================
+# Recalculo
+# ========================
+def detectar_alteracoes(impressoes: pd.DataFrame, impressoes_ant: pd.DataFrame) -> dict:
+    """
+    Compara as impressões dos dois meses. Retorna {motivo: Index de chaves},
+    com 'nova' para MATRICULAs sem histórico e um item por componente alterado.
+    """
+    comuns = impressoes.index.intersection(impressoes_ant.index)
+    alteracoes = {"nova": impressoes.index.difference(impressoes_ant.index)}
+    atual = impressoes.loc[comuns]
+    anterior = impressoes_ant.loc[comuns]
+    for componente in COMPONENTES:
+        mudou = atual[componente].to_numpy() != anterior[componente].to_numpy()
+        alteracoes[componente] = comuns[mudou]
+    return alteracoes
+
+
+def calcular_incremental(bases: dict, pasta_estado: str = PASTA_ESTADO,
+                         forcar_completo: bool = False, periodo=None) -> pd.DataFrame:
+    """
+    Equivalente a consolidar_bases → aplicar_regras_exclusao →
+    calcular_dias_uteis → calcular_valores_vr, recalculando só as
+    MATRICULAs que mudaram desde a última execução. `periodo` (início, fim)
+    é o período da competência, como em calcular_dias_uteis.
+    """
+    df_filtrada = aplicar_regras_exclusao(bases, consolidar_bases(bases))
+    df_filtrada = df_filtrada.reset_index(drop=True)
+    chaves = _chave(df_filtrada["MATRICULA"])
+
+    # Posição de cada linha de origem, usada para reconstruir a ordem do recálculo completo
+    df_filtrada["_ORIGEM"] = np.arange(len(df_filtrada))
+    df_filtrada["_OCORRENCIA"] = chaves.groupby(chaves.to_numpy()).cumcount().to_numpy()
+
+    impressoes = calcular_impressoes(df_filtrada.drop(columns=["_ORIGEM", "_OCORRENCIA"]), bases)
+    saida_ant, impressoes_ant = (None, None) if forcar_completo else carregar_estado(pasta_estado, periodo)
+
+    if saida_ant is None:
+        recalcular = impressoes.index
+        print("\n[DEBUG] Incremental: sem estado anterior, recálculo completo.")
+    else:
+        alteracoes = detectar_alteracoes(impressoes, impressoes_ant)
+        recalcular = alteracoes["nova"]
+        for componente in COMPONENTES:
+            recalcular = recalcular.union(alteracoes[componente])
+        resumo = ", ".join(f"{motivo}={len(idx)}" for motivo, idx in alteracoes.items())
+        print(f"\n[DEBUG] Incremental: {len(recalcular)} de {len(impressoes)} MATRICULAs recalculadas ({resumo})")
+
+    mask_recalc = chaves.isin(recalcular).to_numpy()
+    partes = []
+
+    if mask_recalc.any() or saida_ant is None:
+        df_dias = calcular_dias_uteis(df_filtrada[mask_recalc], bases, periodo=periodo)
+        partes.append(calcular_valores_vr(df_dias, bases))
+
+    if saida_ant is not None and not mask_recalc.all():
+        # Reaproveita as linhas salvas e as reposiciona pela linha de origem deste mês
+        origem = pd.Series(
+            df_filtrada.loc[~mask_recalc, "_ORIGEM"].to_numpy(),
+            index=pd.MultiIndex.from_arrays(
+                [chaves[~mask_recalc].to_numpy(), df_filtrada.loc[~mask_recalc, "_OCORRENCIA"].to_numpy()]
+            ),
+        )
+        chaves_ant = _chave(saida_ant["MATRICULA"])
+        reaproveitar = saida_ant[~chaves_ant.isin(recalcular).to_numpy() & chaves_ant.isin(impressoes.index).to_numpy()].copy()
+        reaproveitar["_ORIGEM"] = origem.reindex(
+            pd.MultiIndex.from_arrays([_chave(reaproveitar["MATRICULA"]).to_numpy(), reaproveitar["_OCORRENCIA"].to_numpy()])
+        ).to_numpy()
+        partes.append(reaproveitar)
+
+    df_vr = pd.concat(partes, ignore_index=True) if len(partes) > 1 else partes[0]
+    df_vr = df_vr.sort_values("_ORIGEM", kind="stable").reset_index(drop=True)
+
+    # O concat das partes perde as categorias; restaura as mesmas do recálculo completo
+    for col in df_filtrada.columns:
+        if isinstance(df_filtrada[col].dtype, pd.CategoricalDtype) and col in df_vr.columns:
+            df_vr[col] = df_vr[col].astype(df_filtrada[col].dtype)
+    df_vr = aplicar_esquema(df_vr)
+
+    salvar_estado(df_vr.drop(columns=["_ORIGEM"]), impressoes, pasta_estado, periodo)
+    return df_vr.drop(columns=["_ORIGEM", "_OCORRENCIA"])
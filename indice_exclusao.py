@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+from ausencias import linhas_com_intervalo
+
+
+# ========================
+# Motivos de exclusão (bits da máscara)
+# ========================
+MOTIVOS = {
+    "ESTAGIO": 1,
+    "APRENDIZ": 2,
+    "AFASTAMENTO": 4,
+    "EXTERIOR": 8,
+    "DIRETOR": 16,
+}
+
+# Base (chave em `bases`) de onde vem cada motivo
+FONTES_MOTIVO = {
+    "ESTAGIO": "estagio",
+    "APRENDIZ": "aprendiz",
+    "AFASTAMENTO": "afastamentos",
+    "EXTERIOR": "exterior",
+}
+
+_SENTINELA = np.iinfo(np.int64).min
+
+
+def _matriculas_int(matriculas) -> np.ndarray:
+    """Converte para int64; valores ausentes ou não numéricos viram uma sentinela que nunca casa."""
+    num = pd.to_numeric(pd.Series(matriculas), errors="coerce")
+    valido = num.notna() & (num % 1 == 0)
+    return np.where(valido, num.fillna(0), _SENTINELA).astype(np.int64)
+
+
+def _matriculas_texto(matriculas) -> np.ndarray:
+    """
+    Hash (uint64) do texto das MATRICULAs não inteiras (ex.: 'A123'), que
+    casam pelo texto como no isin por string; 0 nas inteiras e ausentes.
+    """
+    serie = pd.Series(matriculas).astype(object)
+    num = pd.to_numeric(serie, errors="coerce")
+    texto = (serie.notna() & ~(num.notna() & (num % 1 == 0))).to_numpy()
+    hashes = np.zeros(len(serie), dtype=np.uint64)
+    if texto.any():
+        hashes[texto] = pd.util.hash_array(serie[texto].astype(str).to_numpy(dtype=object))
+    return hashes
+
+
+def _contidas(chaves: np.ndarray, valores: np.ndarray) -> np.ndarray:
+    """Busca binária vetorizada de `valores` no array ordenado `chaves`."""
+    if len(chaves) == 0:
+        return np.zeros(len(valores), dtype=bool)
+    pos = np.searchsorted(chaves, valores).clip(max=len(chaves) - 1)
+    return chaves[pos] == valores
+
+
+def _coluna_matricula(df: pd.DataFrame):
+    return next((c for c in df.columns if isinstance(c, str) and "MATRIC" in c.upper()), None)
+
+
+class IndiceExclusao:
+    """
+    Índice de MATRICULAs excluídas: um array int64 ordenado por motivo,
+    consultado com busca binária vetorizada (np.searchsorted). MATRICULAs
+    não inteiras ficam num segundo array, de hashes do texto.
+    """
+
+    def __init__(self, chaves_por_motivo: dict = None):
+        self.chaves = {}
+        self.textos = {}
+        for motivo, matriculas in (chaves_por_motivo or {}).items():
+            self.chaves[motivo] = self._ordenar(matriculas)
+            self.textos[motivo] = self._ordenar_texto(matriculas)
+            if len(self.textos[motivo]):
+                print(f"[DEBUG] {motivo}: {len(self.textos[motivo])} MATRICULAs não numéricas comparadas pelo texto")
+
+    @staticmethod
+    def _ordenar(matriculas) -> np.ndarray:
+        chaves = np.unique(_matriculas_int(matriculas))
+        return chaves[chaves != _SENTINELA]
+
+    @staticmethod
+    def _ordenar_texto(matriculas) -> np.ndarray:
+        hashes = np.unique(_matriculas_texto(matriculas))
+        return hashes[hashes != 0]
+
+    @classmethod
+    def das_bases(cls, bases: dict) -> "IndiceExclusao":
+        """Monta o índice a partir de ESTÁGIO, APRENDIZ, AFASTAMENTOS e EXTERIOR."""
+        chaves = {}
+        for motivo, chave_base in FONTES_MOTIVO.items():
+            df_sub = bases.get(chave_base)
+            if df_sub is None:
+                continue
+            col = _coluna_matricula(df_sub)
+            if col is None:
+                continue
+            if motivo == "AFASTAMENTO":
+                # Afastamentos com início/fim são descontados em dias (ausencias.py),
+                # não excluem o colaborador inteiro
+                df_sub = df_sub[~linhas_com_intervalo(df_sub)]
+            chaves[motivo] = df_sub[col]
+        return cls(chaves)
+
+    def com_motivo(self, motivo: str, matriculas) -> "IndiceExclusao":
+        """Novo índice com as chaves de `motivo` acrescentadas (o original não muda)."""
+        novo = IndiceExclusao()
+        novo.chaves = dict(self.chaves)
+        novo.textos = dict(self.textos)
+        existentes = novo.chaves.get(motivo, np.empty(0, dtype=np.int64))
+        novo.chaves[motivo] = np.union1d(existentes, self._ordenar(matriculas))
+        existentes = novo.textos.get(motivo, np.empty(0, dtype=np.uint64))
+        novo.textos[motivo] = np.union1d(existentes, self._ordenar_texto(matriculas))
+        return novo
+
+    def mascara(self, matriculas) -> np.ndarray:
+        """Máscara de bits (uint8) com os motivos de exclusão de cada MATRICULA."""
+        valores = _matriculas_int(matriculas)
+        textos = None
+        resultado = np.zeros(len(valores), dtype=np.uint8)
+        for motivo, chaves in self.chaves.items():
+            contidas = _contidas(chaves, valores)
+            if len(self.textos.get(motivo, ())):
+                if textos is None:
+                    textos = _matriculas_texto(matriculas)
+                contidas |= _contidas(self.textos[motivo], textos) & (textos != 0)
+            resultado |= np.where(contidas, MOTIVOS[motivo], 0).astype(np.uint8)
+        return resultado
+
+    def contem(self, matriculas) -> np.ndarray:
+        return self.mascara(matriculas) != 0
+
+    def __len__(self):
+        if not self.chaves:
+            return 0
+        return (len(np.unique(np.concatenate(list(self.chaves.values()))))
+                + len(np.unique(np.concatenate(list(self.textos.values())))))
+
+
+def descrever_motivos(mascara) -> pd.Series:
+    """
+    Traduz a máscara de bits para texto, ex.: 'ESTAGIO|DIRETOR'. Aceita
+    também um DataFrame booleano com um motivo por coluna (ex.: a matriz
+    de violações de regras_validacao).
+    """
+    if isinstance(mascara, pd.DataFrame):
+        marcas = {motivo: mascara[motivo].to_numpy() for motivo in mascara.columns}
+    else:
+        mascara = pd.Series(mascara)
+        marcas = {motivo: (mascara.to_numpy() & bit) != 0 for motivo, bit in MOTIVOS.items()}
+    texto = pd.Series("", index=mascara.index)
+    for motivo, tem in marcas.items():
+        texto[tem] = texto[tem] + "|" + motivo
+    return texto.str.lstrip("|")
@@ -0,0 +1,244 @@
+import cProfile
+import functools
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import resource  # só existe em Unix
+except ImportError:
+    resource = None
+
+# Variáveis de ambiente: a configuração de main.py vale também para os
+# processos filhos (lote.py), que herdam o ambiente
+VAR_DESTINO = "VR_METRICAS"
+VAR_FORMATO = "VR_METRICAS_FORMATO"
+VAR_PERFIL = "VR_PERFIL"
+VAR_MEMORIA = "VR_METRICAS_MEMORIA"
+
+PASTA_PERFIS = "dados/perfis"
+FORMATOS = ("jsonl", "prometheus")
+
+
+# ========================
+# Coletor de métricas
+# ========================
+class Instrumentacao:
+    """
+    Guarda as medições das etapas de uma execução e as exporta em JSON
+    lines (uma linha por etapa, acrescentada ao arquivo) ou no formato
+    textfile do Prometheus (arquivo reescrito a cada etapa, para o
+    textfile collector do node_exporter).
+    Sem `destino` nem perfis, fica inativa e os decoradores só chamam a função.
+    """
+
+    def __init__(self, destino: str = None, formato: str = "jsonl", perfilar=(), memoria: bool = True,
+                 pasta_perfis: str = PASTA_PERFIS):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de métricas inválido: {formato} (use {', '.join(FORMATOS)})")
+        self.destino = destino
+        self.formato = formato
+        self.perfilar = set(perfilar)
+        self.memoria = memoria
+        self.pasta_perfis = pasta_perfis
+        self.execucao = f"{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}"
+        self.medicoes = []
+        self._pilha = []
+
+    @property
+    def ativa(self) -> bool:
+        return bool(self.destino or self.perfilar)
+
+    @classmethod
+    def do_ambiente(cls):
+        perfis = [p for p in os.getenv(VAR_PERFIL, "").split(",") if p.strip()]
+        return cls(
+            destino=os.getenv(VAR_DESTINO) or None,
+            formato=os.getenv(VAR_FORMATO, "jsonl"),
+            perfilar=[p.strip() for p in perfis],
+            memoria=os.getenv(VAR_MEMORIA, "1") != "0",
+        )
+
+    # --- Medição ---
+    @contextmanager
+    def medir(self, etapa: str, linhas_entrada: int = None):
+        """
+        Mede o bloco: tempo de parede, CPU, pico de memória (tracemalloc) e
+        linhas. Quem usa preenche medicao["linhas_saida"] (e, se for o caso,
+        medicao["linhas_excluidas"]) no dicionário devolvido.
+        """
+        medicao = {"execucao": self.execucao, "etapa": etapa, "inicio": datetime.now().isoformat(timespec="seconds"),
+                   "linhas_entrada": linhas_entrada, "linhas_saida": None, "linhas_excluidas": None, "erro": None}
+        if not self.ativa:
+            yield medicao
+            return
+
+        pai = self._pilha[-1] if self._pilha else None
+        self._pilha.append(medicao)
+        iniciou_tracemalloc = False
+        if self.memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                iniciou_tracemalloc = True
+            elif pai is not None:
+                # Guarda o pico do pai até aqui antes de zerar o pico para esta etapa
+                pai["_pico"] = max(pai.get("_pico", 0), tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            medicao["_base"] = tracemalloc.get_traced_memory()[0]
+
+        perfil = None
+        if etapa in self.perfilar:
+            perfil = cProfile.Profile()
+            try:
+                perfil.enable()
+            except ValueError:
+                # Outra etapa já está sendo perfilada (etapas aninhadas)
+                perfil = None
+
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield medicao
+        except Exception as e:
+            medicao["erro"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            medicao["segundos"] = round(time.perf_counter() - inicio, 6)
+            medicao["cpu_segundos"] = round(time.process_time() - inicio_cpu, 6)
+            if perfil is not None:
+                perfil.disable()
+                medicao["perfil"] = self._salvar_perfil(perfil, etapa)
+            if self.memoria:
+                pico = max(medicao.pop("_pico", 0), tracemalloc.get_traced_memory()[1])
+                medicao["pico_memoria_mb"] = round((pico - medicao.pop("_base")) / 1024 ** 2, 3)
+                if pai is not None:
+                    pai["_pico"] = max(pai.get("_pico", 0), pico)
+                if iniciou_tracemalloc:
+                    tracemalloc.stop()
+            if resource is not None:
+                # ru_maxrss vem em KB no Linux: pico do processo inteiro, não só da etapa
+                medicao["rss_maximo_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+            self._pilha.pop()
+            self._registrar(medicao)
+
+    def _salvar_perfil(self, perfil: cProfile.Profile, etapa: str) -> str:
+        os.makedirs(self.pasta_perfis, exist_ok=True)
+        caminho = os.path.join(self.pasta_perfis, f"{etapa}_{self.execucao}.prof")
+        perfil.dump_stats(caminho)
+        print(f"[DEBUG] Perfil de {etapa} salvo em {caminho} (python -m pstats {caminho})")
+        return caminho
+
+    # --- Exportação ---
+    def _registrar(self, medicao: dict):
+        self.medicoes.append(medicao)
+        if not self.destino:
+            return
+        os.makedirs(os.path.dirname(self.destino) or ".", exist_ok=True)
+        if self.formato == "jsonl":
+            with open(self.destino, "a", encoding="utf-8") as f:
+                f.write(json.dumps(medicao, ensure_ascii=False) + "\n")
+        else:
+            # Escrita atômica: o node_exporter nunca lê um arquivo pela metade
+            temporario = f"{self.destino}.{os.getpid()}.tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                f.write(self.texto_prometheus())
+            os.replace(temporario, self.destino)
+
+    def texto_prometheus(self) -> str:
+        """Última medição de cada etapa como gauges `vr_etapa_*{etapa="..."}`."""
+        ultimas = {m["etapa"]: m for m in self.medicoes}
+        metricas = [
+            ("segundos", "segundos", "Tempo de parede da etapa"),
+            ("cpu_segundos", "cpu_segundos", "Tempo de CPU da etapa"),
+            ("pico_memoria_mb", "pico_memoria_bytes", "Pico de memória alocada pela etapa (tracemalloc)"),
+            ("linhas_entrada", "linhas_entrada", "Linhas recebidas pela etapa"),
+            ("linhas_saida", "linhas_saida", "Linhas devolvidas pela etapa"),
+            ("linhas_excluidas", "linhas_excluidas", "Linhas removidas pela etapa"),
+        ]
+        linhas = []
+        for campo, nome, ajuda in metricas:
+            linhas += [f"# HELP vr_etapa_{nome} {ajuda}", f"# TYPE vr_etapa_{nome} gauge"]
+            for etapa, m in ultimas.items():
+                valor = m.get(campo)
+                if valor is None:
+                    continue
+                if nome.endswith("_bytes"):
+                    valor = round(valor * 1024 ** 2)
+                linhas.append(f'vr_etapa_{nome}{{etapa="{etapa}"}} {valor}')
+        linhas += ["# HELP vr_etapa_erro 1 se a última execução da etapa falhou", "# TYPE vr_etapa_erro gauge"]
+        linhas += [f'vr_etapa_erro{{etapa="{e}"}} {int(m["erro"] is not None)}' for e, m in ultimas.items()]
+        return "\n".join(linhas) + "\n"
+
+    def resumo(self) -> pd.DataFrame:
+        colunas = ["etapa", "segundos", "cpu_segundos", "pico_memoria_mb",
+                   "linhas_entrada", "linhas_saida", "linhas_excluidas"]
+        return pd.DataFrame(self.medicoes).reindex(columns=colunas)
+
+
+# Coletor do processo: lido do ambiente na importação, trocado por configurar()
+INSTRUMENTACAO = Instrumentacao.do_ambiente()
+
+
+def configurar(destino: str = None, formato: str = "jsonl", perfilar=(), memoria: bool = True) -> Instrumentacao:
+    """Ativa a instrumentação neste processo e nos processos filhos criados depois."""
+    global INSTRUMENTACAO
+    INSTRUMENTACAO = Instrumentacao(destino, formato, perfilar, memoria)
+    for var, valor in [(VAR_DESTINO, destino), (VAR_FORMATO, formato),
+                       (VAR_PERFIL, ",".join(perfilar)), (VAR_MEMORIA, "1" if memoria else "0")]:
+        if valor:
+            os.environ[var] = valor
+        else:
+            os.environ.pop(var, None)
+    return INSTRUMENTACAO
+
+
+# ========================
+# Decorador das etapas
+# ========================
+def contar_linhas(obj):
+    """Linhas de um DataFrame, de um dict de DataFrames (soma) ou do 1º item de uma tupla."""
+    if isinstance(obj, tuple) and obj:
+        obj = obj[0]
+    if isinstance(obj, pd.DataFrame):
+        return len(obj)
+    if isinstance(obj, dict) and obj and all(isinstance(v, pd.DataFrame) for v in obj.values()):
+        return sum(len(v) for v in obj.values())
+    return None
+
+
+def _linhas_entrada(args) -> int:
+    # O DataFrame principal é o último DataFrame posicional (ex.: df_base em aplicar_regras_exclusao)
+    frames = [a for a in args if isinstance(a, pd.DataFrame)]
+    return len(frames[-1]) if frames else None
+
+
+def instrumentar(func=None, *, nome: str = None, linhas_entrada=None):
+    """
+    Decorador de etapa: registra a chamada no coletor ativo. `linhas_entrada`
+    (opcional) recebe os argumentos da função e devolve as linhas de entrada;
+    por padrão vale o último DataFrame posicional. Linhas excluídas = entrada
+    − saída quando a etapa filtra.
+    """
+    if func is None:
+        return functools.partial(instrumentar, nome=nome, linhas_entrada=linhas_entrada)
+    etapa = nome or func.__name__
+
+    @functools.wraps(func)
+    def envoltorio(*args, **kwargs):
+        coletor = INSTRUMENTACAO
+        if not coletor.ativa:
+            return func(*args, **kwargs)
+        entrada = linhas_entrada(*args, **kwargs) if linhas_entrada else _linhas_entrada(args)
+        with coletor.medir(etapa, entrada) as medicao:
+            resultado = func(*args, **kwargs)
+            saida = contar_linhas(resultado)
+            medicao["linhas_saida"] = saida
+            if entrada is not None and saida is not None:
+                medicao["linhas_excluidas"] = max(entrada - saida, 0)
+        return resultado
+
+    return envoltorio
@@ -0,0 +1,212 @@
+"""
+Ingestão em modo streaming para planilhas muito grandes (ATIVOS, FÉRIAS).
+
+O pd.read_excel monta o modelo de objetos inteiro do workbook antes de
+devolver o DataFrame. Aqui a planilha é percorrida com o modo read-only
+do openpyxl e entregue em pedaços (chunks) de `tamanho_chunk` linhas, de
+modo que o pico de memória depende do tamanho do chunk e não do número
+de colaboradores.
+"""
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from ausencias import colunas_intervalo
+from esquema import aplicar_esquema, aplicar_esquema_bases
+from indice_exclusao import IndiceExclusao
+from processamento import (
+    ARQUIVOS_BASES,
+    _filtrar_exclusoes,
+    _mascara_diretor,
+    _padronizar_admitidos,
+    _padronizar_ativos,
+    calcular_dias_uteis,
+    calcular_valores_vr,
+)
+
+TAMANHO_CHUNK = 50_000
+
+# Planilhas lidas em chunks; as demais são pequenas e lidas inteiras
+BASES_STREAMING = ("ativos", "ferias")
+
+
+# ========================
+# Leitura em chunks
+# ========================
+def _montar_cabecalho(linha) -> list:
+    """Replica os nomes de coluna que o pd.read_excel geraria."""
+    cabecalho = []
+    vistos = {}
+    for i, valor in enumerate(linha):
+        nome = f"Unnamed: {i}" if valor is None else str(valor)
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        else:
+            vistos[nome] = 0
+        cabecalho.append(nome)
+    return cabecalho
+
+
+def _montar_chunk(linhas: list, cabecalho: list, tipos: dict) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(linhas, columns=cabecalho).infer_objects()
+    # Colunas só com células vazias viram float (NaN), como no read_excel
+    vazias = [c for c in df.columns if df[c].dtype == object and df[c].isna().all()]
+    if vazias:
+        df[vazias] = df[vazias].astype("float64")
+    if tipos:
+        df = df.astype({col: tipo for col, tipo in tipos.items() if col in df.columns})
+    return df
+
+
+def ler_planilha_em_chunks(origem, tamanho_chunk: int = TAMANHO_CHUNK, tipos: dict = None):
+    """
+    Gera DataFrames de até `tamanho_chunk` linhas a partir da primeira aba
+    de `origem` (caminho, bytes ou arquivo aberto). `tipos` ({coluna: dtype})
+    fixa os dtypes para que todos os chunks tenham o mesmo esquema.
+    """
+    if isinstance(origem, bytes):
+        origem = io.BytesIO(origem)
+    wb = load_workbook(origem, read_only=True, data_only=True)
+    try:
+        linhas_ws = wb.worksheets[0].iter_rows(values_only=True)
+        cabecalho = None
+        linhas = []
+        vazias_pendentes = 0
+        for linha in linhas_ws:
+            # Como no read_excel: linhas vazias no meio viram NaN, as do fim são descartadas
+            if all(v is None for v in linha):
+                vazias_pendentes += cabecalho is not None
+                continue
+            if cabecalho is None:
+                cabecalho = _montar_cabecalho(linha)
+                continue
+            for _ in range(vazias_pendentes):
+                linhas.append((None,) * len(cabecalho))
+            vazias_pendentes = 0
+            linhas.append(linha[:len(cabecalho)])
+            if len(linhas) >= tamanho_chunk:
+                yield _montar_chunk(linhas, cabecalho, tipos)
+                linhas = []
+        if linhas:
+            yield _montar_chunk(linhas, cabecalho, tipos)
+    finally:
+        wb.close()
+
+
+def ler_membro_zip_em_chunks(caminho_zip, arquivo: str, tamanho_chunk: int = TAMANHO_CHUNK,
+                             tipos: dict = None):
+    """Como ler_planilha_em_chunks, lendo o membro direto do ZIP (sem extrair)."""
+    with zipfile.ZipFile(caminho_zip, "r") as zip_ref:
+        with zip_ref.open(arquivo) as membro:
+            yield from ler_planilha_em_chunks(membro, tamanho_chunk, tipos)
+
+
+# ========================
+# Consumidores incrementais
+# ========================
+def consolidar_bases_em_chunks(bases: dict, chunks_ativos):
+    """
+    Versão incremental de consolidar_bases: padroniza cada chunk de ATIVOS
+    e, no fim, entrega ADMITIDOS (planilha pequena, já em `bases`).
+    """
+    for chunk in chunks_ativos:
+        yield aplicar_esquema(_padronizar_ativos(chunk))
+    yield aplicar_esquema(_padronizar_admitidos(bases["admitidos"].copy()))
+
+
+def matriculas_de_diretores(chunks_base) -> np.ndarray:
+    """
+    MATRICULAs com DIRETOR no cargo em todos os chunks. É uma passada
+    prévia: só as MATRICULAs encontradas ficam em memória.
+    """
+    partes = [chunk["MATRICULA"].to_numpy()[_mascara_diretor(chunk)] for chunk in chunks_base]
+    return np.concatenate(partes) if partes else np.empty(0, dtype=object)
+
+
+def aplicar_regras_exclusao_em_chunks(bases: dict, chunks_base, diretores=None):
+    """
+    Versão incremental de aplicar_regras_exclusao. O índice das bases de
+    exclusão é montado uma única vez. Sem `diretores` (ver
+    matriculas_de_diretores), a regra de DIRETOR só enxerga o próprio chunk.
+    """
+    indice = IndiceExclusao.das_bases(bases)
+    if diretores is not None:
+        indice = indice.com_motivo("DIRETOR", diretores)
+    total_entrada = 0
+    total_saida = 0
+    for chunk in chunks_base:
+        df_filtrada = _filtrar_exclusoes(chunk, indice)
+        total_entrada += len(chunk)
+        total_saida += len(df_filtrada)
+        yield df_filtrada
+
+    print(f"\n[DEBUG] Exclusões aplicadas: {total_entrada - total_saida} colaboradores removidos")
+    print("Total após exclusões:", total_saida)
+
+
+def projetar_ferias(chunks_ferias) -> pd.DataFrame:
+    """
+    Reduz FÉRIAS às colunas usadas por calcular_dias_uteis (MATRICULA,
+    dias de férias e início/fim, se houver), descartando o restante de cada chunk.
+    """
+    partes = []
+    for chunk in chunks_ferias:
+        colunas = [
+            c for c in chunk.columns
+            if "MATRIC" in c.upper() or "FÉRIA" in c.upper() or "FERIA" in c.upper()
+            or c in colunas_intervalo(chunk)
+        ]
+        partes.append(chunk[colunas])
+    if not partes:
+        return pd.DataFrame(columns=["MATRICULA"])
+    return pd.concat(partes, ignore_index=True)
+
+
+# ========================
+# Pipeline em chunks
+# ========================
+def carregar_bases_pequenas(caminho_zip, tamanho_chunk: int = TAMANHO_CHUNK) -> dict:
+    """
+    Carrega as bases de referência normalmente e a FÉRIAS já projetada.
+    ATIVOS fica de fora: deve ser consumida com ler_membro_zip_em_chunks.
+    """
+    bases = {}
+    with zipfile.ZipFile(caminho_zip, "r") as zip_ref:
+        for chave, arquivo in ARQUIVOS_BASES.items():
+            if chave in BASES_STREAMING:
+                continue
+            with zip_ref.open(arquivo) as membro:
+                bases[chave] = pd.read_excel(io.BytesIO(membro.read()))
+    bases["ferias"] = projetar_ferias(
+        ler_membro_zip_em_chunks(caminho_zip, ARQUIVOS_BASES["ferias"], tamanho_chunk)
+    )
+    return aplicar_esquema_bases(bases)
+
+
+def processar_em_chunks(caminho_zip, tamanho_chunk: int = TAMANHO_CHUNK, tipos_ativos: dict = None):
+    """
+    Executa consolidação → exclusões → dias úteis → valores de VR chunk a
+    chunk, gerando DataFrames com o mesmo layout de calcular_valores_vr.
+
+    ATIVOS é percorrida duas vezes: a primeira só coleta as MATRICULAs de
+    diretores, para que a exclusão valha entre chunks (e para ADMITIDOS),
+    como no modo em memória.
+    """
+    bases = carregar_bases_pequenas(caminho_zip, tamanho_chunk)
+
+    def chunks_base():
+        chunks_ativos = ler_membro_zip_em_chunks(
+            caminho_zip, ARQUIVOS_BASES["ativos"], tamanho_chunk, tipos_ativos
+        )
+        return consolidar_bases_em_chunks(bases, chunks_ativos)
+
+    diretores = matriculas_de_diretores(chunks_base())
+    for df_filtrada in aplicar_regras_exclusao_em_chunks(bases, chunks_base(), diretores):
+        if df_filtrada.empty:
+            continue
+        df_dias = calcular_dias_uteis(df_filtrada, bases)
+        yield calcular_valores_vr(df_dias, bases)
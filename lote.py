@@ -0,0 +1,170 @@
+"""
+Execução em lote: várias competências / empresas num pool de processos.
+
+Uso:
+    python lote.py jobs.csv [resumo.csv]
+
+onde jobs.csv tem as colunas `zip`, `competencia` e (opcional) `saida`.
+As tabelas de referência (Base sindicato x valor, Base dias uteis) são
+lidas uma única vez e compartilhadas com os jobs cujo ZIP traz a mesma
+planilha (mesmo hash de conteúdo); os outros leem a sua.
+"""
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from cache_bases import hash_conteudo
+from calendario import periodo_competencia
+from processamento import (
+    ARQUIVOS_BASES,
+    aplicar_regras_exclusao,
+    calcular_dias_uteis,
+    calcular_valores_vr,
+    reparar_valores_vr,
+    consolidar_bases,
+    exportar_planilha_final,
+    ler_bases_zip,
+)
+
+BASES_REFERENCIA = ("sindicato_valores", "dias_uteis")
+
+# Preenchido em cada worker pelo inicializador do pool
+_REFERENCIAS = {}
+
+
+def caminho_saida_padrao(competencia: str) -> str:
+    return f"dados/VR MENSAL {competencia}.xlsx"
+
+
+def hashes_referencias(caminho_zip) -> dict:
+    """Hash do conteúdo de cada tabela de referência do ZIP."""
+    with zipfile.ZipFile(caminho_zip, "r") as zip_ref:
+        return {chave: hash_conteudo(zip_ref.read(ARQUIVOS_BASES[chave])) for chave in BASES_REFERENCIA}
+
+
+def carregar_referencias(caminho_zip) -> dict:
+    """
+    Lê as tabelas de referência de um ZIP (uma vez para o lote inteiro):
+    {chave: (hash do conteúdo, DataFrame)}.
+    """
+    bases = ler_bases_zip(caminho_zip, BASES_REFERENCIA)
+    hashes = hashes_referencias(caminho_zip)
+    return {chave: (hashes[chave], bases[chave]) for chave in BASES_REFERENCIA}
+
+
+def referencias_compartilhadas(candidatos) -> dict:
+    """
+    Referências do primeiro ZIP de `candidatos` que puder ser lido; {} se
+    nenhum puder (cada job lê então as suas, e os ZIPs com problema falham no próprio job).
+    """
+    for caminho_zip in candidatos:
+        try:
+            return carregar_referencias(caminho_zip)
+        except Exception as e:
+            print(f"⚠️ Referências de {caminho_zip} não puderam ser lidas:", e)
+    return {}
+
+
+def _inicializar_worker(referencias: dict):
+    _REFERENCIAS.update(referencias)
+
+
+def _referencias_do_job(caminho_zip) -> dict:
+    """Referências compartilhadas iguais às do ZIP do job (dias úteis e valores mudam a cada competência)."""
+    hashes = hashes_referencias(caminho_zip)
+    return {chave: df for chave, (hash_ref, df) in _REFERENCIAS.items() if hashes.get(chave) == hash_ref}
+
+
+def executar_job(caminho_zip, competencia: str, caminho_saida: str = None) -> dict:
+    """Roda o fluxo completo de main.py para um ZIP e devolve os totais do job."""
+    caminho_saida = caminho_saida or caminho_saida_padrao(competencia)
+    inicio = time.perf_counter()
+
+    compartilhadas = _referencias_do_job(caminho_zip)
+    chaves = [c for c in ARQUIVOS_BASES if c not in compartilhadas]
+    bases = ler_bases_zip(caminho_zip, chaves)
+    bases.update(compartilhadas)
+
+    df_base = consolidar_bases(bases)
+    df_filtrada = aplicar_regras_exclusao(bases, df_base)
+    # Ausências com datas são contadas no período da competência do job
+    df_dias = calcular_dias_uteis(df_filtrada, bases, periodo=periodo_competencia(competencia))
+    df_vr = reparar_valores_vr(calcular_valores_vr(df_dias, bases))
+    df_final = exportar_planilha_final(df_vr, caminho_saida)
+
+    return {
+        "zip": caminho_zip,
+        "competencia": competencia,
+        "saida": caminho_saida,
+        "colaboradores": len(df_final),
+        "vr_total": float(df_final["VR TOTAL"].sum()),
+        "vr_empresa": float(df_final["EMPRESA (80%)"].sum()),
+        "vr_colaborador": float(df_final["COLABORADOR (20%)"].sum()),
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "erro": None,
+    }
+
+
+def executar_lote(jobs, max_workers: int = None, caminho_referencias=None) -> pd.DataFrame:
+    """
+    Executa uma lista de jobs (zip, competencia[, saida]) em paralelo.
+    As referências vêm de `caminho_referencias` ou, se omitido, do primeiro
+    ZIP de job que puder ser lido, e só substituem as de um job quando o
+    conteúdo é igual.
+    Retorna um DataFrame-resumo com os totais por job (jobs
+    que falharem aparecem com a coluna `erro` preenchida).
+    """
+    jobs = [tuple(job) + (None,) * (3 - len(job)) for job in jobs]
+    if not jobs:
+        return pd.DataFrame()
+
+    candidatos = [caminho_referencias] if caminho_referencias else [job[0] for job in jobs]
+    referencias = referencias_compartilhadas(candidatos)
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+
+    resultados = []
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_inicializar_worker, initargs=(referencias,)
+    ) as pool:
+        futuros = [pool.submit(executar_job, *job) for job in jobs]
+        for (caminho_zip, competencia, caminho_saida), futuro in zip(jobs, futuros):
+            try:
+                resultados.append(futuro.result())
+            except Exception as e:
+                print(f"⚠️ Job {caminho_zip} ({competencia}) falhou:", e)
+                resultados.append({
+                    "zip": caminho_zip,
+                    "competencia": competencia,
+                    "saida": caminho_saida or caminho_saida_padrao(competencia),
+                    "erro": str(e),
+                })
+
+    resumo = pd.DataFrame(resultados)
+    print("\n--- RESUMO DO LOTE ---")
+    print(resumo.drop(columns=["zip"]).to_string(index=False))
+    return resumo
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python lote.py jobs.csv [resumo.csv]")
+        sys.exit(1)
+
+    df_jobs = pd.read_csv(sys.argv[1], dtype=str)
+    if "saida" not in df_jobs.columns:
+        df_jobs["saida"] = None
+    df_jobs = df_jobs.where(df_jobs.notna(), None)
+    jobs = list(df_jobs[["zip", "competencia", "saida"]].itertuples(index=False, name=None))
+
+    resumo = executar_lote(jobs)
+    caminho_resumo = sys.argv[2] if len(sys.argv) > 2 else "dados/resumo_lote.csv"
+    resumo.to_csv(caminho_resumo, index=False)
+    print(f"\n[INFO] Resumo salvo em {caminho_resumo}")
+
+
+if __name__ == "__main__":
+    main()
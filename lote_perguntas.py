@@ -0,0 +1,134 @@
+import asyncio
+import json
+import time
+
+from cache_respostas import normalizar_pergunta
+
+
+# ========================
+# LLM falso (offline)
+# ========================
+class LLMFalso:
+    """
+    Substituto do agente LLM para testes: responde depois de `latencia`
+    segundos com um texto fixo, sem rede. Recebe a mesma entrada do
+    AgentExecutor ({"input": prompt}) e conta as chamadas recebidas.
+    """
+
+    # Identidade no cache de respostas: as respostas simuladas ficam separadas das do Gemini
+    backend = "falso"
+
+    def __init__(self, latencia: float = 0.2, resposta: str = "Resposta simulada para: {pergunta}"):
+        self.latencia = latencia
+        self.resposta = resposta
+        self.chamadas = 0
+
+    def _saida(self, entrada: dict) -> dict:
+        self.chamadas += 1
+        pergunta = entrada["input"].rsplit("Pergunta: ", 1)[-1]
+        return {"output": self.resposta.format(pergunta=pergunta)}
+
+    def invoke(self, entrada: dict) -> dict:
+        time.sleep(self.latencia)
+        return self._saida(entrada)
+
+    async def ainvoke(self, entrada: dict) -> dict:
+        await asyncio.sleep(self.latencia)
+        return self._saida(entrada)
+
+
+# ========================
+# Limite de taxa
+# ========================
+class LimitadorTaxa:
+    """Espaça o início das chamadas para no máximo `por_segundo` por segundo."""
+
+    def __init__(self, por_segundo: float = None):
+        self.intervalo = 1.0 / por_segundo if por_segundo else 0.0
+        self._proxima = 0.0
+        self._trava = asyncio.Lock()
+
+    async def aguardar(self):
+        if not self.intervalo:
+            return
+        async with self._trava:
+            agora = time.monotonic()
+            espera = self._proxima - agora
+            self._proxima = max(agora, self._proxima) + self.intervalo
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+
+# ========================
+# Lote de perguntas
+# ========================
+def ler_perguntas(caminho: str) -> list:
+    """Uma pergunta por linha; linhas vazias e comentários (#) são ignorados."""
+    with open(caminho, encoding="utf-8") as f:
+        return [linha.strip() for linha in f if linha.strip() and not linha.lstrip().startswith("#")]
+
+
+async def responder_lote(perguntas, respondedor, caminho_saida: str, concorrencia: int = 8,
+                         por_segundo: float = None) -> dict:
+    """
+    Responde `perguntas` com até `concorrencia` chamadas simultâneas ao LLM
+    (e no máximo `por_segundo` chamadas por segundo). Perguntas iguais em
+    andamento compartilham a mesma chamada. Cada resposta é gravada no
+    JSONL assim que fica pronta, com a latência da pergunta.
+    """
+    semaforo = asyncio.Semaphore(concorrencia)
+    limitador = LimitadorTaxa(por_segundo)
+    em_andamento = {}
+    origens = {}
+
+    async def chamar(pergunta):
+        # Agregados e cache respondem na hora; só o LLM passa pelos limites
+        resposta, origem = respondedor.rapido(pergunta)
+        if resposta is not None:
+            return resposta, origem
+        async with semaforo:
+            await limitador.aguardar()
+            return await respondedor.consultar_llm(pergunta, origem)
+
+    async def uma(indice, pergunta, saida):
+        inicio = time.perf_counter()
+        chave = normalizar_pergunta(pergunta)
+        registro = {"indice": indice, "pergunta": pergunta}
+        try:
+            if chave not in em_andamento:
+                em_andamento[chave] = asyncio.ensure_future(chamar(pergunta))
+                compartilhada = False
+            else:
+                compartilhada = True
+            resposta, origem = await asyncio.shield(em_andamento[chave])
+            if compartilhada and origem == "llm":
+                origem = "duplicada"
+            registro.update(resposta=resposta, origem=origem, erro=None)
+        except Exception as e:
+            registro.update(resposta=None, origem="erro", erro=str(e) or type(e).__name__)
+        registro["latencia_s"] = round(time.perf_counter() - inicio, 4)
+        origens[registro["origem"]] = origens.get(registro["origem"], 0) + 1
+        saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        saida.flush()
+
+    inicio = time.perf_counter()
+    with open(caminho_saida, "w", encoding="utf-8") as saida:
+        await asyncio.gather(*(uma(i, p, saida) for i, p in enumerate(perguntas)))
+    duracao = time.perf_counter() - inicio
+    return {
+        "perguntas": len(perguntas),
+        "segundos": round(duracao, 3),
+        "perguntas_por_segundo": round(len(perguntas) / duracao, 2) if duracao else None,
+        "origens": origens,
+    }
+
+
+def executar_lote_perguntas(caminho_perguntas: str, caminho_saida: str, respondedor,
+                            concorrencia: int = 8, por_segundo: float = None) -> dict:
+    perguntas = ler_perguntas(caminho_perguntas)
+    print(f"[INFO] {len(perguntas)} perguntas lidas de {caminho_perguntas}")
+    resumo = asyncio.run(responder_lote(perguntas, respondedor, caminho_saida, concorrencia, por_segundo))
+    print(f"[INFO] Respostas salvas em {caminho_saida}")
+    print("[DEBUG] Lote:", resumo)
+    print("[DEBUG] Cache de respostas:", respondedor.cache.estatisticas())
+    return resumo
@@ -1,29 +1,50 @@
-from processamento import (
-    carregar_bases,
-    consolidar_bases,
-    aplicar_regras_exclusao,
-    calcular_dias_uteis,
-    calcular_valores_vr,
-    exportar_planilha_final,
-)
+import argparse
 
-# 1) Carrega tudo
-bases = carregar_bases("dados/Desafio 4 - Dados.zip")
+import instrumentacao
+from calendario import COMPETENCIA_PADRAO, periodo_competencia
+from dag_etapas import PipelineDAG, etapas_vr
 
-# 2) Consolida ativos + admitidos
-df_base = consolidar_bases(bases)
+CAMINHO_ZIP = "dados/Desafio 4 - Dados.zip"
 
-# 3) Aplica exclusões
-df_filtrada = aplicar_regras_exclusao(bases, df_base)
 
-# 4) Calcula dias úteis
-df_dias = calcular_dias_uteis(df_filtrada, bases)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cálculo do VR mensal")
+    parser.add_argument("--competencia", default=COMPETENCIA_PADRAO,
+                        help="competência MM.AAAA (período de 15 do mês anterior a 15 do mês; nome da planilha final)")
+    parser.add_argument("--metricas", help="arquivo de métricas por etapa (tempo, CPU, memória, linhas)")
+    parser.add_argument("--formato", choices=instrumentacao.FORMATOS, default="jsonl",
+                        help="jsonl (uma linha por etapa) ou prometheus (textfile do node_exporter)")
+    parser.add_argument("--perfil", nargs="+", default=[], metavar="ETAPA",
+                        help="etapas com dump do cProfile em dados/perfis/ (ex.: calcular_dias_uteis)")
+    parser.add_argument("--sem-checkpoint", action="store_true", help="recalcula tudo sem ler nem gravar checkpoints")
+    parser.add_argument("--refazer", nargs="+", default=[], metavar="ETAPA",
+                        help="etapas recalculadas mesmo com checkpoint válido (ex.: valores final)")
+    parser.add_argument("--fatiar", choices=["sindicato", "matricula"],
+                        help="calcula dias úteis e valores por fatias num pool de processos (bases grandes)")
+    args = parser.parse_args(argv)
+    if args.metricas or args.perfil:
+        instrumentacao.configurar(args.metricas, args.formato, args.perfil)
 
-# 5) Calcula valores VR
-df_vr = calcular_valores_vr(df_dias, bases)
+    # 1) carga do ZIP → 2) consolidação → 3) exclusões → 4) dias úteis → 5) valores de VR
+    # → 6) correção (reparador) → 7) exportação. Cada saída vira um checkpoint
+    # (dag_etapas.py): etapas sem mudança nas entradas, no código ou na
+    # configuração são lidas do checkpoint em vez de recalculadas.
+    etapas = etapas_vr(CAMINHO_ZIP, f"dados/VR MENSAL {args.competencia}.xlsx", fatiar=args.fatiar,
+                       periodo=periodo_competencia(args.competencia))
+    dag = PipelineDAG(etapas,
+                      usar_checkpoints=not args.sem_checkpoint, refazer=args.refazer)
+    df_final = dag.executar()
 
-# 6) Exporta planilha final
-df_final = exportar_planilha_final(df_vr)
+    print("\n--- AMOSTRA DA PLANILHA FINAL ---")
+    print(df_final.head(20))
 
-print("\n--- AMOSTRA DA PLANILHA FINAL ---")
-print(df_final.head(20))
\ No newline at end of file
+    if instrumentacao.INSTRUMENTACAO.ativa:
+        print("\n--- MÉTRICAS POR ETAPA ---")
+        print(instrumentacao.INSTRUMENTACAO.resumo().to_string(index=False))
+        if args.metricas:
+            print(f"[INFO] Métricas salvas em {args.metricas}")
+
+
+# O pool de processos da carga reimporta este módulo nos workers (spawn)
+if __name__ == "__main__":
+    main()
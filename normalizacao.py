@@ -0,0 +1,238 @@
+import re
+import sys
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    ARROW_DISPONIVEL = True
+except ImportError:
+    ARROW_DISPONIVEL = False
+
+_NUMERO = re.compile(r"-?\d+(\.\d+)?")
+_NUMERO_EXTRACT = r"(-?\d+(?:\.\d+)?)"
+# Caracteres ASCII que str.strip() remove
+_ESPACOS_ASCII = " \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+# ========================
+# Texto
+# ========================
+def sem_acento(texto) -> str:
+    """Minúsculas e sem acentos ("São Paulo" → "sao paulo"), para comparar nomes e perguntas."""
+    texto = unicodedata.normalize("NFKD", str(texto).casefold())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+# ========================
+# Conversão célula a célula (referência)
+# ========================
+def parse_number_like(s):
+    """Tenta transformar strings numéricas com pontuação BR/EN em float.
+    Lógica robusta para pontos como milhares e vírgulas como decimais."""
+    if pd.isna(s):
+        return np.nan
+    if isinstance(s, (int, float, np.number)):
+        return float(s)
+    s = str(s).strip()
+    if s == "":
+        return np.nan
+    s = s.replace(" ", "")
+    # casos: "1.234,56" -> remove '.' e substitui ',' por '.'
+    if "." in s and "," in s:
+        if s.find(".") < s.find(","):
+            s = s.replace(".", "").replace(",", ".")
+        else:
+            s = s.replace(",", "")
+    else:
+        s = s.replace(",", ".")
+    # remove qualquer caractere que não seja dígito, sinal ou ponto
+    m = _NUMERO.search(s)
+    if not m:
+        return np.nan
+    try:
+        return float(m.group(0))
+    except:
+        return np.nan
+
+
+# ========================
+# Conversão vetorizada (coluna inteira)
+# ========================
+def mascara_numerica(serie: pd.Series, preenchido: np.ndarray = None) -> np.ndarray:
+    """Células já numéricas (int/float/np.number, como o isinstance de parse_number_like)."""
+    if preenchido is None:
+        preenchido = serie.notna().to_numpy()
+    if pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+        return preenchido
+    obj = serie.astype(object)
+    inferido = pd.api.types.infer_dtype(obj, skipna=True)
+    if inferido in ("string", "empty"):
+        return np.zeros(len(obj), dtype=bool)
+    if inferido in ("integer", "floating", "mixed-integer-float", "boolean"):
+        return preenchido
+    # Colunas mistas: resolve o isinstance uma vez por tipo distinto
+    codigos, tipos = pd.factorize(obj.map(type))
+    numericos = np.array([issubclass(t, (int, float, np.number)) for t in tipos], dtype=bool)
+    return numericos[codigos] & preenchido
+
+
+def normalizar_numeros(serie: pd.Series, retornar_nao_numericos: bool = False):
+    """
+    Mesmo resultado de `serie.apply(parse_number_like)`, com operações de
+    string sobre a coluna inteira (pyarrow.compute, ou o acessor .str do
+    pandas sem pyarrow): "1.234,56" (BR), "1,234.56" (EN) e valores simples
+    ("12,5", "R$ 30") viram float; o resto vira NaN.
+
+    Com `retornar_nao_numericos=True` devolve também quantas células
+    preenchidas não eram numéricas antes da conversão (mesma varredura).
+    """
+    if pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+        resultado = serie.astype("float64")
+        return (resultado, 0) if retornar_nao_numericos else resultado
+
+    obj = serie.astype(object)
+    preenchido = obj.notna().to_numpy()
+    numerico = mascara_numerica(obj, preenchido)
+    texto_mask = preenchido & ~numerico
+
+    resultado = np.full(len(obj), np.nan)
+    if numerico.any():
+        resultado[numerico] = obj.to_numpy()[numerico].astype("float64")
+    if texto_mask.any():
+        texto = obj[texto_mask].astype(str)
+        if ARROW_DISPONIVEL:
+            resultado[texto_mask] = _converter_texto_arrow(texto.to_numpy())
+        else:
+            resultado[texto_mask] = _converter_texto_pandas(texto)
+
+    resultado = pd.Series(resultado, index=serie.index, name=serie.name)
+    return (resultado, int(texto_mask.sum())) if retornar_nao_numericos else resultado
+
+
+def _converter_texto_pandas(texto: pd.Series) -> np.ndarray:
+    texto = texto.str.strip().str.replace(" ", "", regex=False)
+    pos_ponto = texto.str.find(".")
+    pos_virgula = texto.str.find(",")
+    ambos = (pos_ponto >= 0) & (pos_virgula >= 0)
+    br = ambos & (pos_ponto < pos_virgula)   # "1.234,56"
+    en = ambos & ~br                          # "1,234.56"
+
+    texto = texto.where(~br, texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    texto = texto.where(~en, texto.str.replace(",", "", regex=False))
+    texto = texto.where(ambos, texto.str.replace(",", ".", regex=False))
+    extraido = texto.str.extract(_NUMERO_EXTRACT, expand=False)
+    return extraido.map(float, na_action="ignore").to_numpy(dtype="float64")
+
+
+def _converter_texto_arrow(texto: np.ndarray) -> np.ndarray:
+    """Mesmas regras de _converter_texto_pandas com pyarrow.compute (kernels em C++)."""
+    arr = pa.array(texto, type=pa.string())
+    # Textos não-ASCII (espaços/dígitos Unicode) seguem a regra do Python, célula a célula
+    ascii_ = pc.string_is_ascii(arr).to_numpy(zero_copy_only=False)
+
+    arr = pc.replace_substring(pc.utf8_trim(arr, characters=_ESPACOS_ASCII), " ", "")
+    pos_ponto = pc.find_substring(arr, ".")
+    pos_virgula = pc.find_substring(arr, ",")
+    ambos = pc.and_(pc.greater_equal(pos_ponto, 0), pc.greater_equal(pos_virgula, 0))
+    br = pc.and_(ambos, pc.less(pos_ponto, pos_virgula))
+
+    arr = pc.if_else(
+        br,
+        pc.replace_substring(pc.replace_substring(arr, ".", ""), ",", "."),
+        pc.if_else(ambos, pc.replace_substring(arr, ",", ""), pc.replace_substring(arr, ",", ".")),
+    )
+    extraido = pc.struct_field(pc.extract_regex(arr, r"(?P<numero>-?\d+(?:\.\d+)?)"), [0])
+    resultado = pc.cast(extraido, pa.float64()).to_numpy(zero_copy_only=False)
+
+    if not ascii_.all():
+        resultado[~ascii_] = [parse_number_like(t) for t in texto[~ascii_]]
+    return resultado
+
+
+# ========================
+# Benchmark
+# ========================
+def _coluna_exemplo(linhas: int, semente: int = 0) -> pd.Series:
+    rng = np.random.default_rng(semente)
+    valores = rng.uniform(-5_000, 50_000, linhas).round(2)
+    formatos = rng.integers(0, 6, linhas)
+    saida = np.empty(linhas, dtype=object)
+    for i, (v, f) in enumerate(zip(valores, formatos)):
+        if f == 0:
+            saida[i] = v
+        elif f == 1:
+            saida[i] = f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")  # 1.234,56
+        elif f == 2:
+            saida[i] = f"{v:,.2f}"                                                         # 1,234.56
+        elif f == 3:
+            saida[i] = f"R$ {v:.2f}".replace(".", ",")                                     # R$ 1234,56
+        elif f == 4:
+            saida[i] = None
+        else:
+            saida[i] = "n/d"
+    return pd.Series(saida)
+
+
+def _planilha_exemplo(linhas: int) -> pd.DataFrame:
+    """Colunas como saem do read_excel: numéricas já tipadas e uma coluna mista (texto BR/EN)."""
+    rng = np.random.default_rng(1)
+    dias = rng.integers(0, 23, linhas)
+    valor = rng.choice([32.0, 33.0, 35.0, 37.5], linhas)
+    return pd.DataFrame({
+        "DIAS ÚTEIS": dias,
+        "VALOR UNITÁRIO": _coluna_exemplo(linhas),
+        "VR TOTAL": dias * valor,
+        "EMPRESA (80%)": dias * valor * 0.8,
+        "COLABORADOR (20%)": dias * valor * 0.2,
+    })
+
+
+def _converter_por_celula(df: pd.DataFrame) -> dict:
+    """O caminho anterior de try_convert_columns: dois apply por coluna."""
+    saida = {}
+    for c in df.columns:
+        nao_numericos = df[c].apply(lambda x: not pd.isna(x) and not isinstance(x, (int, float, np.number))).sum()
+        saida[c] = (df[c].apply(parse_number_like), int(nao_numericos))
+    return saida
+
+
+def _converter_vetorizado(df: pd.DataFrame) -> dict:
+    return {c: normalizar_numeros(df[c], retornar_nao_numericos=True) for c in df.columns}
+
+
+def comparar_desempenho(linhas: int = 200_000, repeticoes: int = 3) -> pd.DataFrame:
+    """
+    Tempo de conversão das colunas numéricas da planilha final pelo caminho
+    célula a célula x normalizar_numeros, conferindo que os resultados batem.
+    """
+    df = _planilha_exemplo(linhas)
+    tempos = {}
+    for nome, func in [("por_celula", _converter_por_celula), ("vetorizado", _converter_vetorizado)]:
+        melhor = float("inf")
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            resultado = func(df)
+            melhor = min(melhor, time.perf_counter() - inicio)
+        tempos[nome] = (melhor, resultado)
+
+    ref, vet = tempos["por_celula"][1], tempos["vetorizado"][1]
+    for c in df.columns:
+        iguais = np.allclose(ref[c][0].to_numpy(dtype=float), vet[c][0].to_numpy(), equal_nan=True)
+        if not iguais or ref[c][1] != vet[c][1]:
+            raise AssertionError(f"normalizar_numeros diverge de parse_number_like na coluna {c}")
+
+    return pd.DataFrame([
+        {"metodo": nome, "linhas": linhas, "colunas": df.shape[1], "segundos": round(t, 4),
+         "speedup": round(tempos["por_celula"][0] / t, 1)}
+        for nome, (t, _) in tempos.items()
+    ])
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(comparar_desempenho(linhas).to_string(index=False))
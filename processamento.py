@@ -1,12 +1,47 @@
+import numpy as np
 import pandas as pd
 import zipfile
 import os
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ausencias import colunas_intervalo, dias_uteis_perdidos, linhas_com_intervalo, montar_intervalos
+from cache_bases import gravar_no_cache, hash_conteudo, ler_do_cache
+from calendario import CalendarioUteis
+from dimensao_sindicato import UFS, montar_dimensao
+from exportacao import exportar
+from esquema import aplicar_esquema, aplicar_esquema_bases, memoria_mb
+from indice_exclusao import IndiceExclusao, descrever_motivos
+import instrumentacao
+from instrumentacao import instrumentar
+from reparador import COLUNAS_PIPELINE, reparar_valores
 
 
 # ========================
 # Carga das planilhas
 # ========================
-def carregar_bases(caminho_zip):
+ARQUIVOS_BASES = {
+    "ativos": "ATIVOS.xlsx",
+    "ferias": "FÉRIAS.xlsx",
+    "desligados": "DESLIGADOS.xlsx",
+    "admitidos": "ADMISSÃO ABRIL.xlsx",
+    "sindicato_valores": "Base sindicato x valor.xlsx",
+    "dias_uteis": "Base dias uteis.xlsx",
+    "estagio": "ESTÁGIO.xlsx",
+    "aprendiz": "APRENDIZ.xlsx",
+    "afastamentos": "AFASTAMENTOS.xlsx",
+    "exterior": "EXTERIOR.xlsx",
+}
+
+
+@instrumentar
+def carregar_bases(caminho_zip, usar_cache: bool = True):
+    """
+    Extrai o ZIP e lê as planilhas. Com `usar_cache`, cada membro é
+    identificado pelo hash do conteúdo e, se já foi lido antes, vem do
+    cache Parquet (ver cache_bases.py) em vez de passar pelo openpyxl.
+    """
     pasta_temp = "dados/temp"
     os.makedirs(pasta_temp, exist_ok=True)
 
@@ -16,89 +51,172 @@ def carregar_bases(caminho_zip):
     arquivos = os.listdir(pasta_temp)
     print("Arquivos encontrados no ZIP:", arquivos)
 
-    df_ativos = pd.read_excel(os.path.join(pasta_temp, "ATIVOS.xlsx"))
-    df_ferias = pd.read_excel(os.path.join(pasta_temp, "FÉRIAS.xlsx"))
-    df_desligados = pd.read_excel(os.path.join(pasta_temp, "DESLIGADOS.xlsx"))
-    df_admitidos = pd.read_excel(os.path.join(pasta_temp, "ADMISSÃO ABRIL.xlsx"))
-    df_sindicato_valores = pd.read_excel(os.path.join(pasta_temp, "Base sindicato x valor.xlsx"))
-    df_dias_uteis = pd.read_excel(os.path.join(pasta_temp, "Base dias uteis.xlsx"))
-    df_estagio = pd.read_excel(os.path.join(pasta_temp, "ESTÁGIO.xlsx"))
-    df_aprendiz = pd.read_excel(os.path.join(pasta_temp, "APRENDIZ.xlsx"))
-    df_afastamentos = pd.read_excel(os.path.join(pasta_temp, "AFASTAMENTOS.xlsx"))
-    df_exterior = pd.read_excel(os.path.join(pasta_temp, "EXTERIOR.xlsx"))
-
-    return {
-        "ativos": df_ativos,
-        "ferias": df_ferias,
-        "desligados": df_desligados,
-        "admitidos": df_admitidos,
-        "sindicato_valores": df_sindicato_valores,
-        "dias_uteis": df_dias_uteis,
-        "estagio": df_estagio,
-        "aprendiz": df_aprendiz,
-        "afastamentos": df_afastamentos,
-        "exterior": df_exterior,
-    }
+    bases = {}
+    acertos = 0
+    for chave, arquivo in ARQUIVOS_BASES.items():
+        caminho = os.path.join(pasta_temp, arquivo)
+        if not usar_cache:
+            bases[chave] = pd.read_excel(caminho)
+            continue
+
+        with open(caminho, "rb") as f:
+            hash_membro = hash_conteudo(f.read())
+        df = ler_do_cache(hash_membro)
+        if df is None:
+            df = pd.read_excel(caminho)
+            gravar_no_cache(hash_membro, df)
+        else:
+            acertos += 1
+        bases[chave] = df
+
+    if usar_cache:
+        print(f"[DEBUG] Cache de planilhas: {acertos}/{len(ARQUIVOS_BASES)} lidas do cache")
+    return aplicar_esquema_bases(bases)
+
+
+@instrumentar
+def ler_bases_zip(caminho_zip, chaves=None, usar_cache: bool = True) -> dict:
+    """
+    Lê, em sequência e sem extrair o ZIP, apenas as bases em `chaves`
+    (padrão: todas). Útil dentro de processos que não podem abrir outro pool.
+    """
+    chaves = list(chaves or ARQUIVOS_BASES)
+    bases = {}
+    with zipfile.ZipFile(caminho_zip, "r") as zip_ref:
+        for chave in chaves:
+            conteudo = zip_ref.read(ARQUIVOS_BASES[chave])
+            hash_membro = hash_conteudo(conteudo) if usar_cache else None
+            df = ler_do_cache(hash_membro) if usar_cache else None
+            if df is None:
+                df = pd.read_excel(io.BytesIO(conteudo))
+                if usar_cache:
+                    gravar_no_cache(hash_membro, df)
+            bases[chave] = df
+    return aplicar_esquema_bases(bases)
+
+
+def _ler_planilha_bytes(chave: str, conteudo: bytes):
+    """Worker do pool: lê uma planilha a partir dos bytes do membro do ZIP."""
+    inicio = time.perf_counter()
+    df = pd.read_excel(io.BytesIO(conteudo))
+    return chave, df, time.perf_counter() - inicio
+
+
+@instrumentar
+def carregar_bases_paralelo(caminho_zip, max_workers: int = None, usar_cache: bool = True,
+                            retornar_tempos: bool = False):
+    """
+    Versão sem extração de carregar_bases: cada membro é lido do ZipFile
+    para memória e as planilhas são lidas em paralelo num pool de processos.
+    Retorna o mesmo dicionário `bases` (e, com `retornar_tempos`, também
+    o tempo de leitura de cada planilha em segundos).
+    """
+    with zipfile.ZipFile(caminho_zip, "r") as zip_ref:
+        print("Arquivos encontrados no ZIP:", zip_ref.namelist())
+        conteudos = {chave: zip_ref.read(arquivo) for chave, arquivo in ARQUIVOS_BASES.items()}
+
+    bases = {}
+    tempos = {}
+    hashes = {}
+    pendentes = {}
+    for chave, conteudo in conteudos.items():
+        if usar_cache:
+            inicio = time.perf_counter()
+            hashes[chave] = hash_conteudo(conteudo)
+            df = ler_do_cache(hashes[chave])
+            if df is not None:
+                bases[chave] = df
+                tempos[chave] = time.perf_counter() - inicio
+                continue
+        pendentes[chave] = conteudo
+
+    if pendentes:
+        max_workers = max_workers or min(len(pendentes), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futuros = [
+                pool.submit(_ler_planilha_bytes, chave, conteudo)
+                for chave, conteudo in pendentes.items()
+            ]
+            for futuro in futuros:
+                chave, df, segundos = futuro.result()
+                bases[chave] = df
+                tempos[chave] = segundos
+                if usar_cache:
+                    gravar_no_cache(hashes[chave], df)
+
+    # Mantém a ordem de chaves de carregar_bases
+    bases = {chave: bases[chave] for chave in ARQUIVOS_BASES}
+
+    print(f"\n[DEBUG] Planilhas carregadas ({len(pendentes)} lidas do Excel, "
+          f"{len(ARQUIVOS_BASES) - len(pendentes)} do cache):")
+    for chave in ARQUIVOS_BASES:
+        origem = "excel" if chave in pendentes else "cache"
+        print(f"  {ARQUIVOS_BASES[chave]:<30} {tempos[chave]:8.3f}s  ({origem}, {len(bases[chave])} linhas)")
+
+    aplicar_esquema_bases(bases)
+    if retornar_tempos:
+        return bases, tempos
+    return bases
 
 
 # ========================
 # Consolidação
 # ========================
-def consolidar_bases(bases: dict) -> pd.DataFrame:
-    df_ativos = bases["ativos"].copy()
-    df_admitidos = bases["admitidos"].copy()
+def _padronizar_ativos(df_ativos: pd.DataFrame) -> pd.DataFrame:
+    if "DATA ADMISSAO" in df_ativos.columns:
+        df_ativos = df_ativos.rename(columns={"DATA ADMISSAO": "DATA_ADMISSAO"})
+    df_ativos["STATUS"] = "ATIVO"
+    return df_ativos
 
-    # Padroniza nomes
+
+def _padronizar_admitidos(df_admitidos: pd.DataFrame) -> pd.DataFrame:
     if "Admissão" in df_admitidos.columns:
         df_admitidos = df_admitidos.rename(
             columns={"Admissão": "DATA_ADMISSAO", "Cargo": "TITULO DO CARGO"}
         )
-    if "DATA ADMISSAO" in df_ativos.columns:
-        df_ativos = df_ativos.rename(columns={"DATA ADMISSAO": "DATA_ADMISSAO"})
-
-    df_ativos["STATUS"] = "ATIVO"
     df_admitidos["STATUS"] = "ADMITIDO"
+    return df_admitidos
 
-    df_base = pd.concat([df_ativos, df_admitidos], ignore_index=True)
 
-    print("\n[DEBUG] Base consolidada criada!")
-    print("Colunas disponíveis:", list(df_base.columns))
-    print("Total de registros:", len(df_base))
-    return df_base
+@instrumentar(linhas_entrada=lambda bases: len(bases["ativos"]) + len(bases["admitidos"]))
+def consolidar_bases(bases: dict) -> pd.DataFrame:
+    return PipelineVR(bases).consolidar().resultado()
 
 
 # ========================
 # Exclusões
 # ========================
-def aplicar_regras_exclusao(bases: dict, df_base: pd.DataFrame) -> pd.DataFrame:
-    df = df_base.copy()
-
-    def get_matriculas(df_sub):
-        if df_sub is None:
-            return set()
-        # Normaliza qualquer coluna que contenha "MATRIC"
-        df_sub = df_sub.rename(
-            columns={col: "MATRICULA" for col in df_sub.columns if "MATRIC" in col.upper()}
-        )
-        if "MATRICULA" in df_sub.columns:
-            return set(df_sub["MATRICULA"].astype(str))
-        return set()
+def _mascara_diretor(df: pd.DataFrame) -> np.ndarray:
+    return df["TITULO DO CARGO"].str.contains("DIRETOR", case=False, na=False).to_numpy()
+
+
+def _marcar_exclusoes(df: pd.DataFrame, indice: IndiceExclusao) -> np.ndarray:
+    """Máscara de motivos por linha: bases de exclusão + diretores pelo cargo."""
+    indice = indice.com_motivo("DIRETOR", df["MATRICULA"].to_numpy()[_mascara_diretor(df)])
+    return indice.mascara(df["MATRICULA"])
+
+
+def _filtrar_exclusoes(df: pd.DataFrame, indice: IndiceExclusao) -> pd.DataFrame:
+    # A indexação booleana já devolve uma cópia
+    return df[_marcar_exclusoes(df, indice) == 0]
 
-    matriculas_excluir = set()
-    matriculas_excluir |= get_matriculas(bases.get("estagio"))
-    matriculas_excluir |= get_matriculas(bases.get("aprendiz"))
-    matriculas_excluir |= get_matriculas(bases.get("afastamentos"))
-    matriculas_excluir |= get_matriculas(bases.get("exterior"))
 
-    # Diretores pelo cargo
-    mask_diretor = df["TITULO DO CARGO"].str.contains("DIRETOR", case=False, na=False)
-    matriculas_excluir |= set(df.loc[mask_diretor, "MATRICULA"].astype(str))
+@instrumentar
+def aplicar_regras_exclusao(bases: dict, df_base: pd.DataFrame) -> pd.DataFrame:
+    # Mantém o índice original das linhas, como antes
+    return PipelineVR(bases, df=df_base).aplicar_exclusoes().df
 
-    df_filtrada = df[~df["MATRICULA"].astype(str).isin(matriculas_excluir)].copy()
 
-    print(f"\n[DEBUG] Exclusões aplicadas: {len(df) - len(df_filtrada)} colaboradores removidos")
-    print("Total após exclusões:", len(df_filtrada))
-    return df_filtrada
+def auditar_exclusoes(bases: dict, df_base: pd.DataFrame) -> pd.DataFrame:
+    """
+    Linhas removidas por aplicar_regras_exclusao, com a máscara de bits
+    MOTIVO_EXCLUSAO e sua tradução em MOTIVOS (ex.: 'ESTAGIO|DIRETOR').
+    """
+    mascara = _marcar_exclusoes(df_base, IndiceExclusao.das_bases(bases))
+    df_excluidos = df_base[mascara != 0].copy()
+    df_excluidos["MOTIVO_EXCLUSAO"] = mascara[mascara != 0]
+    df_excluidos["MOTIVOS"] = descrever_motivos(df_excluidos["MOTIVO_EXCLUSAO"])
+    return df_excluidos
 
 
 # ========================
@@ -123,107 +241,32 @@ def _preparar_dias_uteis(df_dias_raw: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def calcular_dias_uteis(df_base: pd.DataFrame, bases: dict) -> pd.DataFrame:
+@instrumentar
+def calcular_dias_uteis(df_base: pd.DataFrame, bases: dict, calendario=None, periodo=None) -> pd.DataFrame:
     """
     Calcula os dias úteis de VR por colaborador considerando:
     - Dias úteis do sindicato
     - Férias
     - Admissão (proporcional)
     - Desligamento (regra do dia 15 com comunicado 'OK', senão proporcional)
-    """
-    df = df_base.copy()
-
-    # --- Dias úteis por sindicato ---
-    df_dias = _preparar_dias_uteis(bases["dias_uteis"])
-    df = df.merge(df_dias, on="Sindicato", how="left")
-
-    # --- Férias ---
-    df_ferias = bases["ferias"].copy()
-    df_ferias = df_ferias.rename(
-        columns={col: "MATRICULA" for col in df_ferias.columns if "MATRIC" in col.upper()}
-    )
-    ferias_col = next(
-        (c for c in df_ferias.columns if "FÉRIA" in c.upper() or "FERIA" in c.upper()), None
-    )
-    if ferias_col:
-        df_ferias = df_ferias[["MATRICULA", ferias_col]].rename(columns={ferias_col: "FERIAS"})
-        df = df.merge(df_ferias, on="MATRICULA", how="left")
-    if "FERIAS" not in df.columns:
-        df["FERIAS"] = 0
-    df["FERIAS"] = pd.to_numeric(df["FERIAS"], errors="coerce").fillna(0)
-
-    # --- Desligados ---
-    df_desl = bases["desligados"].copy()
-    df_desl = df_desl.rename(
-        columns={col: "MATRICULA" for col in df_desl.columns if "MATRIC" in col.upper()}
-    )
-    dem_col = next((c for c in df_desl.columns if "DEMI" in c.upper()), None)
-    com_col = next((c for c in df_desl.columns if "COMUNICADO" in c.upper()), None)
 
-    if dem_col:
-        df_desl = df_desl.rename(columns={dem_col: "DATA_DEMISSAO"})
-    else:
-        df_desl["DATA_DEMISSAO"] = pd.NaT
+    Com um `calendario` (calendario.CalendarioUteis), os dias úteis deixam de
+    vir da "Base dias uteis" e de fatores proporcionais: são contados
+    exatamente entre a admissão e o desligamento de cada colaborador,
+    com os feriados do sindicato/UF. `periodo` (início, fim) é o período da
+    competência (calendario.periodo_competencia) em que as ausências com
+    datas são contadas quando não há `calendario`; padrão 15/04 a 15/05/2025.
+    """
+    return PipelineVR(bases, calendario, df=df_base.copy(), periodo=periodo).calcular_dias().resultado()
 
-    if com_col:
-        df_desl = df_desl.rename(columns={com_col: "COMUNICADO_DE_DESLIGAMENTO"})
-    else:
-        df_desl["COMUNICADO_DE_DESLIGAMENTO"] = pd.NA
-
-    # Mantém apenas o necessário
-    if "MATRICULA" in df_desl.columns:
-        df = df.merge(
-            df_desl[["MATRICULA", "DATA_DEMISSAO", "COMUNICADO_DE_DESLIGAMENTO"]],
-            on="MATRICULA",
-            how="left",
-        )
 
-    # Garante colunas mesmo se não houver merge
-    if "DATA_DEMISSAO" not in df.columns:
-        df["DATA_DEMISSAO"] = pd.NaT
-    if "COMUNICADO_DE_DESLIGAMENTO" not in df.columns:
-        df["COMUNICADO_DE_DESLIGAMENTO"] = pd.NA
-
-    # --- Cálculo base: dias sindicato - férias ---
-    df["DIAS_UTEIS"] = pd.to_numeric(df["DIAS_UTEIS"], errors="coerce").fillna(0)
-    df["DIAS_CALCULADOS"] = (df["DIAS_UTEIS"] - df["FERIAS"]).clip(lower=0)
-
-    # --- Admissão (proporção do mês) ---
-    if "DATA_ADMISSAO" in df.columns:
-        df["DATA_ADMISSAO"] = pd.to_datetime(df["DATA_ADMISSAO"], errors="coerce")
-        # Proporcional apenas para quem é ADMITIDO e tem data válida
-        mask_adm = (df["STATUS"] == "ADMITIDO") & df["DATA_ADMISSAO"].notna()
-        dias_mes_adm = df.loc[mask_adm, "DATA_ADMISSAO"].dt.days_in_month
-        fator_adm = (dias_mes_adm - df.loc[mask_adm, "DATA_ADMISSAO"].dt.day + 1) / dias_mes_adm
-        df.loc[mask_adm, "DIAS_CALCULADOS"] = (df.loc[mask_adm, "DIAS_CALCULADOS"] * fator_adm).round()
-
-    # --- Desligamento ---
-    df["DATA_DEMISSAO"] = pd.to_datetime(df["DATA_DEMISSAO"], errors="coerce")
-    df["COMUNICADO_DE_DESLIGAMENTO"] = df["COMUNICADO_DE_DESLIGAMENTO"].astype(str)
-
-    mask_desl = df["DATA_DEMISSAO"].notna()
-    dias_mes_desl = df.loc[mask_desl, "DATA_DEMISSAO"].dt.days_in_month
-    dia_desl = df.loc[mask_desl, "DATA_DEMISSAO"].dt.day
-
-    # Comunicação OK até dia 15 => zera
-    mask_ok15 = mask_desl & (dia_desl <= 15) & (df.loc[mask_desl, "COMUNICADO_DE_DESLIGAMENTO"].str.upper() == "OK")
-    df.loc[mask_ok15, "DIAS_CALCULADOS"] = 0
-
-    # Senão, proporcional até o dia do desligamento
-    mask_prop = mask_desl & ~mask_ok15
-    fator_desl = (dia_desl / dias_mes_desl)
-    df.loc[mask_prop, "DIAS_CALCULADOS"] = (df.loc[mask_prop, "DIAS_CALCULADOS"] * fator_desl).round()
-
-    # Sanitiza
-    df["DIAS_CALCULADOS"] = pd.to_numeric(df["DIAS_CALCULADOS"], errors="coerce").fillna(0).astype(int)
-
-    print("\n[DEBUG] Dias úteis calculados!")
-    return df
+# As 27 UFs (ver dimensao_sindicato.py)
+MAP_ESTADO = UFS
 
-def calcular_valores_vr(df_base: pd.DataFrame, bases: dict) -> pd.DataFrame:
-    df = df_base.copy()
 
-    df_valores = bases["sindicato_valores"].copy()
+def _preparar_valores(df_valores_raw: pd.DataFrame) -> pd.DataFrame:
+    """Deixa a 'Base sindicato x valor' no formato: ESTADO | VR_VALOR."""
+    df_valores = df_valores_raw.copy()
     df_valores = df_valores.rename(
         columns={col: "ESTADO" for col in df_valores.columns if "ESTADO" in col.upper()}
     )
@@ -232,34 +275,290 @@ def calcular_valores_vr(df_base: pd.DataFrame, bases: dict) -> pd.DataFrame:
         df_valores = df_valores.rename(columns={val_col: "VR_VALOR"})
     else:
         df_valores["VR_VALOR"] = 0
+    return df_valores
 
-    # Extrair UF do sindicato
-    df["UF"] = df["Sindicato"].str.extract(r"\b(SP|RS|RJ|PR)\b", expand=False)
 
-    # Mapear para nomes completos
-    map_estado = {
-        "SP": "São Paulo",
-        "RJ": "Rio de Janeiro",
-        "RS": "Rio Grande do Sul",
-        "PR": "Paraná"
-    }
-    df["ESTADO"] = df["UF"].map(map_estado)
+def montar_dimensao_sindicatos(nomes, bases: dict, config: dict = None) -> pd.DataFrame:
+    """
+    Dimensão de sindicatos (UF, ESTADO, VR_VALOR, DIAS_UTEIS) para os nomes
+    em `nomes`, a partir da "Base sindicato x valor" e da "Base dias uteis".
+    """
+    df_valores = _preparar_valores(bases["sindicato_valores"])
+    df_dias = _preparar_dias_uteis(bases["dias_uteis"])
+    return montar_dimensao(
+        nomes,
+        df_valores.set_index("ESTADO")["VR_VALOR"],
+        df_dias.set_index("Sindicato")["DIAS_UTEIS"],
+        config,
+    )
 
-    # Merge
-    df = df.merge(df_valores[["ESTADO", "VR_VALOR"]], on="ESTADO", how="left")
 
-    # Cálculos finais
-    df["VR_TOTAL"] = df["DIAS_CALCULADOS"] * df["VR_VALOR"]
-    df["VR_EMPRESA"] = (df["VR_TOTAL"] * 0.8).round(2)
-    df["VR_COLABORADOR"] = (df["VR_TOTAL"] * 0.2).round(2)
+@instrumentar
+def calcular_valores_vr(df_base: pd.DataFrame, bases: dict) -> pd.DataFrame:
+    return PipelineVR(bases, df=df_base.copy()).calcular_valores().resultado()
+
+
+@instrumentar
+def reparar_valores_vr(df_vr: pd.DataFrame) -> pd.DataFrame:
+    """Regras do reparador.py aplicadas em memória, antes da exportação."""
+    return PipelineVR({}, df=df_vr.copy()).reparar().resultado()
 
-    print("\n[DEBUG] Valores de VR calculados!")
-    return df
 
-def exportar_planilha_final(df_vr: pd.DataFrame, caminho_saida: str = "dados/VR MENSAL 05.2025.xlsx"):
+# ========================
+# Pipeline (frame único)
+# ========================
+def _buscar(chaves, tabela: pd.Series) -> np.ndarray:
+    """
+    Lookup indexado equivalente a um merge left com chave única: devolve,
+    na ordem de `chaves`, o valor de `tabela` (NaN/NaT onde não há chave).
+    Chaves repetidas na tabela valem pela primeira ocorrência.
+    """
+    tabela = tabela[~tabela.index.duplicated()]
+    if isinstance(getattr(chaves, "dtype", None), pd.CategoricalDtype):
+        # Resolve uma vez por categoria e espalha pelos códigos
+        codigos = chaves.cat.codes.to_numpy()
+        pos_categoria = tabela.index.get_indexer(chaves.cat.categories)
+        pos = np.where(codigos >= 0, pos_categoria[codigos], -1)
+    else:
+        pos = tabela.index.get_indexer(chaves)
+    return tabela.reset_index(drop=True).reindex(pos).to_numpy()
+
+
+def _relatar_memoria(df: pd.DataFrame):
+    """Footprint do frame (varre as colunas de texto): só com a instrumentação ativa."""
+    if instrumentacao.INSTRUMENTACAO.ativa:
+        print(f"Memória: {memoria_mb(df):.2f} MB")
+
+
+class PipelineVR:
+    """
+    Executa consolidação → exclusões → dias úteis → valores de VR sobre um
+    único DataFrame indexado por MATRICULA. As tabelas de referência
+    (dias úteis, férias, desligados, valores) entram por lookups indexados
+    em vez de merges, e as colunas novas são gravadas no próprio frame,
+    evitando as cópias intermediárias de cada etapa.
+
+        df_vr = PipelineVR(bases).executar()
+    """
+
+    def __init__(self, bases: dict, calendario=None, df: pd.DataFrame = None, periodo=None):
+        self.bases = bases
+        self.calendario = calendario
+        self.periodo = periodo
+        self.df = df
+        self._dim = None
+
+    def _indexar(self):
+        self.df.index = pd.Index(self.df["MATRICULA"].to_numpy(), name=None)
+
+    def _dimensao(self) -> pd.DataFrame:
+        """Dimensão de sindicatos montada uma vez, sobre as categorias de Sindicato do frame."""
+        if self._dim is None:
+            sindicatos = self.df["Sindicato"]
+            if isinstance(sindicatos.dtype, pd.CategoricalDtype):
+                nomes = sindicatos.cat.categories
+            else:
+                nomes = sindicatos.unique()
+            self._dim = montar_dimensao_sindicatos(nomes, self.bases)
+        return self._dim
+
+    def resultado(self) -> pd.DataFrame:
+        """O frame atual com índice posicional (layout das funções do módulo)."""
+        return self.df.set_axis(pd.RangeIndex(len(self.df)), axis=0, copy=False)
+
+    def executar(self) -> pd.DataFrame:
+        return self.consolidar().aplicar_exclusoes().calcular_dias().calcular_valores().reparar().resultado()
+
+    # --- Consolidação ---
+    def consolidar(self):
+        df_ativos = self.bases["ativos"]
+        df_admitidos = self.bases["admitidos"]
+
+        # Padroniza nomes (rename sem copiar os dados)
+        if "DATA ADMISSAO" in df_ativos.columns:
+            df_ativos = df_ativos.rename(columns={"DATA ADMISSAO": "DATA_ADMISSAO"}, copy=False)
+        if "Admissão" in df_admitidos.columns:
+            df_admitidos = df_admitidos.rename(
+                columns={"Admissão": "DATA_ADMISSAO", "Cargo": "TITULO DO CARGO"}, copy=False
+            )
+
+        # Única cópia da etapa: o concat. STATUS entra na mesma posição de antes
+        df = pd.concat([df_ativos, df_admitidos], ignore_index=True)
+        status = np.repeat(["ATIVO", "ADMITIDO"], [len(df_ativos), len(df_admitidos)])
+        df.insert(len(df_ativos.columns), "STATUS", status)
+
+        # O concat perde as categorias (conjuntos diferentes em cada base); reaplica o esquema
+        self.df = aplicar_esquema(df)
+
+        print("\n[DEBUG] Base consolidada criada!")
+        print("Colunas disponíveis:", list(self.df.columns))
+        print("Total de registros:", len(self.df))
+        _relatar_memoria(self.df)
+        return self
+
+    # --- Exclusões ---
+    def aplicar_exclusoes(self):
+        total = len(self.df)
+        self.df = _filtrar_exclusoes(self.df, IndiceExclusao.das_bases(self.bases))
+
+        print(f"\n[DEBUG] Exclusões aplicadas: {total - len(self.df)} colaboradores removidos")
+        print("Total após exclusões:", len(self.df))
+        _relatar_memoria(self.df)
+        return self
+
+    # --- Dias úteis ---
+    def calcular_dias(self):
+        """Mesmas regras de calcular_dias_uteis, gravando as colunas no frame."""
+        bases = self.bases
+        calendario = self.calendario
+        self._indexar()
+        df = self.df
+
+        # --- Dias úteis por sindicato (pela dimensão, uma vez por categoria) ---
+        df["DIAS_UTEIS"] = _buscar(df["Sindicato"], self._dimensao()["DIAS_UTEIS"])
+
+        # --- Férias ---
+        df_ferias = bases["ferias"].rename(
+            columns={col: "MATRICULA" for col in bases["ferias"].columns if "MATRIC" in col.upper()}
+        )
+        colunas_datas = colunas_intervalo(df_ferias)[:2]
+        ferias_col = next(
+            (c for c in df_ferias.columns
+             if ("FÉRIA" in c.upper() or "FERIA" in c.upper()) and c not in colunas_datas),
+            None,
+        )
+        # Linhas com início/fim de férias entram pelo motor de intervalos (ausencias.py);
+        # as que só têm a contagem de dias continuam descontando o número informado
+        # (várias linhas da mesma MATRICULA são somadas)
+        intervalos = montar_intervalos(bases)
+        if ferias_col and "MATRICULA" in df_ferias.columns:
+            df_ferias = df_ferias.loc[~linhas_com_intervalo(df_ferias)]
+            dias_ferias = (
+                pd.to_numeric(df_ferias[ferias_col], errors="coerce")
+                .groupby(df_ferias["MATRICULA"].to_numpy()).sum()
+            )
+            df["FERIAS"] = _buscar(df.index, dias_ferias)
+        else:
+            df["FERIAS"] = 0
+        df["FERIAS"] = pd.to_numeric(df["FERIAS"], errors="coerce").fillna(0)
+
+        # --- Desligados ---
+        df_desl = bases["desligados"].rename(
+            columns={col: "MATRICULA" for col in bases["desligados"].columns if "MATRIC" in col.upper()}
+        )
+        dem_col = next((c for c in df_desl.columns if "DEMI" in c.upper()), None)
+        com_col = next((c for c in df_desl.columns if "COMUNICADO" in c.upper()), None)
+
+        if "MATRICULA" in df_desl.columns:
+            df_desl = df_desl.set_index("MATRICULA")
+            df["DATA_DEMISSAO"] = _buscar(df.index, df_desl[dem_col]) if dem_col else pd.NaT
+            df["COMUNICADO_DE_DESLIGAMENTO"] = _buscar(df.index, df_desl[com_col]) if com_col else pd.NA
+        else:
+            # Garante colunas mesmo sem desligados
+            df["DATA_DEMISSAO"] = pd.NaT
+            df["COMUNICADO_DE_DESLIGAMENTO"] = pd.NA
+
+        df["DATA_DEMISSAO"] = pd.to_datetime(df["DATA_DEMISSAO"], errors="coerce")
+        df["COMUNICADO_DE_DESLIGAMENTO"] = df["COMUNICADO_DE_DESLIGAMENTO"].astype(str)
+        if "DATA_ADMISSAO" in df.columns:
+            df["DATA_ADMISSAO"] = pd.to_datetime(df["DATA_ADMISSAO"], errors="coerce")
+            # Admissão só conta para quem é ADMITIDO e tem data válida
+            mask_adm = ((df["STATUS"] == "ADMITIDO") & df["DATA_ADMISSAO"].notna()).to_numpy()
+        else:
+            mask_adm = np.zeros(len(df), dtype=bool)
+
+        mask_desl = df["DATA_DEMISSAO"].notna().to_numpy()
+        dia_desl = df["DATA_DEMISSAO"].dt.day.to_numpy()
+        # Comunicação OK até dia 15 => zera
+        comunicado_ok = (df["COMUNICADO_DE_DESLIGAMENTO"].str.upper() == "OK").to_numpy()
+        mask_ok15 = mask_desl & (dia_desl <= 15) & comunicado_ok
+
+        inicio = df["DATA_ADMISSAO"].where(mask_adm) if "DATA_ADMISSAO" in df.columns else None
+
+        # --- Ausências com datas: dias úteis perdidos dentro do período ---
+        descontos = df["FERIAS"].to_numpy()
+        if not intervalos.empty:
+            calendario_ausencias = calendario
+            if calendario_ausencias is None:
+                # Sem calendário, as ausências são contadas no período da competência
+                calendario_ausencias = CalendarioUteis(*self.periodo) if self.periodo else CalendarioUteis()
+            # Só os dias dentro de [admissão, desligamento]: os de fora não podem ser descontados
+            df["DIAS_AUSENCIA"] = dias_uteis_perdidos(df, intervalos, calendario_ausencias, inicio,
+                                                      df["DATA_DEMISSAO"])
+            descontos = descontos + df["DIAS_AUSENCIA"].to_numpy()
+
+        if calendario is not None:
+            # --- Dias úteis exatos na janela [admissão, desligamento] ---
+            df["DIAS_UTEIS"] = calendario.contar(df["Sindicato"])
+            dias_janela = calendario.contar(df["Sindicato"], inicio, df["DATA_DEMISSAO"])
+            dias = np.clip(dias_janela - descontos, 0, None).astype(float)
+            dias[mask_ok15] = 0
+        else:
+            # --- Cálculo base: dias sindicato - férias ---
+            df["DIAS_UTEIS"] = pd.to_numeric(df["DIAS_UTEIS"], errors="coerce").fillna(0)
+            dias = np.clip(df["DIAS_UTEIS"].to_numpy() - descontos, 0, None).astype(float)
+
+            # --- Admissão (proporção do mês) ---
+            if mask_adm.any():
+                data_adm = df["DATA_ADMISSAO"]
+                dias_mes_adm = data_adm.dt.days_in_month.to_numpy()
+                fator_adm = (dias_mes_adm - data_adm.dt.day.to_numpy() + 1) / dias_mes_adm
+                dias[mask_adm] = np.round(dias[mask_adm] * fator_adm[mask_adm])
+
+            # --- Desligamento ---
+            dias[mask_ok15] = 0
+
+            # Senão, proporcional até o dia do desligamento
+            mask_prop = mask_desl & ~mask_ok15
+            fator_desl = dia_desl / df["DATA_DEMISSAO"].dt.days_in_month.to_numpy()
+            dias[mask_prop] = np.round(dias[mask_prop] * fator_desl[mask_prop])
+
+        # Sanitiza
+        df["DIAS_CALCULADOS"] = np.nan_to_num(dias, nan=0).astype(int)
+
+        aplicar_esquema(df)
+
+        print("\n[DEBUG] Dias úteis calculados!")
+        _relatar_memoria(df)
+        return self
+
+    # --- Valores de VR ---
+    def calcular_valores(self):
+        self._indexar()
+        df = self.df
+
+        # UF, estado e valor diário vêm da dimensão de sindicatos, resolvidos
+        # uma vez por categoria de Sindicato e espalhados pelos códigos
+        dim = self._dimensao()
+        df["UF"] = _buscar(df["Sindicato"], dim["UF"])
+        df["ESTADO"] = _buscar(df["Sindicato"], dim["ESTADO"])
+        df["VR_VALOR"] = _buscar(df["Sindicato"], dim["VR_VALOR"])
+
+        # Cálculos finais
+        df["VR_TOTAL"] = df["DIAS_CALCULADOS"] * df["VR_VALOR"]
+        df["VR_EMPRESA"] = (df["VR_TOTAL"] * 0.8).round(2)
+        df["VR_COLABORADOR"] = (df["VR_TOTAL"] * 0.2).round(2)
+
+        aplicar_esquema(df)
+
+        print("\n[DEBUG] Valores de VR calculados!")
+        _relatar_memoria(df)
+        return self
+
+    # --- Correções (antes feitas pelo reparador.py sobre o xlsx exportado) ---
+    def reparar(self):
+        reparar_valores(self.df, COLUNAS_PIPELINE)
+        print("\n[DEBUG] Valores de VR reparados!")
+        return self
+
+
+@instrumentar
+def exportar_planilha_final(df_vr: pd.DataFrame, caminho_saida: str = "dados/VR MENSAL 05.2025.xlsx",
+                            formatos_extras=()):
     """
     Exporta a base final no layout esperado da planilha 'VR MENSAL 05.2025'.
     Esse já é o nome obrigatório da entrega.
+    `formatos_extras` (ex.: ("parquet", "csv")) grava cópias ao lado do xlsx.
     """
     df_final = pd.DataFrame({
         "MATRICULA": df_vr["MATRICULA"],
@@ -272,7 +571,7 @@ def exportar_planilha_final(df_vr: pd.DataFrame, caminho_saida: str = "dados/VR
         "COLABORADOR (20%)": df_vr["VR_COLABORADOR"],
     })
 
-    # Salvar diretamente no nome exigido
-    df_final.to_excel(caminho_saida, index=False)
-    print(f"\n[DEBUG] Planilha final exportada para: {caminho_saida}")
+    # Salvar diretamente no nome exigido (escrita em streaming, ver exportacao.py)
+    caminhos = exportar(df_final, caminho_saida, formatos_extras)
+    print(f"\n[DEBUG] Planilha final exportada para: {', '.join(caminhos)}")
     return df_final
\ No newline at end of file
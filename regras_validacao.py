@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+
+# ========================
+# Regras de validação da planilha final
+# ========================
+# Cada regra é declarada uma vez: nome, tipo (chave de VERIFICACOES) e as
+# colunas que usa. avaliar_regras roda todas numa passada e devolve a
+# matriz de violações (linha x regra).
+TOLERANCIA_CENTAVOS = 0.02  # arredondamentos de 80%/20% e do total em centavos
+
+
+def localizar_colunas(colunas) -> dict:
+    """Colunas da planilha final por papel (None quando ausente)."""
+    def achar(cond):
+        return next((c for c in colunas if cond(str(c).upper())), None)
+
+    return {
+        "matricula": achar(lambda c: "MATRIC" in c),
+        "dias": achar(lambda c: c in ["DIAS ÚTEIS", "DIAS UTEIS", "DIAS_UTEIS"]),
+        "valor": achar(lambda c: "VALOR" in c and "UNIT" in c),
+        "total": achar(lambda c: "VR TOTAL" in c or "VR_TOTAL" in c),
+        "empresa": achar(lambda c: "EMPRESA" in c and "80" in c),
+        "colaborador": achar(lambda c: "COLABORADOR" in c and "20" in c),
+    }
+
+
+def montar_regras(essenciais, numericas, papeis: dict) -> list:
+    """Nulos nas essenciais, negativos nas numéricas e consistência dos totais."""
+    regras = [{"nome": f"nulo:{c}", "tipo": "nulo", "colunas": [c]} for c in essenciais]
+    regras += [{"nome": f"negativo:{c}", "tipo": "negativo", "colunas": [c]} for c in numericas]
+    if papeis.get("total") and papeis.get("dias") and papeis.get("valor"):
+        regras.append({
+            "nome": "total=dias*valor",
+            "tipo": "produto",
+            "colunas": [papeis["total"], papeis["dias"], papeis["valor"]],
+        })
+    if papeis.get("total") and papeis.get("empresa") and papeis.get("colaborador"):
+        regras.append({
+            "nome": "empresa+colaborador=total",
+            "tipo": "soma",
+            "colunas": [papeis["total"], papeis["empresa"], papeis["colaborador"]],
+        })
+    return regras
+
+
+def _preenchidos(*arrays) -> np.ndarray:
+    return np.logical_and.reduce([~pd.isna(a) for a in arrays])
+
+
+def _diferente(a, b) -> np.ndarray:
+    """a != b além da tolerância, só onde ambos estão preenchidos (nulos têm regra própria)."""
+    a = np.asarray(a, dtype="float64")
+    b = np.asarray(b, dtype="float64")
+    return _preenchidos(a, b) & (np.abs(a - b) > TOLERANCIA_CENTAVOS)
+
+
+VERIFICACOES = {
+    "nulo": lambda x: pd.isna(x),
+    "negativo": lambda x: _preenchidos(x) & (x < 0),
+    "produto": lambda total, dias, valor: _diferente(total, np.asarray(dias, dtype="float64") * np.asarray(valor, dtype="float64")),
+    "soma": lambda total, empresa, colab: _diferente(total, np.asarray(empresa, dtype="float64") + np.asarray(colab, dtype="float64")),
+}
+
+
+def avaliar_regras(df: pd.DataFrame, regras: list):
+    """
+    Avalia todas as regras sobre `df` numa passada vetorizada.
+    Retorna (violacoes, erros): `violacoes` é um DataFrame booleano
+    (índice de `df`, uma coluna por regra) e `erros` traz as regras que não
+    puderam ser avaliadas (coluna ausente ou tipo não comparável).
+    """
+    valores = {}  # cada coluna é extraída uma única vez, mesmo usada por várias regras
+    matriz = np.zeros((len(df), len(regras)), dtype=bool)
+    erros = {}
+    for j, regra in enumerate(regras):
+        try:
+            args = []
+            for c in regra["colunas"]:
+                if c not in valores:
+                    valores[c] = df[c].to_numpy()
+                args.append(valores[c])
+            matriz[:, j] = VERIFICACOES[regra["tipo"]](*args)
+        except Exception as e:
+            erros[regra["nome"]] = str(e) or type(e).__name__
+    violacoes = pd.DataFrame(matriz, index=df.index, columns=[r["nome"] for r in regras])
+    return violacoes, erros
@@ -1,46 +1,70 @@
 import pandas as pd
 import os
 
-# Arquivos
+from exportacao import escrever_xlsx
+
+# Arquivos (uso avulso, para planilhas antigas já exportadas)
 entrada = "dados/VR_MENSAL_CALCULADO.xlsx"
 saida_corrigida = "dados/VR MENSAL 05.2025.xlsx"
 
-print("[INFO] Carregando planilha gerada pelo processamento...")
-df = pd.read_excel(entrada)
-print(f"[DEBUG] Planilha carregada com {len(df)} registros e {len(df.columns)} colunas.")
-
-# ====== 1. Mapear valores padrão por UF ======
-map_valor_padrao = {
-    "SP": 37.5,
-    "RS": 35.0,
-    "RJ": 33.0,
-    "PR": 32.0
+# Nomes das colunas no layout final e no frame do pipeline (processamento.PipelineVR)
+COLUNAS_PLANILHA = {
+    "dias": "DIAS ÚTEIS",
+    "valor": "VALOR UNITÁRIO",
+    "total": "VR TOTAL",
+    "empresa": "EMPRESA (80%)",
+    "colaborador": "COLABORADOR (20%)",
 }
+COLUNAS_PIPELINE = {
+    "dias": "DIAS_CALCULADOS",
+    "valor": "VR_VALOR",
+    "total": "VR_TOTAL",
+    "empresa": "VR_EMPRESA",
+    "colaborador": "VR_COLABORADOR",
+}
+
+
+def reparar_valores(df: pd.DataFrame, colunas: dict = COLUNAS_PLANILHA) -> pd.DataFrame:
+    """
+    Regras de correção da planilha final, aplicadas no próprio `df`:
+    VALOR UNITÁRIO nulo recebe o valor mais comum, VR TOTAL / 80% / 20% são
+    recalculados e nenhum valor fica negativo. `colunas` indica os nomes
+    usados (layout final ou colunas internas do pipeline).
+    """
+    dias, valor = colunas["dias"], colunas["valor"]
+    total, empresa, colaborador = colunas["total"], colunas["empresa"], colunas["colaborador"]
+
+    # ====== 1. Preencher VALOR UNITÁRIO ======
+    moda = df[valor].mode()
+    if len(moda):
+        df[valor] = df[valor].fillna(moda[0])   # preenche nulos com valor mais comum
+    df[valor] = df[valor].round(2)
+
+    # ====== 2. Recalcular valores ======
+    df[total] = (df[dias].fillna(0) * df[valor]).round(2)
+    df[empresa] = (df[total] * 0.8).round(2)
+    df[colaborador] = (df[total] * 0.2).round(2)
+
+    # ====== 3. Garantir que não existam negativos ======
+    for col in [dias, valor, total, empresa, colaborador]:
+        df[col] = df[col].clip(lower=0)
+    return df
+
+
+def main():
+    print("[INFO] Carregando planilha gerada pelo processamento...")
+    df = pd.read_excel(entrada)
+    print(f"[DEBUG] Planilha carregada com {len(df)} registros e {len(df.columns)} colunas.")
+
+    reparar_valores(df)
+
+    # ====== 4. Salvar no formato exigido ======
+    escrever_xlsx(df, saida_corrigida)
+
+    print(f"[INFO] Planilha corrigida salva em: {saida_corrigida}")
+    print("Registros:", len(df))
+    print("Total VR:", df["VR TOTAL"].sum())
+
 
-# Extrair UF a partir do sindicato
-df["UF"] = df["SINDICATO"].str.extract(r"\b(SP|RS|RJ|PR)\b", expand=False)
-
-# ====== 2. Preencher VALOR UNITÁRIO ======
-# Usa valor existente, senão tenta usar VR_VALOR, senão usa o padrão da UF
-df["VALOR UNITÁRIO"] = (
-    df["VALOR UNITÁRIO"]
-    .fillna(df["VALOR UNITÁRIO"].mode()[0])   # preenche nulos com valor mais comum
-    .round(2)
-)
-
-# ====== 3. Recalcular valores ======
-df["VR TOTAL"] = (df["DIAS ÚTEIS"].fillna(0) * df["VALOR UNITÁRIO"]).round(2)
-df["EMPRESA (80%)"] = (df["VR TOTAL"] * 0.8).round(2)
-df["COLABORADOR (20%)"] = (df["VR TOTAL"] * 0.2).round(2)
-
-# ====== 4. Garantir que não existam negativos ======
-for col in ["DIAS ÚTEIS", "VALOR UNITÁRIO", "VR TOTAL", "EMPRESA (80%)", "COLABORADOR (20%)"]:
-    df[col] = df[col].clip(lower=0)
-
-# ====== 5. Salvar no formato exigido ======
-df = df.drop(columns=["UF"], errors="ignore")  # coluna auxiliar não entra na planilha final
-df.to_excel(saida_corrigida, index=False)
-
-print(f"[INFO] Planilha corrigida salva em: {saida_corrigida}")
-print("Registros:", len(df))
-print("Total VR:", df["VR TOTAL"].sum())
+if __name__ == "__main__":
+    main()
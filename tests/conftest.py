@@ -0,0 +1,65 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+# Os módulos do projeto ficam na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gerador_sintetico import gerar_zip  # noqa: E402
+from processamento import (  # noqa: E402
+    aplicar_regras_exclusao,
+    calcular_dias_uteis,
+    calcular_valores_vr,
+    carregar_bases,
+    consolidar_bases,
+    exportar_planilha_final,
+    reparar_valores_vr,
+)
+
+# Base sintética dos testes: 300 ativos, semente 0, com afastamentos/férias datados
+HEADCOUNT = 300
+SEMENTE = 0
+
+
+@pytest.fixture(scope="session")
+def pasta_testes(tmp_path_factory):
+    """Pasta de trabalho da sessão: o fluxo grava em dados/ relativo ao diretório atual."""
+    pasta = tmp_path_factory.mktemp("vr")
+    anterior = os.getcwd()
+    os.chdir(pasta)
+    yield pasta
+    os.chdir(anterior)
+
+
+@pytest.fixture(scope="session")
+def caminho_zip(pasta_testes):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return gerar_zip(str(pasta_testes / "sintetico.zip"), HEADCOUNT, semente=SEMENTE, com_intervalos=True)
+
+
+@pytest.fixture(scope="session")
+def bases(caminho_zip):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return carregar_bases(caminho_zip, usar_cache=False)
+
+
+@pytest.fixture(scope="session")
+def df_filtrada(bases):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return aplicar_regras_exclusao(bases, consolidar_bases(bases))
+
+
+@pytest.fixture(scope="session")
+def df_vr(bases, df_filtrada):
+    """Saída do fluxo sequencial (main.py sem --fatiar), já reparada."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return reparar_valores_vr(calcular_valores_vr(calcular_dias_uteis(df_filtrada, bases), bases))
+
+
+@pytest.fixture(scope="session")
+def df_final(df_vr, pasta_testes):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return exportar_planilha_final(df_vr, str(pasta_testes / "VR MENSAL sequencial.xlsx"))
@@ -0,0 +1,31 @@
+from agente import Respondedor
+from cache_respostas import CacheRespostas
+from lote_perguntas import LLMFalso
+
+
+def test_agente_so_e_criado_na_primeira_pergunta_ao_llm(df_final, tmp_path):
+    criados = []
+
+    def fabrica(cubo):
+        criados.append(cubo)
+        return LLMFalso(latencia=0)
+
+    respondedor = Respondedor(df_final, cache=CacheRespostas(str(tmp_path)), backend="falso",
+                              fabrica_agente=fabrica)
+    assert respondedor.responder("Qual o total de VR?")[1] == "agregados"
+    assert not respondedor.agente_criado and criados == []
+
+    assert respondedor.responder("Por que a matrícula 10000 recebeu menos?")[1] == "llm"
+    assert respondedor.responder("Por que a matrícula 10000 recebeu menos?")[1] == "cache"
+    assert respondedor.responder("Por que a matrícula 10001 recebeu menos?")[1] == "llm"
+    assert len(criados) == 1 and criados[0] is respondedor.cubo
+
+
+def test_cache_separado_por_backend(df_final, tmp_path):
+    cache = CacheRespostas(str(tmp_path))
+    pergunta = "Explique o VR da matrícula 10000"
+    Respondedor(df_final, LLMFalso(latencia=0), cache=cache).responder(pergunta)
+    assert Respondedor(df_final, LLMFalso(latencia=0), cache=cache).responder(pergunta)[1] == "cache"
+    outro = Respondedor(df_final, LLMFalso(latencia=0), cache=cache, backend="gemini:teste")
+    assert outro.responder(pergunta)[1] == "llm"
+
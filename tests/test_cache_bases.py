@@ -0,0 +1,76 @@
+import os
+import time
+import zipfile
+
+import pandas as pd
+
+from cache_bases import (
+    aplicar_limite_tamanho,
+    gravar_no_cache,
+    hash_conteudo,
+    invalidar_cache,
+    ler_do_cache,
+    tamanho_cache,
+)
+from processamento import ARQUIVOS_BASES, ler_bases_zip
+
+
+def _df(n: int = 100) -> pd.DataFrame:
+    return pd.DataFrame({"MATRICULA": range(n), "Sindicato": ["SINDPD SP"] * n})
+
+
+def test_acerto_e_falha(tmp_path):
+    pasta = str(tmp_path)
+    assert ler_do_cache("ausente", pasta) is None
+    assert gravar_no_cache("chave", _df(), pasta)
+    pd.testing.assert_frame_equal(ler_do_cache("chave", pasta), _df())
+
+
+def test_entrada_corrompida_e_descartada(tmp_path):
+    pasta = str(tmp_path)
+    gravar_no_cache("chave", _df(), pasta)
+    caminho = next(os.path.join(pasta, n) for n in os.listdir(pasta))
+    with open(caminho, "wb") as f:
+        f.write(b"nao e parquet")
+    assert ler_do_cache("chave", pasta) is None
+    assert not os.path.exists(caminho)
+
+
+def test_remove_as_menos_usadas_acima_do_limite(tmp_path):
+    pasta = str(tmp_path)
+    for i, chave in enumerate(["a", "b", "c"]):
+        gravar_no_cache(chave, _df(), pasta)
+        caminho = next(os.path.join(pasta, n) for n in os.listdir(pasta) if n.startswith(chave))
+        os.utime(caminho, (time.time() - 100 + i, time.time() - 100 + i))
+    ler_do_cache("a", pasta)  # "a" passa a ser a mais recente
+    limite = tamanho_cache(pasta) * 2 // 3
+    assert aplicar_limite_tamanho(pasta, limite) == 1
+    assert ler_do_cache("b", pasta) is None
+    assert ler_do_cache("a", pasta) is not None and ler_do_cache("c", pasta) is not None
+
+
+def test_invalidar_por_zip_e_tudo(caminho_zip, tmp_path):
+    pasta = str(tmp_path / "cache")
+    with zipfile.ZipFile(caminho_zip) as zip_ref:
+        hashes = [hash_conteudo(zip_ref.read(arquivo)) for arquivo in ARQUIVOS_BASES.values()]
+    gravar_no_cache(hashes[0], _df(), pasta)
+    gravar_no_cache("outra", _df(), pasta)
+    assert invalidar_cache(caminho_zip, pasta) == 1
+    assert ler_do_cache("outra", pasta) is not None
+    assert invalidar_cache(pasta=pasta) == 1
+    assert tamanho_cache(pasta) == 0
+
+
+def test_leitura_do_zip_usa_o_cache(caminho_zip, pasta_testes, monkeypatch):
+    # ler_bases_zip grava em dados/cache, relativo à pasta de trabalho da sessão
+    invalidar_cache()
+    primeira = ler_bases_zip(caminho_zip, ["sindicato_valores"])
+    assert tamanho_cache() > 0
+
+    def sem_excel(*args, **kwargs):
+        raise AssertionError("planilha relida apesar do cache")
+
+    monkeypatch.setattr(pd, "read_excel", sem_excel)
+    segunda = ler_bases_zip(caminho_zip, ["sindicato_valores"])
+    pd.testing.assert_frame_equal(primeira["sindicato_valores"], segunda["sindicato_valores"])
+    invalidar_cache()
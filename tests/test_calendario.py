@@ -0,0 +1,32 @@
+import pandas as pd
+
+from calendario import CalendarioUteis, pascoa, periodo_competencia
+
+SP = "SINDPD SP - SIND.TRAB.EM PROC DADOS E EMPR.EMPRESAS PROC DADOS ESTADO DE SP."
+RJ = "SINDPD RJ - SINDICATO PROFISSIONAIS DE PROC DADOS DO RIO DE JANEIRO"
+
+
+def test_periodo_competencia():
+    assert periodo_competencia("05.2025") == ("2025-04-15", "2025-05-15")
+    assert periodo_competencia("01.2026") == ("2025-12-15", "2026-01-15")
+
+
+def test_pascoa():
+    assert str(pascoa(2025)) == "2025-04-20"
+    assert str(pascoa(2024)) == "2024-03-31"
+
+
+def test_dias_uteis_por_sindicato():
+    # 15/04 a 15/05/2025: 23 dias de semana, menos Sexta-feira Santa (18/04),
+    # Tiradentes (21/04) e 1º de maio; no RJ também São Jorge (23/04)
+    calendario = CalendarioUteis("2025-04-15", "2025-05-15", config={})
+    dias = calendario.contar(pd.Series([SP, RJ, None]))
+    assert list(dias) == [20, 19, 20]
+
+
+def test_janela_recortada_ao_periodo():
+    calendario = CalendarioUteis("2025-04-15", "2025-05-15", config={})
+    dias = calendario.contar(pd.Series([SP, SP, SP]),
+                             inicio=pd.Series(["2025-05-05", None, "2025-06-01"]),
+                             fim=pd.Series(["2025-05-09", "2025-04-17", None]))
+    assert list(dias) == [5, 3, 0]
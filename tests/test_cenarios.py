@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cenarios import avaliar_cenarios, grade_cenarios
+from dimensao_sindicato import resolver_uf
+
+
+def _totais_em_laco(df: pd.DataFrame, cenario: dict) -> tuple:
+    """Referência linha a linha, com o arredondamento do reparador (np.round, a centavos)."""
+    valores = cenario.get("valores") or {}
+    empresa = cenario.get("empresa", 0.8)
+    reajuste = cenario.get("reajuste", 1.0)
+    total = parte_empresa = parte_colaborador = 0.0
+    for dias, valor, uf in zip(df["DIAS ÚTEIS"], df["VALOR UNITÁRIO"], resolver_uf(df["SINDICATO"])):
+        valor = max(np.round(valores.get(uf, valor) * reajuste, 2), 0)
+        vr = np.round(max(dias, 0) * valor, 2)
+        total += vr
+        parte_empresa += np.round(vr * empresa, 2)
+        parte_colaborador += np.round(vr * round(1 - empresa, 10), 2)
+    return round(total, 2), round(parte_empresa, 2), round(parte_colaborador, 2)
+
+
+def test_grade_cenarios():
+    cenarios = grade_cenarios({"SP": [37.5, 40]}, empresa=[0.8, 0.85], reajuste=[1.0, 1.05])
+    assert len(cenarios) == 8
+    assert cenarios[0]["nome"] == "SP=37.5 80/20"
+
+
+def test_totais_iguais_a_referencia_em_laco(df_final):
+    cenarios = grade_cenarios({"SP": [37.5, 40], "RJ": [30]}, empresa=[0.8, 0.85], reajuste=[1.0, 1.05])
+    resultado = avaliar_cenarios(df_final, cenarios, elementos_por_bloco=50)
+    for cenario in cenarios:
+        esperado = _totais_em_laco(df_final, cenario)
+        obtido = tuple(resultado.loc[cenario["nome"], ["VR_TOTAL", "VR_EMPRESA", "VR_COLABORADOR"]])
+        assert obtido == pytest.approx(esperado, abs=0.005)
+
+
+def test_cenario_atual_sem_variacao(df_final):
+    resultado = avaliar_cenarios(df_final, [{"nome": "atual"}])
+    assert resultado.loc["atual", "VR_TOTAL"] == pytest.approx(df_final["VR TOTAL"].sum())
+    assert resultado.loc["atual", "VARIACAO_VR_TOTAL"] == pytest.approx(0)
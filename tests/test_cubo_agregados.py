@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from cubo_agregados import montar_cubo, responder
+
+
+@pytest.fixture(scope="module")
+def cubo(df_final):
+    return montar_cubo(df_final)
+
+
+@pytest.mark.parametrize("pergunta, inicio", [
+    ("Qual o total de VR?", "🔢 Total de VR TOTAL (todos os colaboradores): R$ 212.682,50"),
+    ("total de VR por UF", "🔢 Total de VR TOTAL por UF:"),
+    ("média de dias úteis em SP", "🔢 Média de DIAS ÚTEIS em UF = SP:"),
+    ("Quantos colaboradores no RJ?", "🔢 Quantidade de COLABORADORES em UF = RJ: 55"),
+    ("quantos colaboradores por sindicato", "🔢 Quantidade de COLABORADORES por SINDICATO:"),
+    ("qual o VR total por sindicato", "🔢 Total de VR TOTAL por SINDICATO:"),
+    ("qual o VR TOTAL em SP", "🔢 Total de VR TOTAL em UF = SP:"),
+    ("quantos colaboradores em Paraná", "🔢 Quantidade de COLABORADORES em UF = PR: 67"),
+])
+def test_responde_agregados(cubo, pergunta, inicio):
+    assert responder(pergunta, cubo).startswith(inicio)
+
+
+@pytest.mark.parametrize("pergunta", [
+    "total de VR dos admitidos em abril",
+    "total de VR dos desligados",
+    "total de VR pago em junho",
+    "total de VR em Minas Gerais",
+    "Quantos colaboradores têm VR zerado?",
+    "média de VR dos analistas",
+    "total de VR em SP e RJ",
+    "Quantos dias úteis o sindicato do PR tem?",
+    "Por que a matrícula 123 recebeu menos?",
+    "quantos colaboradores no Pará",
+    "quantos colaboradores no para",
+    "total de VR Pará",
+    "total de VR MG",
+])
+def test_perguntas_fora_do_cubo_vao_para_o_agente(cubo, pergunta):
+    assert responder(pergunta, cubo) is None
+
+
+def test_para_como_estado_e_como_preposicao():
+    cubo = montar_cubo(pd.DataFrame({"UF": ["PA", "SP", "SP"], "VR TOTAL": [10.0, 20.0, 30.0]}))
+    assert responder("quantos colaboradores no Pará", cubo).startswith("🔢 Quantidade de COLABORADORES em UF = PA: 1")
+    assert responder("total de VR do Para", cubo).startswith("🔢 Total de VR TOTAL em UF = PA: R$ 10,00")
+    assert responder("qual o total de VR para SP", cubo) is None
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from dag_etapas import PipelineDAG, etapas_vr
+
+
+def test_dag_igual_ao_sequencial_e_reaproveita_checkpoints(caminho_zip, df_final, tmp_path):
+    saida = str(tmp_path / "VR MENSAL.xlsx")
+    pasta = str(tmp_path / "checkpoints")
+
+    dag = PipelineDAG(etapas_vr(caminho_zip, saida), pasta=pasta)
+    pd.testing.assert_frame_equal(dag.executar(), df_final)
+    assert set(dag.origem.values()) == {"executada"}
+
+    dag = PipelineDAG(etapas_vr(caminho_zip, saida), pasta=pasta)
+    pd.testing.assert_frame_equal(dag.executar(), df_final)
+    assert dag.origem == {"final": "checkpoint"}
+
+
+def test_dag_refaz_final_sem_o_arquivo(caminho_zip, tmp_path):
+    saida = tmp_path / "VR MENSAL.xlsx"
+    pasta = str(tmp_path / "checkpoints")
+    PipelineDAG(etapas_vr(caminho_zip, str(saida)), pasta=pasta).executar()
+    saida.unlink()
+
+    dag = PipelineDAG(etapas_vr(caminho_zip, str(saida)), pasta=pasta)
+    dag.executar()
+    assert dag.origem["final"] == "executada"
+    assert saida.exists()
+
+
+def test_periodo_muda_a_chave_dos_dias(caminho_zip, tmp_path):
+    saida = str(tmp_path / "VR MENSAL.xlsx")
+    maio = PipelineDAG(etapas_vr(caminho_zip, saida, periodo=("2025-04-15", "2025-05-15")))
+    junho = PipelineDAG(etapas_vr(caminho_zip, saida, periodo=("2025-05-15", "2025-06-15")))
+    assert maio.chaves["filtrada"] == junho.chaves["filtrada"]
+    assert maio.chaves["dias"] != junho.chaves["dias"]
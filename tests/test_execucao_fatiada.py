@@ -0,0 +1,38 @@
+import pandas as pd
+
+from execucao_fatiada import BASES_WORKER, bases_worker, executar_fatiado
+from processamento import calcular_valores_vr, reparar_valores_vr
+
+# Totais de referência da base sintética (HEADCOUNT = 300, SEMENTE = 0)
+LINHAS_ESPERADAS = 298
+VR_TOTAL_ESPERADO = 212682.50
+
+
+def test_totais_sequencial(df_final):
+    assert len(df_final) == LINHAS_ESPERADAS
+    assert round(float(df_final["VR TOTAL"].sum()), 2) == VR_TOTAL_ESPERADO
+    soma_partes = df_final["EMPRESA (80%)"].sum() + df_final["COLABORADOR (20%)"].sum()
+    assert round(float(soma_partes), 2) == VR_TOTAL_ESPERADO
+
+
+def test_fatiado_igual_ao_sequencial(bases, df_filtrada, df_vr):
+    for chave in ("sindicato", "matricula"):
+        fatiado = executar_fatiado(df_filtrada, bases, ("calcular_dias",), chave=chave, max_workers=2,
+                                   minimo_linhas=0)
+        resultado = reparar_valores_vr(calcular_valores_vr(fatiado, bases))
+        pd.testing.assert_frame_equal(resultado, df_vr)
+
+
+def test_fatiado_dias_e_valores_no_mesmo_pool(bases, df_filtrada, df_vr):
+    fatiado = executar_fatiado(df_filtrada, bases, ("calcular_dias", "calcular_valores"), max_workers=2,
+                               minimo_linhas=0)
+    pd.testing.assert_frame_equal(reparar_valores_vr(fatiado), df_vr)
+
+
+def test_workers_recebem_so_as_bases_de_referencia(bases, df_filtrada, df_vr):
+    referencias = bases_worker(bases)
+    assert set(referencias) == set(BASES_WORKER)
+    assert "ativos" not in referencias and "admitidos" not in referencias
+    fatiado = executar_fatiado(df_filtrada, referencias, ("calcular_dias", "calcular_valores"), max_workers=2,
+                               minimo_linhas=0)
+    pd.testing.assert_frame_equal(reparar_valores_vr(fatiado), df_vr)
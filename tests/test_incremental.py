@@ -0,0 +1,51 @@
+import re
+
+import pandas as pd
+
+from incremental import calcular_incremental
+from processamento import aplicar_regras_exclusao, calcular_dias_uteis, calcular_valores_vr, consolidar_bases
+
+JUNHO = ("2025-05-15", "2025-06-15")
+
+
+def _completo(bases: dict, periodo=None) -> pd.DataFrame:
+    df_filtrada = aplicar_regras_exclusao(bases, consolidar_bases(bases))
+    return calcular_valores_vr(calcular_dias_uteis(df_filtrada, bases, periodo=periodo), bases)
+
+
+def _mes_seguinte(bases: dict) -> dict:
+    """Mesmas bases com férias deslocadas, um desligamento mudado e novo valor no Paraná."""
+    novas = dict(bases)
+    ferias = bases["ferias"].copy()
+    ferias.loc[0, ["INICIO FÉRIAS", "FIM FÉRIAS"]] = [pd.Timestamp("2025-04-28"), pd.Timestamp("2025-05-02")]
+    novas["ferias"] = ferias
+    desligados = bases["desligados"].copy()
+    desligados.iloc[2, 1] = pd.Timestamp("2025-04-22")
+    novas["desligados"] = desligados
+    valores = bases["sindicato_valores"].copy()
+    valores.loc[valores["ESTADO"] == "Paraná", "VALOR"] = 40.0
+    novas["sindicato_valores"] = valores
+    return novas
+
+
+def test_incremental_igual_ao_recalculo_completo(bases, tmp_path, capsys):
+    pasta = str(tmp_path)
+    pd.testing.assert_frame_equal(calcular_incremental(bases, pasta), _completo(bases))
+
+    novas = _mes_seguinte(bases)
+    capsys.readouterr()
+    resultado = calcular_incremental(novas, pasta)
+    recalculadas, total = map(int, re.search(r"(\d+) de (\d+) MATRICULAs", capsys.readouterr().out).groups())
+    assert 0 < recalculadas < total
+    pd.testing.assert_frame_equal(resultado, _completo(novas))
+    assert not resultado.equals(_completo(bases))
+
+
+def test_outro_periodo_recalcula_tudo(bases, tmp_path, capsys):
+    pasta = str(tmp_path)
+    calcular_incremental(bases, pasta)
+    capsys.readouterr()
+    resultado = calcular_incremental(bases, pasta, periodo=JUNHO)
+    assert "outro período" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(resultado, _completo(bases, JUNHO))
+    assert not resultado["DIAS_CALCULADOS"].equals(_completo(bases)["DIAS_CALCULADOS"])
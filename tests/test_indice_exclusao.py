@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from indice_exclusao import MOTIVOS, IndiceExclusao, descrever_motivos
+
+
+def test_matriculas_inteiras_e_texto():
+    indice = IndiceExclusao({"ESTAGIO": pd.Series([101, "A123"]), "EXTERIOR": pd.Series(["102", None])})
+    consultadas = pd.Series([101, "101", "A123", 102, "B9", None, 103])
+    assert list(indice.contem(consultadas)) == [True, True, True, True, False, False, False]
+    assert len(indice) == 3
+
+
+def test_com_motivo_e_descricao():
+    indice = IndiceExclusao({"ESTAGIO": pd.Series([1])}).com_motivo("DIRETOR", pd.Series([1, "X-2"]))
+    mascara = indice.mascara(pd.Series([1, "X-2", 3]))
+    assert list(mascara) == [MOTIVOS["ESTAGIO"] | MOTIVOS["DIRETOR"], MOTIVOS["DIRETOR"], 0]
+    assert list(descrever_motivos(pd.Series(mascara))) == ["ESTAGIO|DIRETOR", "DIRETOR", ""]
+    assert np.array_equal(IndiceExclusao().contem(pd.Series([1])), [False])
+
+
+def test_descricao_de_tabela_booleana():
+    violacoes = pd.DataFrame({"nulo:VALOR": [True, False, True], "total=dias*valor": [True, False, False]},
+                             index=[10, 11, 12])
+    texto = descrever_motivos(violacoes)
+    assert list(texto.index) == [10, 11, 12]
+    assert list(texto) == ["nulo:VALOR|total=dias*valor", "", "nulo:VALOR"]
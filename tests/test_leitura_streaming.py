@@ -0,0 +1,28 @@
+import pandas as pd
+
+from indice_exclusao import IndiceExclusao
+from leitura_streaming import aplicar_regras_exclusao_em_chunks, matriculas_de_diretores, processar_em_chunks
+from processamento import _filtrar_exclusoes, calcular_dias_uteis, calcular_valores_vr
+
+
+def test_diretor_excluido_em_outro_chunk(capsys):
+    chunks = [
+        pd.DataFrame({"MATRICULA": [1, 2], "TITULO DO CARGO": ["DIRETOR COMERCIAL", "ANALISTA"]}),
+        pd.DataFrame({"MATRICULA": [1, 3], "TITULO DO CARGO": ["ANALISTA", None]}),
+    ]
+    diretores = matriculas_de_diretores(chunks)
+    filtrada = pd.concat(aplicar_regras_exclusao_em_chunks({}, chunks, diretores))
+    esperado = _filtrar_exclusoes(pd.concat(chunks), IndiceExclusao())
+    assert list(filtrada["MATRICULA"]) == list(esperado["MATRICULA"]) == [2, 3]
+
+    # Sem a passada prévia, o registro do segundo chunk escapa
+    assert list(pd.concat(aplicar_regras_exclusao_em_chunks({}, chunks))["MATRICULA"]) == [2, 1, 3]
+
+
+def test_streaming_igual_ao_modo_em_memoria(caminho_zip, bases, df_filtrada, capsys):
+    em_memoria = calcular_valores_vr(calcular_dias_uteis(df_filtrada, bases), bases)
+    # ADMITIDOS chega no último chunk (DATA_ADMISSAO vai para o fim) e as categorias
+    # de cada chunk diferem, então só os valores são comparados
+    streaming = pd.concat(processar_em_chunks(caminho_zip, tamanho_chunk=64))[em_memoria.columns]
+    pd.testing.assert_frame_equal(streaming.reset_index(drop=True), em_memoria.reset_index(drop=True),
+                                  check_dtype=False, check_categorical=False)
@@ -0,0 +1,13 @@
+from lote import executar_lote
+
+
+def test_zip_ausente_no_primeiro_job_nao_para_o_lote(caminho_zip, tmp_path, capsys):
+    jobs = [
+        (str(tmp_path / "nao_existe.zip"), "04.2025", str(tmp_path / "a.xlsx")),
+        (caminho_zip, "05.2025", str(tmp_path / "b.xlsx")),
+    ]
+    resumo = executar_lote(jobs, max_workers=2)
+    assert "Referências de" in capsys.readouterr().out
+    assert isinstance(resumo.loc[0, "erro"], str)
+    assert resumo.loc[1, "erro"] is None
+    assert resumo.loc[1, "colaboradores"] == 298 and resumo.loc[1, "vr_total"] > 0